@@ -1,7 +1,24 @@
+from .dynamo_pandas import copy_table
+from .dynamo_pandas import execute_df
 from .dynamo_pandas import get_df
 from .dynamo_pandas import keys
+from .dynamo_pandas import keys_from_df
 from .dynamo_pandas import put_df
+from .io import read_ddb_json
+from .io import read_export
+from .io import to_ddb_json
 
 __version__ = "1.4.0"
 
-__all__ = ["get_df", "keys", "put_df", "__version__"]
+__all__ = [
+    "copy_table",
+    "execute_df",
+    "get_df",
+    "keys",
+    "keys_from_df",
+    "put_df",
+    "read_ddb_json",
+    "read_export",
+    "to_ddb_json",
+    "__version__",
+]
@@ -0,0 +1,5 @@
+from .cli import export_table
+from .cli import import_files
+from .cli import main
+
+__all__ = ["export_table", "import_files", "main"]
@@ -0,0 +1,452 @@
+"""Command line interface exporting tables to files and importing files into tables.
+
+Usage::
+
+    dynamo-pandas export TABLE OUTPUT [--format {parquet,csv,ddbjson}] [--segments N]
+                                      [--resume] [--quiet]
+    dynamo-pandas import INPUT TABLE [--workers N] [--rate WCU] [--resume] [--quiet]
+"""
+
+import argparse
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+import glob
+import gzip
+from itertools import islice
+import json
+import os
+import sys
+import threading
+import time
+
+import boto3
+import pandas as pd
+
+from ..dynamo_pandas import _to_df
+from ..dynamo_pandas import _to_items
+from ..io.io import _dumps
+from ..io.io import _from_json
+from ..io.io import _loads
+from ..io.io import _open_file
+from ..io.io import _to_json
+from ..metrics import Metrics
+from ..serde import TypeDeserializer
+from ..transactions import scan_pages
+from ..transactions import table_info
+from ..transactions.transactions import _serialize
+from ..transactions.transactions import _write_items
+
+_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "ddbjson": ".json.gz"}
+
+_CHECKPOINT_FILE = "_checkpoint.json"
+
+
+def main(argv=None):
+    """Run the dynamo-pandas command line interface."""
+    parser = argparse.ArgumentParser(
+        prog="dynamo-pandas",
+        description="Export DynamoDB tables to files and import files into tables.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser(
+        "export",
+        help="export a table to a directory of files",
+        description=(
+            "Export a table to a directory of files, one file per scanned page. The "
+            "table is read by a parallel scan and the pages are written as they are "
+            "read. Interrupted exports can be resumed with --resume. The csv format "
+            "only round-trips scalar attributes: binary, set, list and map values are "
+            "written as their Python representation."
+        ),
+    )
+    export_parser.add_argument("table", help="name of the table to export")
+    export_parser.add_argument("output", help="directory of the exported files")
+    export_parser.add_argument(
+        "--format",
+        choices=list(_EXTENSIONS),
+        default="ddbjson",
+        help="format of the files (default: ddbjson, gzipped DynamoDB JSON lines)",
+    )
+    export_parser.add_argument(
+        "--segments",
+        type=int,
+        default=1,
+        help="number of segments of the parallel scan (default: 1)",
+    )
+    export_parser.add_argument(
+        "--resume", action="store_true", help="resume an interrupted export"
+    )
+    export_parser.add_argument(
+        "--quiet", action="store_true", help="do not show the progress"
+    )
+
+    import_parser = commands.add_parser(
+        "import",
+        help="import files into a table",
+        description=(
+            "Import a file, or the files of a directory (.csv, .parquet, .json or "
+            ".json.gz DynamoDB JSON lines), into a table. Interrupted imports can be "
+            "resumed with --resume."
+        ),
+    )
+    import_parser.add_argument("input", help="file or directory of files to import")
+    import_parser.add_argument("table", help="name of the table to import into")
+    import_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="number of chunks of rows written concurrently (default: 4)",
+    )
+    import_parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="maximum write capacity units consumed per second (default: no limit)",
+    )
+    import_parser.add_argument(
+        "--resume", action="store_true", help="resume an interrupted import"
+    )
+    import_parser.add_argument(
+        "--quiet", action="store_true", help="do not show the progress"
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "export":
+            export_table(
+                args.table,
+                args.output,
+                format=args.format,
+                segments=args.segments,
+                resume=args.resume,
+                quiet=args.quiet,
+            )
+        else:
+            import_files(
+                args.input,
+                args.table,
+                workers=args.workers,
+                rate=args.rate,
+                resume=args.resume,
+                quiet=args.quiet,
+            )
+    except (ValueError, FileNotFoundError, FileExistsError, ImportError) as e:
+        parser.exit(1, f"dynamo-pandas: error: {e}\n")
+
+
+def export_table(
+    table, output, *, format="ddbjson", segments=1, resume=False, quiet=False
+):
+    """Export a table to a directory of files, one file per scanned page.
+
+    The progress of the export is saved in a checkpoint file of the output directory
+    after each page so that an interrupted export can be resumed.
+
+    Parameters
+    ----------
+    table : str
+        Name of the DynamoDB table.
+
+    output : str
+        Path of the output directory.
+
+    format : str
+        Format of the files: 'ddbjson' (default) for gzipped DynamoDB JSON lines, which
+        can be read with ``read_export``, 'csv' or 'parquet' (which requires
+        ``pyarrow`` or ``fastparquet``). For csv and parquet files, binary values are
+        written as bytes and sets as lists. The csv files only round-trip scalar
+        attributes: binary, set, list and map values are written as their Python
+        representation, which is not converted back by ``import_files``.
+
+    segments : int
+        Number of segments of the parallel scan. Default is 1.
+
+    resume : bool
+        If True, resume the export saved in the checkpoint file of the output
+        directory.
+
+    quiet : bool
+        If True, the progress is not shown.
+    """
+    if format not in _EXTENSIONS:
+        raise ValueError(f"format must be one of {list(_EXTENSIONS)}")
+
+    checkpoint_path = os.path.join(output, _CHECKPOINT_FILE)
+    if resume:
+        with open(checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint["table"] != table:
+            raise ValueError(f"The export in '{output}' is not an export of '{table}'")
+        format = checkpoint["format"]
+        segments = checkpoint["segments"]
+    else:
+        if os.path.exists(checkpoint_path):
+            raise FileExistsError(
+                f"'{output}' already contains an export, use --resume to resume it"
+            )
+        os.makedirs(output, exist_ok=True)
+        checkpoint = dict(
+            table=table,
+            format=format,
+            segments=segments,
+            state={
+                str(segment): dict(page=0, key=None, done=False)
+                for segment in range(segments)
+            },
+        )
+
+    state = checkpoint["state"]
+    pending = [int(s) for s, segment in state.items() if not segment["done"]]
+    start_keys = {
+        int(s): _from_json(state[s]["key"])
+        for s in map(str, pending)
+        if state[s]["key"] is not None
+    }
+
+    progress = _Progress(quiet, f"Exporting {table}")
+    for segment, items, last_key in scan_pages(
+        table=table,
+        segments=segments,
+        segment_ids=pending,
+        exclusive_start_keys=start_keys,
+        raw=format == "ddbjson",
+        deserializer=TypeDeserializer(binary="bytes", sets="list"),
+    ):
+        segment_state = state[str(segment)]
+        path = os.path.join(
+            output,
+            f"part-{segment:04d}-{segment_state['page']:06d}{_EXTENSIONS[format]}",
+        )
+        # The last page of a segment can be empty, no file is written for it.
+        if len(items) > 0:
+            _write_page(items, path, format)
+
+        segment_state["page"] += 1
+        segment_state["key"] = None if last_key is None else _to_json(last_key)
+        segment_state["done"] = last_key is None
+        _save_json(checkpoint, checkpoint_path)
+
+        progress.update(len(items))
+
+    progress.close()
+
+
+def import_files(input, table, *, workers=4, rate=None, resume=False, quiet=False):
+    """Import a file or the files of a directory into a table.
+
+    The files are read in chunks of rows, the chunks (of one or several files) being
+    written concurrently. The items of DynamoDB JSON files are written as they are,
+    without being deserialized. The empty values of csv and parquet files are left out
+    of the items rather than written as NULL values. The progress of the import is
+    saved in a progress file (next to the input file or directory) after each chunk so
+    that an interrupted import can be resumed.
+
+    Parameters
+    ----------
+    input : str
+        Path of a file, or of a directory of files, to import: ``.csv``, ``.parquet``
+        or DynamoDB JSON lines (``.json`` or ``.json.gz``) files.
+
+    table : str
+        Name of the DynamoDB table.
+
+    workers : int
+        Number of chunks of rows written concurrently. Default is 4.
+
+    rate : float
+        Maximum number of write capacity units consumed per second, shared by all the
+        workers. If None (default), the rate is not limited.
+
+    resume : bool
+        If True, skip the files and chunks already imported according to the progress
+        file.
+
+    quiet : bool
+        If True, the progress is not shown.
+    """
+    files = _input_files(input)
+
+    # Values of string key attributes such as "007" would be read as numbers from csv
+    # files, the string key attributes are read as strings.
+    attribute_types = table_info(table=table)["attribute_types"]
+    dtype = {name: str for name, t in attribute_types.items() if t == "S"}
+
+    progress_path = f"{os.path.normpath(input)}.{table}.import.json"
+    if resume and os.path.exists(progress_path):
+        with open(progress_path) as f:
+            done = json.load(f)
+    else:
+        done = {}
+
+    lock = threading.Lock()
+    metrics = Metrics(callbacks=[] if rate is None else [_RateLimiter(rate)])
+    progress = _Progress(quiet, f"Importing into {table}")
+
+    client = boto3.client("dynamodb")
+
+    def import_chunk(path, chunk_number, chunk):
+        if isinstance(chunk, pd.DataFrame):
+            # The empty values are attributes that the items do not have.
+            items = _serialize((table, item) for item in _to_items(chunk, dropna=True))
+        else:
+            items = ((table, item) for item in chunk)
+
+        _write_items(items, client, metrics=metrics)
+
+        with lock:
+            done.setdefault(path, []).append(chunk_number)
+            _save_json(done, progress_path)
+            progress.update(len(chunk))
+
+    chunks = (
+        (path, chunk_number, chunk)
+        for path in files
+        for chunk_number, chunk in enumerate(_read_chunks(path, dtype=dtype))
+        if chunk_number not in done.get(path, [])
+    )
+
+    pending = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for path, chunk_number, chunk in chunks:
+                # Limit the number of chunks held in memory to the chunks being
+                # written.
+                if len(pending) >= workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        future.result()
+
+                pending.add(executor.submit(import_chunk, path, chunk_number, chunk))
+
+            for future in pending:
+                future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    progress.close()
+
+
+def _input_files(input):
+    """Return the sorted list of the files to import of a file or directory."""
+    if os.path.isdir(input):
+        files = [
+            path
+            for extension in (".csv", ".parquet", ".json", ".json.gz")
+            for path in glob.glob(os.path.join(input, f"*{extension}"))
+            if os.path.basename(path) != _CHECKPOINT_FILE
+        ]
+    elif os.path.exists(input):
+        files = [input]
+    else:
+        files = []
+
+    if len(files) == 0:
+        raise FileNotFoundError(f"No files to import found in '{input}'")
+
+    return sorted(files)
+
+
+def _read_chunks(path, chunksize=1000, dtype=None):
+    """Yield the rows of a file as dataframes of chunksize rows, or the items of a
+    DynamoDB JSON file as lists of chunksize items in DynamoDB format. dtype is the
+    dictionary of the types of the columns of csv files."""
+    if path.endswith(".csv"):
+        try:
+            yield from pd.read_csv(path, chunksize=chunksize, dtype=dtype)
+        except pd.errors.EmptyDataError:
+            return
+    elif path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start : start + chunksize]  # noqa: E203
+    else:
+        with _open_file(path, "rt") as f:
+            items = (_from_json(_loads(line)["Item"]) for line in f if line.strip())
+            while True:
+                chunk = list(islice(items, chunksize))
+                if len(chunk) == 0:
+                    return
+                yield chunk
+
+
+def _write_page(items, path, format):
+    """Write the items of a scanned page to a file, through a temporary file so that
+    no partial file is left if interrupted."""
+    temp_path = f"{path}.tmp"
+    try:
+        if format == "ddbjson":
+            with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+                for item in items:
+                    f.write(_dumps({"Item": _to_json(item)}) + "\n")
+        elif format == "csv":
+            _to_df(items).to_csv(temp_path, index=False)
+        else:
+            _to_df(items).to_parquet(temp_path, index=False)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    os.replace(temp_path, path)
+
+
+def _save_json(value, path):
+    """Save a value as JSON, replacing the file atomically."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(value, f)
+    os.replace(temp_path, path)
+
+
+class _RateLimiter:
+    """Metrics callback limiting the write capacity consumed per second by delaying
+    the writing thread after each write request."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.start = time.monotonic()
+        self.consumed = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event["operation"] != "BatchWriteItem":
+            return
+
+        # The consumed capacity is not returned by all endpoints, in which case one
+        # capacity unit per item is assumed.
+        units = event["consumed_capacity"] or event["items"]
+        with self._lock:
+            self.consumed += units
+            delay = self.consumed / self.rate - (time.monotonic() - self.start)
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _Progress:
+    """Progress line of the number of items processed and the rate, written to
+    stderr."""
+
+    def __init__(self, quiet, description):
+        self.quiet = quiet
+        self.description = description
+        self.items = 0
+        self.start = time.monotonic()
+
+    def update(self, items):
+        self.items += items
+        if not self.quiet:
+            rate = self.items / max(time.monotonic() - self.start, 1e-9)
+            sys.stderr.write(
+                f"\r{self.description}: {self.items} items ({rate:.0f} items/s)"
+            )
+            sys.stderr.flush()
+
+    def close(self):
+        if not self.quiet:
+            self.update(0)
+            sys.stderr.write("\n")
@@ -1,13 +1,54 @@
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+import boto3
+import numpy as np
 import pandas as pd
 
+from .metrics import Metrics
+from .serde import compress as compress_value
+from .serde import TypeDeserializer
+from .serde import TypeSerializer
+from .transactions import conditional_put_items
+from .transactions import execute_statement
+from .transactions import execute_statements
 from .transactions import get_all_items
 from .transactions import get_items
 from .transactions import put_items
+from .transactions import query_items
+from .transactions import scan_pages
+from .transactions import table_info
+from .transactions import transact_put_items
+from .transactions.transactions import _serialize
+from .transactions.transactions import _write_items
 
 
-def get_df(*, table, keys=None, attributes=None, dtype=None, boto3_kwargs={}):
+def get_df(
+    *,
+    table,
+    keys=None,
+    attributes=None,
+    dtype=None,
+    preserve_order=True,
+    missing="drop",
+    index=None,
+    index_name=None,
+    segments=None,
+    flatten=False,
+    sep=".",
+    binary="Binary",
+    sets="set",
+    max_workers=1,
+    boto3_kwargs={},
+    metrics=None,
+):
     """Get items from a table into a dataframe.
 
+    Attributes written with the ``compress`` parameter of the ``put_df`` function are
+    decompressed transparently.
+
     Parameters
     ----------
     table : str
@@ -18,7 +59,10 @@ def get_df(*, table, keys=None, attributes=None, dtype=None, boto3_kwargs={}):
 
     attributes : list[str]
         Names of the item attributes to return as dataframe columns. If None (default),
-        all attributes are returned.
+        all attributes are returned. The projection is performed by DynamoDB so only
+        the specified attributes are read. Nested attributes can be selected with
+        document paths such as ``"a.b[0]"``, the top level attribute being returned as
+        column.
 
     dtype : data type or dict of column names -> data type
         Use a numpy.dtype or Python type to cast entire pandas object to the same type.
@@ -26,11 +70,66 @@ def get_df(*, table, keys=None, attributes=None, dtype=None, boto3_kwargs={}):
         numpy.dtype or Python type to cast one or more of the DataFrame’s columns to
         column-specific types.
 
+    preserve_order : bool
+        Only used with ``keys``. If True (default), the rows are returned in the order
+        of the keys, rows of duplicate keys being repeated. If False, the rows of the
+        unique keys are returned in no specific order.
+
+    missing : str
+        Only used with ``keys``. Handling of the keys for which no item exists in the
+        table: 'drop' (default) skips them and 'na' returns a row with missing values
+        (except for the key attributes) in their place. 'na' requires
+        ``preserve_order=True``.
+
+    index : str or list[str]
+        Column(s) to use as the index of the returned dataframe, for instance the key
+        attributes. If None (default), a default integer index is used.
+
+    index_name : str
+        Name of a global or local secondary index of the table to read from instead of
+        the table. With ``keys``, a query of the index is performed for each key (the
+        ``preserve_order`` and ``missing`` parameters are not used), otherwise the index
+        is scanned. The requested attributes are validated against the attributes
+        projected in the index.
+
+    segments : int
+        Only used without ``keys``. If specified, the table is read by a parallel scan
+        of ``segments`` segments scanned concurrently, which reduces the time to read
+        large tables. Cannot be combined with ``index_name``.
+
+    flatten : bool
+        If True, nested map attributes are flattened into separate columns named with
+        the path of the nested attributes (e.g. ``a.b``). List attributes are returned
+        as list values. The items are flattened as they are converted to rows, without
+        a separate normalization pass over the dataframe.
+
+    sep : str
+        Separator of the attribute names in the names of flattened columns.
+
+    binary : str
+        Python type of the binary attribute values: 'Binary' (default) for
+        ``boto3.dynamodb.types.Binary`` wrappers or 'bytes' for raw bytes, which avoids
+        unwrapping the values afterwards.
+
+    sets : str
+        Python type of the number, string and binary set attribute values: 'set'
+        (default) or 'list'.
+
+    max_workers : int
+        Maximum number of batch requests in flight when getting items by ``keys``.
+        Default is 1 (sequential requests). With more than 1, the number of requests
+        in flight is adapted to the throughput the table sustains (see
+        ``transactions.get_items_multi``).
+
     boto3_kwargs : dict
         Keyword arguments to pass to the underlying ``boto3.resource('dynamodb')``
         function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.resource>`_
         for details).
 
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity, unprocessed keys and sizes of the
+        requests are recorded in this object (see ``dynamo_pandas.metrics``).
+
     Returns
     -------
     pandas.DataFrame
@@ -122,6 +221,42 @@ def get_df(*, table, keys=None, attributes=None, dtype=None, boto3_kwargs={}):
     2           3.0    player_one  2021-01-18 22:47:23     4.3  2 days 17:41:55
     3           1.0    player_two  2021-01-19 19:07:54     3.8  0 days 22:07:34
 
+    With ``missing="na"``, keys not in the table return rows of missing values so that
+    the rows are aligned with the keys. The ``index`` parameter sets the index of the
+    dataframe:
+
+    >>> df = get_df(
+    ...     table="players",
+    ...     keys=keys(player_id=["player_two", "player_five", "player_one"]),
+    ...     attributes=["player_id", "rating"],
+    ...     missing="na",
+    ...     index="player_id",
+    ... )
+    >>> print(df)
+                 rating
+    player_id
+    player_two      3.8
+    player_five     NaN
+    player_one      4.3
+
+    Nested map attributes can be flattened into columns with the ``flatten``
+    parameter:
+
+    >>> df = get_df(table="teams", flatten=True)
+    >>> print(df)
+      team_id  name stats.wins stats.losses           players
+    0  team_a  Aces         12            3  [player_one, player_two]
+
+    The ``index_name`` parameter reads from a secondary index, which is cheaper than
+    reading the table when the index is sparse or narrow:
+
+    >>> df = get_df(table="players", index_name="bonus-index")
+    >>> print(df)
+          player_id  bonus_points
+    0  player_three             4
+    1    player_one             3
+    2    player_two             1
+
     Specifying item attributes via the ``attributes`` parameter returns only the
     columns corresponding to the specified attributes:
 
@@ -133,28 +268,188 @@ def get_df(*, table, keys=None, attributes=None, dtype=None, boto3_kwargs={}):
     2    player_one     4.3
     3    player_two     3.8
     """  # noqa: E501
-    if keys is not None:
+    deserializer = TypeDeserializer(binary=binary, sets=sets, decompress=True)
+
+    if keys is not None and index_name is not None:
+        items = query_items(
+            keys=keys,
+            table=table,
+            index_name=index_name,
+            attributes=attributes,
+            deserializer=deserializer,
+            boto3_kwargs=boto3_kwargs,
+            metrics=metrics,
+        )
+    elif keys is not None:
+        keys = list(keys)
         items = get_items(
-            keys=keys, table=table, attributes=attributes, boto3_kwargs=boto3_kwargs
+            keys=keys,
+            table=table,
+            attributes=attributes,
+            preserve_order=preserve_order,
+            missing=missing,
+            deserializer=deserializer,
+            max_workers=max_workers,
+            boto3_kwargs=boto3_kwargs,
+            metrics=metrics,
         )
+
+        if missing == "na":
+            # Fill the key attributes of the rows of the missing items.
+            items = [
+                (
+                    {
+                        k: v
+                        for k, v in key.items()
+                        if attributes is None or k in attributes
+                    }
+                    if item is None
+                    else item
+                )
+                for key, item in zip(keys, items)
+            ]
     else:
         items = get_all_items(
-            table=table, attributes=attributes, boto3_kwargs=boto3_kwargs
+            table=table,
+            attributes=attributes,
+            index_name=index_name,
+            segments=segments,
+            deserializer=deserializer,
+            boto3_kwargs=boto3_kwargs,
+            metrics=metrics,
         )
 
-    return _to_df(items=items, dtype=dtype)
+    return _to_df(items=items, dtype=dtype, index=index, flatten=flatten, sep=sep)
+
+
+def execute_df(
+    statement,
+    *,
+    parameters=None,
+    dtype=None,
+    index=None,
+    binary="Binary",
+    sets="set",
+    boto3_kwargs={},
+    metrics=None,
+):
+    """Execute a PartiQL statement and return the items it returns as a dataframe.
+
+    If ``parameters`` is a dataframe, the statement is executed once per row, the
+    values of the columns being bound, in order, to the ``?`` placeholders of the
+    statement. The statements are sent in BatchExecuteStatement requests of up to 25
+    statements, which allows updating or conditionally writing many items, or reading
+    partial items, with few round trips.
+
+    Parameters
+    ----------
+    statement : str
+        PartiQL statement to execute. Values can be passed as ``?`` placeholders bound
+        to the ``parameters``.
+
+    parameters : list or pandas.DataFrame
+        Values of the placeholders of the statement. A list of values executes the
+        statement once (all the pages of the results being read) while a dataframe
+        executes the statement for each row, with the columns bound in order.
+
+    dtype : data type or dict of column names -> data type
+        Use a numpy.dtype or Python type to cast entire pandas object to the same type.
+        Alternatively, use {col: dtype, …}, where col is a column label and dtype is a
+        numpy.dtype or Python type to cast one or more of the DataFrame’s columns to
+        column-specific types.
+
+    index : str or list[str]
+        Column(s) to use as the index of the returned dataframe. If None (default), a
+        default integer index is used.
+
+    binary : str
+        Python type of the binary attribute values: 'Binary' (default) or 'bytes'.
+
+    sets : str
+        Python type of the set attribute values: 'set' (default) or 'list'.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details).
+
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity and sizes of the requests are
+        recorded in this object (see ``dynamo_pandas.metrics``).
+
+    Returns
+    -------
+    pandas.DataFrame
+        A dataframe of the returned items. With a dataframe of parameters, statements
+        that do not return an item (e.g. updates or missing items) return no row.
+
+    Raises
+    ------
+    RuntimeError
+        With a dataframe of parameters, if the execution of the statement fails for
+        any row (see ``transactions.execute_statements``).
+
+    Examples
+    --------
+
+    >>> df = execute_df(
+    ...     'SELECT player_id, rating FROM "players" WHERE rating > ?',
+    ...     parameters=[4],
+    ... )
+    >>> print(df)
+         player_id  rating
+    0  player_four     4.8
+    1   player_one     4.3
+
+    Update the ratings of players from a dataframe:
+
+    >>> print(ratings_df)
+       rating    player_id
+    0     4.5   player_one
+    1     3.9   player_two
+    >>> execute_df(
+    ...     'UPDATE "players" SET rating = ? WHERE player_id = ?',
+    ...     parameters=ratings_df,
+    ... )
+    Empty DataFrame
+    Columns: []
+    Index: []
+    """  # noqa: E501
+    deserializer = TypeDeserializer(binary=binary, sets=sets, decompress=True)
+
+    if isinstance(parameters, pd.DataFrame):
+        items = execute_statements(
+            statement=statement,
+            parameters=parameters.itertuples(index=False, name=None),
+            deserializer=deserializer,
+            boto3_kwargs=boto3_kwargs,
+            metrics=metrics,
+        )
+        items = [item for item in items if item is not None]
+    else:
+        items = execute_statement(
+            statement=statement,
+            parameters=parameters,
+            deserializer=deserializer,
+            boto3_kwargs=boto3_kwargs,
+            metrics=metrics,
+        )
+
+    return _to_df(items=items, dtype=dtype, index=index)
 
 
 def keys(**kwargs):
-    """Generate a list of key dictionaries from the partition key attribute name and a
-    list of values. This can simplify the generation of keys to use with the ``get_df``
-    function when only a partition key is used.
+    """Generate a list of key dictionaries from key attribute names and lists of
+    values. This can simplify the generation of keys to use with the ``get_df``
+    function.
 
     Parameters
     ----------
     **kwargs
-        A single keyword argument corresponding to the partition key name with a value
-        corresponding to the list of key values to return.
+        Keyword arguments corresponding to the key attribute names (the partition key
+        and, for tables with a composite primary key, the sort key) with values
+        corresponding to the lists (or numpy arrays or pandas series) of key values.
+        All the lists must have the same length.
 
     Returns
     -------
@@ -170,15 +465,132 @@ def keys(**kwargs):
     >>> key_list = keys(player_id=["player_two", "player_three", "player_four"])
     >>> print(key_list)
     [{'player_id': 'player_one'}, {'player_id': 'player_three'}, {'player_id': 'player_four'}]
+
+    With a composite primary key, the values of the partition and sort keys are
+    paired:
+
+    >>> key_list = keys(player_id=["player_one", "player_one"], game=[1, 2])
+    >>> print(key_list)
+    [{'player_id': 'player_one', 'game': 1}, {'player_id': 'player_one', 'game': 2}]
+    """  # noqa: E501
+    if len(kwargs) == 0:
+        raise ValueError("At least one key attribute must be specified.")
+
+    values = [_key_values(v) for v in kwargs.values()]
+    if len({len(v) for v in values}) > 1:
+        raise ValueError("All the key attributes must have the same number of values.")
+
+    return _key_dicts(list(kwargs), values)
+
+
+def keys_from_df(df, *, columns=None, table=None, boto3_kwargs={}):
+    """Generate the list of unique key dictionaries of the rows of a dataframe.
+
+    The key values are extracted from the key columns as a whole, deduplicated and
+    converted to Python types before building the key dictionaries, which is much
+    faster than iterating over the rows of the dataframe for large dataframes.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataframe with the key attributes as columns or index levels.
+
+    columns : list[str]
+        Names of the key columns (the partition key and, for tables with a composite
+        primary key, the sort key).
+
+    table : str
+        Name of the DynamoDB table, used to read the key attribute names (see
+        ``transactions.table_info``) if ``columns`` is not specified.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details), used with ``table``.
+
+    Returns
+    -------
+    list[dict]
+        The list of the unique key dictionaries, in the order of their first row.
+
+    Examples
+    --------
+
+    >>> print(games_df)
+          player_id  game  score
+    0    player_one     1     12
+    1    player_one     2     15
+    2    player_one     2     15
+    3    player_two     1      9
+    >>> key_list = keys_from_df(games_df, columns=["player_id", "game"])
+    >>> print(key_list)
+    [{'player_id': 'player_one', 'game': 1}, {'player_id': 'player_one', 'game': 2}, {'player_id': 'player_two', 'game': 1}]
+
+    The key columns can be read from the table description:
+
+    >>> df = get_df(table="games", keys=keys_from_df(games_df, table="games"))
     """  # noqa: E501
-    if len(kwargs.keys()) > 1:
-        raise ValueError("Only one key attribute (partition key) is supported.")
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df must be a pandas DataFrame")
 
-    k = list(kwargs.keys())[0]
-    return [{k: v} for v in kwargs[k]]
+    if columns is None:
+        if table is None:
+            raise ValueError("columns or table must be specified")
+        columns = table_info(table=table, boto3_kwargs=boto3_kwargs)["key"]
+    elif isinstance(columns, str):
+        columns = [columns]
 
+    missing_columns = [
+        c for c in columns if c not in df.columns and c not in df.index.names
+    ]
+    if len(missing_columns) > 0:
+        raise ValueError(f"Key columns {missing_columns} not found in the dataframe")
 
-def put_df(df, *, table, boto3_kwargs={}):
+    key_df = pd.DataFrame(
+        {c: df[c] if c in df.columns else df.index.get_level_values(c) for c in columns}
+    )
+    if key_df.isna().any(axis=None):
+        raise ValueError("Key columns cannot contain missing values")
+
+    key_df = key_df.drop_duplicates()
+
+    return _key_dicts(columns, [_key_values(key_df[c]) for c in columns])
+
+
+def _key_values(values):
+    """Convert a list, numpy array or pandas series of key values to a list of Python
+    values."""
+    if hasattr(values, "tolist"):
+        return values.tolist()
+
+    return list(values)
+
+
+def _key_dicts(names, values):
+    """Build the key dictionaries of lists of values of the key attributes."""
+    if len(names) == 1:
+        name = names[0]
+        return [{name: v} for v in values[0]]
+
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def put_df(
+    df,
+    *,
+    table,
+    processes=None,
+    lists_as_sets=False,
+    compress=None,
+    transactional=False,
+    condition=None,
+    version_column=None,
+    on_duplicate=None,
+    schedule=None,
+    max_workers=1,
+    boto3_kwargs={},
+    metrics=None,
+):
     """Put rows of a dataframe as items into a table. If the item(s) do not exist in the
     table they are created, otherwise the existing items are replaced with the new ones.
 
@@ -191,11 +603,99 @@ def put_df(df, *, table, boto3_kwargs={}):
     table : str
         Name of the DynamoDB table.
 
+    processes : int
+        If specified, the rows of the dataframe are split into ``processes`` ranges of
+        rows, each range being serialized and written to the table in a separate
+        process. This bypasses the serialization bottleneck for very large dataframes.
+        Each process only receives its own range of rows, so the dataframe is
+        transferred to the processes once in total. If the writing of any range fails, a RuntimeError
+        listing the failed ranges is raised once all the ranges are processed.
+
+    lists_as_sets : bool
+        If True, non-empty lists (or numpy arrays) of numbers, strings or bytes are
+        written as DynamoDB number, string and binary sets instead of lists. Duplicate
+        values are therefore removed. Numpy arrays of ``uint8`` values are always
+        written as binary values.
+
+    compress : dict
+        Dictionary of column names -> compression codec ('gzip' or 'zstd') of the
+        columns to store compressed in binary attributes, reducing the size of the
+        items and the consumed write capacity for wide text or JSON columns. String,
+        bytes, list and dictionary values are supported (lists and dictionaries are
+        encoded as JSON). The values are decompressed transparently by the ``get_df``
+        function. The 'zstd' codec requires the ``zstandard`` package.
+
+    transactional : bool
+        If True, the rows are written in groups of up to 100 rows, each group being
+        written atomically in a TransactWriteItems request, and the rows of the groups
+        that failed are returned so that only these rows need to be written again. The
+        groups are written concurrently. Transactions consume twice the write capacity
+        of non-transactional writes and the rows of a group must have distinct keys.
+        Cannot be combined with ``processes``.
+
+    condition : str or boto3.dynamodb.conditions.ConditionBase
+        Condition that each row must satisfy to be written, either as a condition
+        expression string (e.g. ``"attribute_not_exists(player_id)"``), as a boto3
+        condition object (e.g. ``Attr("rating").lt(4)``) or as one of the version
+        conditions 'version_gt' or 'version_ge', which write a row only if no item with
+        the same key exists or if the ``version_column`` value of the row is greater
+        (or equal) than the one of the existing item. Without ``transactional``, the
+        rows are written concurrently in separate conditional PutItem requests and the
+        rows rejected by the condition are returned, so that several writers can write
+        to the same table in parallel without overwriting newer data. With
+        ``transactional=True``, the groups that contain a rejected row are not written.
+        Cannot be combined with ``processes``.
+
+    version_column : str
+        Name of the version (or timestamp) column compared by the 'version_gt' and
+        'version_ge' conditions.
+
+    on_duplicate : str
+        How rows with the same key are handled, the key attributes being read from the
+        table description (see ``transactions.table_info``): 'last' writes only the
+        last row of each key (the row that would be stored if the rows were written
+        one by one), 'first' writes only the first row of each key and 'error' raises
+        a ValueError if the dataframe contains rows with the same key. Duplicate keys
+        are found in a single pass over the key columns before any row is written. If
+        None (default), rows are not checked and a batch containing two rows with the
+        same key is rejected by DynamoDB.
+
+    schedule : str
+        Order in which the rows are written. If None (default), the rows are written
+        in the order of the dataframe. With 'round_robin', the rows are interleaved
+        across the partition keys (read from the table description, see
+        ``transactions.table_info``): the first row of each partition key is written,
+        then the second row of each partition key and so on, the partition keys being
+        ordered by hash. This spreads the writes of dataframes sorted by partition
+        key, which would otherwise send long runs of writes to the same partition and
+        be throttled, over all the partitions of the table. With ``transactional``,
+        ``condition`` or ``processes``, the rows are grouped, written concurrently or
+        split into ranges in the interleaved order.
+
+    max_workers : int
+        Maximum number of batch requests in flight. Default is 1 (sequential
+        requests). With more than 1, the number of requests in flight is increased
+        while the writes succeed and halved when they are throttled or return
+        unprocessed items, to find the highest throughput the table sustains (see
+        ``transactions.put_items_multi``). Cannot be combined with ``processes``,
+        ``transactional`` or ``condition``.
+
     boto3_kwargs : dict
         Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
         function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
         for details).
 
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity, unprocessed items and sizes of the
+        requests are recorded in this object (see ``dynamo_pandas.metrics``).
+
+    Returns
+    -------
+    pandas.DataFrame
+        With ``transactional=True``, the rows of the groups that were not written
+        (empty if all the groups are committed). With a ``condition`` only, the rows
+        rejected by the condition. None otherwise.
+
     Examples
     --------
     Assume with have the following dataframe:
@@ -211,27 +711,427 @@ def put_df(df, *, table, boto3_kwargs={}):
     ``players``:
 
     >>> put_df(players_df, table="players")
+
+    Large dataframes can be written using multiple processes:
+
+    >>> put_df(large_df, table="players", processes=8)
+
+    Wide text columns can be stored compressed:
+
+    >>> put_df(reviews_df, table="reviews", compress={"review_text": "gzip"})
+
+    Rows can be written in atomic groups, retrying only the failed groups:
+
+    >>> failed_df = put_df(players_df, table="players", transactional=True)
+    >>> if not failed_df.empty:
+    ...     failed_df = put_df(failed_df, table="players", transactional=True)
+
+    Rows can be written only if they are newer than the items in the table:
+
+    >>> rejected_df = put_df(
+    ...     players_df, table="players", condition="version_gt", version_column="version"
+    ... )
+
+    Rows with the same key can be deduplicated, keeping the last row of each key:
+
+    >>> put_df(events_df, table="events", on_duplicate="last")
+
+    The rows of a dataframe sorted by partition key can be interleaved across the
+    partition keys:
+
+    >>> put_df(events_df, table="events", schedule="round_robin")
     """  # noqa: E501
-    put_items(items=_to_items(df), table=table, boto3_kwargs=boto3_kwargs)
+    if compress is not None and isinstance(df, pd.DataFrame):
+        missing_columns = [c for c in compress if c not in df.columns]
+        if len(missing_columns) > 0:
+            raise ValueError(
+                f"Compressed columns {missing_columns} not found in the dataframe"
+            )
 
+    if processes is not None and (transactional or condition is not None):
+        raise ValueError(
+            "transactional and condition cannot be combined with processes"
+        )
+
+    if max_workers != 1 and (
+        processes is not None or transactional or condition is not None
+    ):
+        raise ValueError(
+            "max_workers cannot be combined with processes, transactional or condition"
+        )
+
+    if on_duplicate is not None:
+        df = _drop_duplicate_keys(df, table, on_duplicate, boto3_kwargs)
 
-def _to_df(items, *, dtype=None):
+    if schedule is not None:
+        df = _schedule_rows(df, table, schedule, boto3_kwargs)
+
+    if transactional:
+        results = transact_put_items(
+            items=_to_items(df, compress=compress),
+            table=table,
+            condition=condition,
+            version_attribute=version_column,
+            serializer=TypeSerializer(lists_as_sets=lists_as_sets),
+            boto3_kwargs=boto3_kwargs,
+            metrics=metrics,
+        )
+        failed = [
+            row
+            for start, stop, error in results
+            if error is not None
+            for row in range(start, stop)
+        ]
+        return df.iloc[failed]
+    elif condition is not None:
+        rejected = conditional_put_items(
+            items=_to_items(df, compress=compress),
+            table=table,
+            condition=condition,
+            version_attribute=version_column,
+            serializer=TypeSerializer(lists_as_sets=lists_as_sets),
+            boto3_kwargs=boto3_kwargs,
+            metrics=metrics,
+        )
+        return df.iloc[rejected]
+    elif processes is None:
+        put_items(
+            items=_to_items(df, chunk_size=1000, compress=compress),
+            table=table,
+            serializer=TypeSerializer(lists_as_sets=lists_as_sets),
+            max_workers=max_workers,
+            boto3_kwargs=boto3_kwargs,
+            metrics=metrics,
+        )
+    else:
+        _put_df_processes(
+            df,
+            table=table,
+            processes=processes,
+            lists_as_sets=lists_as_sets,
+            compress=compress,
+            boto3_kwargs=boto3_kwargs,
+            metrics=metrics,
+        )
+
+
+def _drop_duplicate_keys(df, table, on_duplicate, boto3_kwargs):
+    """Return the dataframe without the rows with duplicate keys according to the
+    on_duplicate option of the put_df function."""
+    if on_duplicate not in ("first", "last", "error"):
+        raise ValueError("on_duplicate must be one of 'first', 'last' or 'error'")
+
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df must be a pandas DataFrame")
+
+    key = table_info(table=table, boto3_kwargs=boto3_kwargs)["key"]
+    missing_columns = [c for c in key if c not in df.columns]
+    if len(missing_columns) > 0:
+        raise ValueError(f"Key columns {missing_columns} not found in the dataframe")
+
+    duplicated = df.duplicated(
+        subset=key, keep="last" if on_duplicate == "last" else "first"
+    )
+    if not duplicated.any():
+        return df
+
+    if on_duplicate == "error":
+        rows = np.flatnonzero(duplicated).tolist()
+        raise ValueError(
+            f"The rows at positions {rows[:10]}{'...' if len(rows) > 10 else ''} "
+            "have the same key as previous rows"
+        )
+
+    return df[~duplicated.to_numpy()]
+
+
+def _schedule_rows(df, table, schedule, boto3_kwargs):
+    """Return the rows of the dataframe in the order of the schedule option of the
+    put_df function."""
+    if schedule != "round_robin":
+        raise ValueError("schedule must be None or 'round_robin'")
+
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df must be a pandas DataFrame")
+
+    partition_key = table_info(table=table, boto3_kwargs=boto3_kwargs)["partition_key"]
+    if partition_key not in df.columns:
+        raise ValueError(
+            f"Partition key column '{partition_key}' not found in the dataframe"
+        )
+
+    # Sort the rows by their rank within their partition key, then by the hash of the
+    # partition key, so that consecutive rows have different partition keys.
+    keys = df[partition_key]
+    rank = keys.groupby(keys, sort=False, dropna=False).cumcount().to_numpy()
+    key_hash = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+    return df.iloc[np.lexsort((key_hash, rank))]
+
+
+def _put_df_range(df, table, lists_as_sets, compress, boto3_kwargs, collect_metrics):
+    """Write a range of rows of a dataframe to a table in a worker process and return
+    the metrics totals, if collected."""
+    metrics = Metrics() if collect_metrics else None
+
+    put_items(
+        items=_to_items(df, chunk_size=1000, compress=compress),
+        table=table,
+        serializer=TypeSerializer(lists_as_sets=lists_as_sets),
+        boto3_kwargs=boto3_kwargs,
+        metrics=metrics,
+    )
+
+    return None if metrics is None else metrics.to_dict()
+
+
+def _put_df_processes(
+    df, *, table, processes, lists_as_sets, compress, boto3_kwargs, metrics
+):
+    """Write the rows of a dataframe to a table, splitting the rows in ranges written
+    by separate processes."""
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df must be a pandas DataFrame")
+
+    bounds = np.linspace(0, len(df), processes + 1).astype(int)
+    ranges = [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    # Only the rows of its range are pickled and sent to each process.
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(
+                _put_df_range,
+                df.iloc[start:stop],
+                table,
+                lists_as_sets,
+                compress,
+                boto3_kwargs,
+                metrics is not None,
+            )
+            for start, stop in ranges
+        ]
+
+    failures = []
+    for (start, stop), future in zip(ranges, futures):
+        if future.exception() is not None:
+            failures.append(((start, stop), future.exception()))
+        elif metrics is not None:
+            metrics.merge(future.result())
+
+    if len(failures) > 0:
+        failed_ranges = ", ".join(f"{start}:{stop}" for (start, stop), _ in failures)
+        raise RuntimeError(
+            f"Failed to put the rows {failed_ranges} of the dataframe"
+        ) from failures[0][1]
+
+
+def copy_table(
+    *,
+    source,
+    destination,
+    transform=None,
+    segments=1,
+    max_workers=8,
+    binary="Binary",
+    sets="set",
+    boto3_kwargs={},
+    metrics=None,
+):
+    """Copy the items of a table into another table.
+
+    The source table is read by a parallel scan and each page of items is written to
+    the destination table as it is read, by concurrent batch writers. Without a
+    ``transform``, the items are copied in DynamoDB format without being deserialized
+    and re-serialized, and only the pages being written are held in memory.
+
+    Parameters
+    ----------
+    source : str
+        Name of the DynamoDB table to copy.
+
+    destination : str
+        Name of the DynamoDB table to write the items to.
+
+    transform : callable
+        If specified, function called with a dataframe of the items of each scanned
+        page and returning the dataframe of the items to write (e.g. to rename, add,
+        drop or convert columns, or to filter rows) for migrations. Items are only
+        deserialized when a transform is specified. The missing values (NaN, NA, NaT)
+        of the returned rows, such as the values of the attributes an item did not
+        have, are left out of the written items.
+
+    segments : int
+        Number of segments of the parallel scan of the source table. Default is 1.
+
+    max_workers : int
+        Maximum number of pages written concurrently. Default is 8.
+
+    binary : str
+        Type of the binary values of the dataframes passed to ``transform``: 'Binary'
+        (default) for ``boto3.dynamodb.types.Binary`` objects or 'bytes'.
+
+    sets : str
+        Type of the set values of the dataframes passed to ``transform``: 'set'
+        (default) or 'list'.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details).
+
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity, unprocessed items and sizes of the
+        requests are recorded in this object (see ``dynamo_pandas.metrics``).
+
+    Returns
+    -------
+    int
+        The number of items written to the destination table.
+
+    Examples
+    --------
+
+    >>> copy_table(source="players", destination="players-backup", segments=4)
+    4
+
+    Columns can be transformed while copying:
+
+    >>> copy_table(
+    ...     source="players",
+    ...     destination="players-v2",
+    ...     transform=lambda df: df.rename(columns={"rating": "score"}),
+    ... )
+    4
+    """  # noqa: E501
+    if transform is not None and not callable(transform):
+        raise TypeError("transform must be a function of a dataframe")
+
+    deserializer = TypeDeserializer(binary=binary, sets=sets)
+    client = boto3.client("dynamodb", **boto3_kwargs)
+
+    def write_page(items):
+        if transform is not None:
+            df = transform(_to_df([deserializer.deserialize({"M": i}) for i in items]))
+            # The missing values are attributes that the items do not have.
+            items = [
+                item
+                for _, item in _serialize(
+                    (destination, i) for i in _to_items(df, dropna=True)
+                )
+            ]
+
+        _write_items(((destination, item) for item in items), client, metrics=metrics)
+
+        return len(items)
+
+    written = 0
+    pending = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for _, items, _ in scan_pages(
+                table=source,
+                segments=segments,
+                raw=True,
+                boto3_kwargs=boto3_kwargs,
+                metrics=metrics,
+            ):
+                # Limit the number of pages held in memory to the pages being written.
+                if len(pending) >= max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    written += sum(future.result() for future in done)
+
+                pending.add(executor.submit(write_page, items))
+
+            written += sum(future.result() for future in pending)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    return written
+
+
+def _to_df(items, *, dtype=None, index=None, flatten=False, sep="."):
     """Convert an item dictionary or list of item dictionaries into a pandas
-    DataFrame."""
+    DataFrame. If flatten is True, nested maps are flattened into separate columns."""
     if isinstance(items, dict):
         items = [items]
 
+    if flatten:
+        items = [_flatten(item, sep=sep) for item in items]
+
     df = pd.DataFrame(items)
 
     if dtype is not None:
         df = df.astype(dtype)
 
+    if index is not None and not df.empty:
+        df = df.set_index(index)
+
     return df
 
 
-def _to_items(df):
-    """Convert a pandas dataframe to a dictionary of items."""
+def _flatten(item, *, sep, prefix=""):
+    """Flatten the nested maps of an item dictionary into a single level dictionary
+    with keys joined by sep."""
+    flat = {}
+    for name, value in item.items():
+        if isinstance(value, dict) and len(value) > 0:
+            flat.update(_flatten(value, sep=sep, prefix=f"{prefix}{name}{sep}"))
+        else:
+            flat[f"{prefix}{name}"] = value
+
+    return flat
+
+
+def _to_items(df, chunk_size=None, compress=None, dropna=False):
+    """Convert a pandas dataframe to a list of item dictionaries. If chunk_size is
+    specified, return a generator converting the rows by chunks of chunk_size rows
+    instead. If compress is specified, the values of the columns it maps to a codec are
+    compressed. If dropna is True, the missing values (NaN, NA and NaT) of each row are
+    left out of its item instead of being written as NULL values, so that the columns
+    of attributes an item did not have are not added to the item."""
     if not isinstance(df, pd.DataFrame):
         raise TypeError("df must be a pandas DataFrame")
 
-    return df.to_dict("records")
+    if chunk_size is None:
+        return _compress_items(_records(df, dropna), compress)
+
+    return (
+        item
+        for start in range(0, len(df), chunk_size)
+        for item in _compress_items(
+            _records(df.iloc[start : start + chunk_size], dropna),  # noqa: E203
+            compress,
+        )
+    )
+
+
+def _records(df, dropna):
+    """Return the rows of a dataframe as dictionaries, without their missing values if
+    dropna is True."""
+    records = df.to_dict("records")
+    if not dropna:
+        return records
+
+    # The None values of object columns are NULL attributes, not missing values.
+    missing = df.isna().to_numpy()
+    for i, dtype in enumerate(df.dtypes):
+        if dtype == object:
+            missing[:, i] &= np.array([v is not None for v in df.iloc[:, i]], bool)
+
+    return [
+        {name: value for (name, value), m in zip(record.items(), row) if not m}
+        for record, row in zip(records, missing)
+    ]
+
+
+def _compress_items(items, compress):
+    """Compress in place the values of the item attributes mapped to a codec in the
+    compress dictionary and return the items."""
+    if compress:
+        for item in items:
+            for name, codec in compress.items():
+                if name in item:
+                    item[name] = compress_value(item[name], codec=codec)
+
+    return items
@@ -0,0 +1,5 @@
+from .io import read_ddb_json
+from .io import read_export
+from .io import to_ddb_json
+
+__all__ = ["read_ddb_json", "read_export", "to_ddb_json"]
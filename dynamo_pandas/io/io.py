@@ -0,0 +1,369 @@
+import base64
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import glob
+import gzip
+from itertools import islice
+import json
+import os
+
+from ..dynamo_pandas import _to_df
+from ..dynamo_pandas import _to_items
+from ..serde import TypeDeserializer
+from ..serde import TypeSerializer
+
+try:
+    import fsspec
+except ImportError:  # pragma: no cover
+    fsspec = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def read_export(
+    path,
+    *,
+    attributes=None,
+    dtype=None,
+    index=None,
+    binary="Binary",
+    sets="set",
+    processes=None,
+):
+    """Read the data files of a DynamoDB export to S3 in DynamoDB JSON format into a
+    dataframe.
+
+    Exporting a table to S3 and reading the export files does not consume any read
+    capacity of the table and is much faster than scanning large tables. The data
+    files are read line by line and the items are converted with the same type
+    conversions as the ``get_df`` function. Exports in the ION format are not
+    supported.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Path of a data file (``.json.gz`` or ``.json``), glob pattern of data files
+        (e.g. ``"export/data/*.json.gz"``) or directory in which all the ``.json.gz``
+        files are read (e.g. the directory of an export, containing the ``data``
+        directory). Paths can be filesystem URLs (e.g. ``s3://bucket/export/``), which
+        requires the ``fsspec`` package (and its filesystem specific packages, e.g.
+        ``s3fs``).
+
+    attributes : list[str]
+        Names of the item attributes to return as dataframe columns. If None (default),
+        all attributes are returned.
+
+    dtype : data type or dict of column names -> data type
+        Use a numpy.dtype or Python type to cast entire pandas object to the same type.
+        Alternatively, use {col: dtype, …}, where col is a column label and dtype is a
+        numpy.dtype or Python type to cast one or more of the DataFrame’s columns to
+        column-specific types.
+
+    index : str or list[str]
+        Column(s) to use as the index of the returned dataframe. If None (default), a
+        default integer index is used.
+
+    binary : str
+        Python type of the binary attribute values: 'Binary' (default) or 'bytes'.
+
+    sets : str
+        Python type of the set attribute values: 'set' (default) or 'list'.
+
+    processes : int
+        If specified, the data files are read in parallel by this number of processes.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A dataframe where each item of the export is represented by a row and its
+        attributes by columns, the items of the data files being concatenated in the
+        order of the file names.
+
+    Examples
+    --------
+
+    >>> df = read_export("exports/AWSDynamoDB/01234567890123-abcdefgh/data/")
+    >>> print(df)
+          player_id  bonus_points            last_play  rating        play_time
+    0  player_three             4  2021-01-21 10:22:43     2.5  1 days 14:01:19
+    1   player_four           NaN  2021-01-22 13:51:12     4.8  0 days 03:45:49
+    2    player_one             3  2021-01-18 22:47:23     4.3  2 days 17:41:55
+    3    player_two             1  2021-01-19 19:07:54     3.8  0 days 22:07:34
+    """  # noqa: E501
+    files = _find_files(path)
+    options = dict(attributes=attributes, binary=binary, sets=sets)
+
+    if processes is None:
+        items = [_read_export_file(file, **options) for file in files]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(_read_export_file, file, **options) for file in files
+            ]
+        items = [future.result() for future in futures]
+
+    return _to_df(
+        items=[item for file_items in items for item in file_items],
+        dtype=dtype,
+        index=index,
+    )
+
+
+def _read_export_file(file, *, attributes=None, binary="Binary", sets="set"):
+    """Read the items of an export data file, line by line."""
+    deserializer = TypeDeserializer(binary=binary, sets=sets, decompress=True)
+
+    with _open(file) as f:
+        return list(_read_items(f, attributes=attributes, deserializer=deserializer))
+
+
+def _read_items(f, *, attributes=None, deserializer):
+    """Yield the items of the lines of a DynamoDB JSON file object."""
+    for line in f:
+        if not line.strip():
+            continue
+
+        item = _loads(line)["Item"]
+        if attributes is not None:
+            item = {k: v for k, v in item.items() if k in attributes}
+
+        yield deserializer.deserialize({"M": _from_json(item)})
+
+
+def to_ddb_json(df, path, *, lists_as_sets=False, compress=None):
+    """Write the rows of a dataframe to a line-delimited DynamoDB JSON file.
+
+    Each row is written as a ``{"Item": {...}}`` line with the attribute values in
+    DynamoDB JSON format (e.g. ``{"N": "1.5"}``), the format of the data files of
+    DynamoDB exports to S3. The rows are converted with the same type conversions as
+    the ``put_df`` function and written in chunks, which allows staging loads in local
+    files and replaying them later. The ``orjson`` package is used, if installed, to
+    encode the lines faster.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataframe to write.
+
+    path : str, os.PathLike or file-like object
+        Path of the file to write, compressed with gzip if the path ends with ``.gz``,
+        or text file object (e.g. ``sys.stdout``) to write to.
+
+    lists_as_sets : bool
+        If True, non-empty lists of numbers, strings or bytes are written as DynamoDB
+        sets instead of lists (see ``put_df``).
+
+    compress : dict
+        Dictionary of column names -> compression codec ('gzip' or 'zstd') of the
+        columns to store compressed in binary attributes (see ``put_df``).
+
+    Examples
+    --------
+
+    >>> to_ddb_json(players_df, "players.json.gz")
+    """
+    serializer = TypeSerializer(lists_as_sets=lists_as_sets)
+
+    with _open_file(path, "wt") as f:
+        for item in _to_items(df, chunk_size=1000, compress=compress):
+            item = _to_json(serializer.serialize(item)["M"])
+            f.write(_dumps({"Item": item}) + "\n")
+
+
+def read_ddb_json(
+    path,
+    *,
+    attributes=None,
+    dtype=None,
+    index=None,
+    binary="Binary",
+    sets="set",
+    chunksize=None,
+):
+    """Read a line-delimited DynamoDB JSON file, such as written by the
+    ``to_ddb_json`` function or a data file of a DynamoDB export to S3, into a
+    dataframe.
+
+    The lines are decoded as they are read, with the same type conversions as the
+    ``get_df`` function. The ``orjson`` package is used, if installed, to decode the
+    lines faster.
+
+    Parameters
+    ----------
+    path : str, os.PathLike or file-like object
+        Path of the file to read, decompressed with gzip if the path ends with
+        ``.gz``, or text file object (e.g. ``sys.stdin``) to read from.
+
+    attributes : list[str]
+        Names of the item attributes to return as dataframe columns. If None (default),
+        all attributes are returned.
+
+    dtype : data type or dict of column names -> data type
+        Use a numpy.dtype or Python type to cast entire pandas object to the same type.
+        Alternatively, use {col: dtype, …}, where col is a column label and dtype is a
+        numpy.dtype or Python type to cast one or more of the DataFrame’s columns to
+        column-specific types.
+
+    index : str or list[str]
+        Column(s) to use as the index of the returned dataframe(s). If None (default),
+        a default integer index is used.
+
+    binary : str
+        Python type of the binary attribute values: 'Binary' (default) or 'bytes'.
+
+    sets : str
+        Python type of the set attribute values: 'set' (default) or 'list'.
+
+    chunksize : int
+        If specified, return an iterator of dataframes of ``chunksize`` rows (the last
+        one possibly shorter) so that files larger than memory can be processed.
+
+    Returns
+    -------
+    pandas.DataFrame or iterator of pandas.DataFrame
+        A dataframe where each item of the file is represented by a row and its
+        attributes by columns or, with ``chunksize``, an iterator of such dataframes.
+
+    Examples
+    --------
+
+    >>> df = read_ddb_json("players.json.gz")
+
+    >>> for chunk_df in read_ddb_json("players.json.gz", chunksize=10000):
+    ...     put_df(chunk_df, table="players")
+    """  # noqa: E501
+    deserializer = TypeDeserializer(binary=binary, sets=sets, decompress=True)
+
+    if chunksize is None:
+        with _open_file(path, "rt") as f:
+            items = list(
+                _read_items(f, attributes=attributes, deserializer=deserializer)
+            )
+        return _to_df(items=items, dtype=dtype, index=index)
+
+    return _read_ddb_json_chunks(
+        path,
+        attributes=attributes,
+        dtype=dtype,
+        index=index,
+        deserializer=deserializer,
+        chunksize=chunksize,
+    )
+
+
+def _read_ddb_json_chunks(path, *, attributes, dtype, index, deserializer, chunksize):
+    """Yield dataframes of chunksize rows read from a DynamoDB JSON file."""
+    with _open_file(path, "rt") as f:
+        items = _read_items(f, attributes=attributes, deserializer=deserializer)
+        while True:
+            chunk = list(islice(items, chunksize))
+            if len(chunk) == 0:
+                return
+            yield _to_df(items=chunk, dtype=dtype, index=index)
+
+
+def _find_files(path):
+    """Return the sorted list of the data files of a path, glob pattern or
+    directory."""
+    path = os.fspath(path)
+
+    if "://" in path:
+        if fsspec is None:
+            raise ImportError(
+                "The fsspec package is required to read files from filesystem URLs"
+            )
+        fs, _, paths = fsspec.get_fs_token_paths(path)
+        if len(paths) == 1 and fs.isdir(paths[0]):
+            paths = fs.glob(paths[0].rstrip("/") + "/**/*.json.gz")
+        elif len(paths) == 1 and not fs.exists(paths[0]):
+            paths = []
+        files = [fs.unstrip_protocol(p) for p in paths]
+    elif os.path.isdir(path):
+        files = glob.glob(os.path.join(path, "**", "*.json.gz"), recursive=True)
+    else:
+        files = glob.glob(path)
+
+    if len(files) == 0:
+        raise FileNotFoundError(f"No data files found in '{path}'")
+
+    return sorted(files)
+
+
+def _open_file(path, mode):
+    """Open a path, compressed with gzip if it ends with .gz, in text mode or return
+    a context manager yielding the file object if path is a file object."""
+    if hasattr(path, "read") or hasattr(path, "write"):
+        return nullcontext(path)
+
+    path = os.fspath(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8")
+
+    return open(path, mode, encoding="utf-8")
+
+
+def _loads(line):
+    """Decode a JSON line, with orjson if installed."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _dumps(value):
+    """Encode a value as JSON, with orjson if installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value)
+
+
+def _open(file):
+    """Open a data file in text mode, decompressing gzip files."""
+    if "://" in file:
+        return fsspec.open(file, "rt", compression="infer", encoding="utf-8").open()
+
+    return _open_file(file, "rt")
+
+
+def _from_json(value):
+    """Convert the base64 encoded binary values of a DynamoDB JSON attribute map, as
+    found in JSON files, to bytes."""
+    return {name: _attribute_from_json(v) for name, v in value.items()}
+
+
+def _to_json(value):
+    """Convert the binary values of a DynamoDB attribute map to base64 encoded strings
+    so that the map can be encoded as JSON."""
+    return {name: _attribute_to_json(v) for name, v in value.items()}
+
+
+def _attribute_to_json(value):
+    """Convert the binary values of a DynamoDB attribute value to base64 encoded
+    strings."""
+    (dynamodb_type, v) = next(iter(value.items()))
+    if dynamodb_type == "B":
+        return {"B": base64.b64encode(v).decode("ascii")}
+    elif dynamodb_type == "BS":
+        return {"BS": [base64.b64encode(b).decode("ascii") for b in v]}
+    elif dynamodb_type == "M":
+        return {"M": _to_json(v)}
+    elif dynamodb_type == "L":
+        return {"L": [_attribute_to_json(e) for e in v]}
+    return value
+
+
+def _attribute_from_json(value):
+    """Convert the base64 encoded binary values of a DynamoDB JSON attribute value to
+    bytes."""
+    (dynamodb_type, v) = next(iter(value.items()))
+    if dynamodb_type == "B":
+        return {"B": base64.b64decode(v)}
+    elif dynamodb_type == "BS":
+        return {"BS": [base64.b64decode(b) for b in v]}
+    elif dynamodb_type == "M":
+        return {"M": _from_json(v)}
+    elif dynamodb_type == "L":
+        return {"L": [_attribute_from_json(e) for e in v]}
+    return value
@@ -0,0 +1,4 @@
+from .metrics import logging_callback
+from .metrics import Metrics
+
+__all__ = ["logging_callback", "Metrics"]
@@ -0,0 +1,235 @@
+import logging
+import threading
+
+_READ_OPERATIONS = ("BatchGetItem", "GetItem", "Query", "Scan")
+
+
+class Metrics:
+    """Collect instrumentation metrics from the calls made to DynamoDB.
+
+    An instance of this class can be passed to the ``metrics`` parameter of the
+    functions of the ``transactions`` module as well as of the ``get_df`` and
+    ``put_df`` functions. Each request made to DynamoDB, and each serialization or
+    deserialization step, is recorded as an event. Events are accumulated in the
+    instance totals and passed to the callback functions, if any.
+
+    Events are dictionaries with the following keys::
+
+        Key                     Description
+        ---                     -----------
+        operation               DynamoDB API operation name (e.g. 'BatchGetItem')
+                                or 'serialize'/'deserialize'.
+        tables                  List of the table names involved.
+        read                    True if the request is a read (e.g. 'Scan' or a
+                                PartiQL SELECT statement).
+        latency                 Duration of the operation in seconds.
+        consumed_capacity       Capacity units consumed by the request.
+        items                   Number of items returned or written.
+        unprocessed             Number of keys or items returned as unprocessed.
+        retry                   True if the request resubmits unprocessed keys or
+                                items.
+        throttles               Number of throttled attempts of the request, retried
+                                by botocore or raised as throttling errors.
+        bytes_serialized        Estimated size of the serialized items.
+        bytes_decoded           Estimated size of the decoded items.
+
+    Parameters
+    ----------
+    callbacks : list[callable]
+        Functions to call with each event dictionary. Callbacks can be used to
+        export the events to logging (see ``logging_callback``) or to any other
+        metrics sink.
+
+    Examples
+    --------
+
+    >>> metrics = Metrics()
+    >>> df = get_df(table="players", metrics=metrics)
+    >>> print(metrics.to_dict())
+    {'requests': 1, 'retries': 0, 'throttles': 0, 'unprocessed': 0, 'items': 4,
+     'latency': 0.0123, 'read_capacity_units': 0.5, 'write_capacity_units': 0.0,
+     'bytes_serialized': 0, 'bytes_decoded': 412}
+
+    Events can be exported to other sinks, for instance an OpenTelemetry histogram:
+
+    >>> metrics = Metrics(
+    ...     callbacks=[
+    ...         lambda event: histogram.record(
+    ...             event["latency"], {"operation": event["operation"]}
+    ...         )
+    ...     ]
+    ... )
+    """
+
+    def __init__(self, callbacks=None):
+        self.callbacks = list(callbacks) if callbacks is not None else []
+        self.requests = 0
+        self.retries = 0
+        self.throttles = 0
+        self.unprocessed = 0
+        self.items = 0
+        self.latency = 0.0
+        self.read_capacity_units = 0.0
+        self.write_capacity_units = 0.0
+        self.bytes_serialized = 0
+        self.bytes_decoded = 0
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        *,
+        operation,
+        tables,
+        latency,
+        read=None,
+        consumed_capacity=0.0,
+        items=0,
+        unprocessed=0,
+        retry=False,
+        throttles=0,
+        bytes_serialized=0,
+        bytes_decoded=0,
+    ):
+        """Record an event, add it to the totals and pass it to the callbacks.
+
+        Parameters
+        ----------
+        operation : str
+            DynamoDB API operation name, or 'serialize'/'deserialize'.
+
+        tables : list[str]
+            Names of the tables involved.
+
+        latency : float
+            Duration of the operation in seconds.
+
+        read : bool
+            True if the request is a read, whose consumed capacity is added to the
+            read capacity units. If None (default), the requests of the
+            'BatchGetItem', 'GetItem', 'Query' and 'Scan' operations are reads.
+
+        consumed_capacity : float
+            Capacity units consumed by the request.
+
+        items : int
+            Number of items returned or written.
+
+        unprocessed : int
+            Number of keys or items returned as unprocessed.
+
+        retry : bool
+            True if the request resubmits unprocessed keys or items.
+
+        throttles : int
+            Number of throttled attempts of the request: the attempts retried by
+            botocore (``RetryAttempts`` of the response metadata) or the request itself
+            if it failed with a throttling error.
+
+        bytes_serialized : int
+            Estimated size of the serialized items.
+
+        bytes_decoded : int
+            Estimated size of the decoded items.
+        """
+        if read is None:
+            read = operation in _READ_OPERATIONS
+
+        event = dict(
+            operation=operation,
+            tables=list(tables),
+            read=read,
+            latency=latency,
+            consumed_capacity=consumed_capacity,
+            items=items,
+            unprocessed=unprocessed,
+            retry=retry,
+            throttles=throttles,
+            bytes_serialized=bytes_serialized,
+            bytes_decoded=bytes_decoded,
+        )
+
+        with self._lock:
+            if operation not in ("serialize", "deserialize"):
+                self.requests += 1
+                self.retries += int(retry)
+                self.throttles += throttles
+                self.unprocessed += unprocessed
+                self.items += items
+            if read:
+                self.read_capacity_units += consumed_capacity
+            else:
+                self.write_capacity_units += consumed_capacity
+            self.latency += latency
+            self.bytes_serialized += bytes_serialized
+            self.bytes_decoded += bytes_decoded
+
+        for callback in self.callbacks:
+            callback(event)
+
+    def merge(self, totals):
+        """Add the totals of other metrics to the totals of this instance. The
+        callbacks are not called.
+
+        Parameters
+        ----------
+        totals : Metrics or dict
+            Metrics instance or dictionary of totals as returned by ``to_dict``.
+        """
+        if isinstance(totals, Metrics):
+            totals = totals.to_dict()
+
+        with self._lock:
+            for name, value in totals.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self):
+        """Return the metrics totals as a dictionary."""
+        return dict(
+            requests=self.requests,
+            retries=self.retries,
+            throttles=self.throttles,
+            unprocessed=self.unprocessed,
+            items=self.items,
+            latency=self.latency,
+            read_capacity_units=self.read_capacity_units,
+            write_capacity_units=self.write_capacity_units,
+            bytes_serialized=self.bytes_serialized,
+            bytes_decoded=self.bytes_decoded,
+        )
+
+    def __repr__(self):
+        values = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"{self.__class__.__name__}({values})"
+
+
+def logging_callback(logger=None, level=logging.INFO):
+    """Return a ``Metrics`` callback function logging each event.
+
+    Parameters
+    ----------
+    logger : logging.Logger
+        Logger to use. If None (default), the ``dynamo_pandas`` logger is used.
+
+    level : int
+        Logging level of the messages.
+
+    Returns
+    -------
+    callable
+        A function to pass in the ``callbacks`` of a ``Metrics`` instance.
+
+    Examples
+    --------
+
+    >>> metrics = Metrics(callbacks=[logging_callback()])
+    >>> items = get_all_items(table="players", metrics=metrics)
+    INFO:dynamo_pandas:Scan tables=['players'] read=True latency=0.0117 consumed_capacity=0.5 items=4 unprocessed=0 retry=False throttles=0 bytes_serialized=0 bytes_decoded=0
+    """  # noqa: E501
+    if logger is None:
+        logger = logging.getLogger("dynamo_pandas")
+
+    def callback(event):
+        values = " ".join(f"{k}={v!r}" for k, v in event.items() if k != "operation")
+        logger.log(level, f"{event['operation']} {values}")
+
+    return callback
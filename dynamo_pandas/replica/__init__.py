@@ -0,0 +1,3 @@
+from .replica import TableReplica
+
+__all__ = ["TableReplica"]
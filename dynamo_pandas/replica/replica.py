@@ -0,0 +1,222 @@
+from boto3.dynamodb.conditions import Attr
+
+from ..dynamo_pandas import _to_df
+from ..serde import TypeDeserializer
+from ..streams.streams import _read_changes
+from ..streams.streams import EVENT_COLUMN
+from ..streams.streams import SEQUENCE_COLUMN
+from ..transactions import get_all_items
+from ..transactions import get_items
+
+
+class TableReplica:
+    """In-memory replica of a DynamoDB table serving key lookups locally.
+
+    The items are held in a dictionary indexed by key so that lookups take constant
+    time regardless of the size of the table. The replica is loaded by a scan of the
+    table on the first call to ``refresh`` and later calls refresh it incrementally,
+    either from the table stream or from a scan filtered on an "updated at"
+    attribute, or by a new scan otherwise. Keys not in the replica are read from the
+    table, and added to the replica, when looked up.
+
+    Parameters
+    ----------
+    table : str
+        Name of the DynamoDB table.
+
+    key : str or list[str]
+        Name(s) of the key attribute(s) of the table.
+
+    attributes : list[str]
+        Names of the item attributes to hold in the replica. If None (default), all
+        attributes are held. The key attributes (and the ``updated_attribute``) are
+        always held.
+
+    updated_attribute : str
+        Name of an attribute holding the time (or version) of the last update of the
+        items, e.g. an ISO 8601 timestamp. If specified, refreshes scan only the items
+        updated at or after the last update seen by the previous refresh (the scan
+        still consumes read capacity for the whole table). Removed items are not
+        detected.
+
+    stream : bool
+        If True, refreshes read the changes from the table stream, which must be
+        enabled with the ``NEW_IMAGE`` or ``NEW_AND_OLD_IMAGES`` view type. Removed
+        items are removed from the replica. Cannot be combined with
+        ``updated_attribute``.
+
+    fallback : bool
+        If True (default), keys not in the replica are read from the table when
+        looked up.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying boto3 ``resource`` and ``client``
+        function calls.
+
+    Examples
+    --------
+
+    >>> replica = TableReplica(table="players", key="player_id", stream=True)
+    >>> replica.refresh()
+    >>> print(replica.lookup(keys(player_id=["player_two", "player_one"])))
+                bonus_points            last_play  rating        play_time
+    player_id
+    player_two             1  2021-01-19 19:07:54     3.8  0 days 22:07:34
+    player_one             3  2021-01-18 22:47:23     4.3  2 days 17:41:55
+    >>> replica.refresh()  # Apply the changes made since the previous refresh.
+    """
+
+    def __init__(
+        self,
+        *,
+        table,
+        key,
+        attributes=None,
+        updated_attribute=None,
+        stream=False,
+        fallback=True,
+        boto3_kwargs={},
+    ):
+        if updated_attribute is not None and stream:
+            raise ValueError("updated_attribute cannot be combined with stream")
+
+        self.table = table
+        self.key = [key] if isinstance(key, str) else list(key)
+        self.updated_attribute = updated_attribute
+        self.stream = stream
+        self.fallback = fallback
+        self.boto3_kwargs = boto3_kwargs
+
+        if attributes is not None:
+            required = self.key + [updated_attribute]
+            attributes = list(attributes) + [
+                a for a in required if a is not None and a not in attributes
+            ]
+        self.attributes = attributes
+
+        self._items = {}
+        self._loaded = False
+        self._checkpoint = None
+        self._last_updated = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return self._key_id(key) in self._items
+
+    def refresh(self):
+        """Load the replica from a scan of the table on the first call and refresh it
+        incrementally on later calls."""
+        if not self._loaded:
+            self._load()
+        elif self.stream:
+            self._refresh_from_stream()
+        elif self.updated_attribute is not None and self._last_updated is not None:
+            self._upsert(
+                get_all_items(
+                    table=self.table,
+                    attributes=self.attributes,
+                    filter_expression=Attr(self.updated_attribute).gte(
+                        self._last_updated
+                    ),
+                    boto3_kwargs=self.boto3_kwargs,
+                )
+            )
+        else:
+            self._load()
+
+    def get(self, key):
+        """Return the item of a key dictionary, or None if the item does not exist."""
+        items = self._lookup([key])
+        return items[0]
+
+    def lookup(self, keys):
+        """Return the items of a list of key dictionaries as a dataframe indexed by the
+        key attributes, in the order of the keys. Keys without items are skipped."""
+        items = [item for item in self._lookup(keys) if item is not None]
+        if len(items) == 0:
+            return _to_df(items=[]).reindex(columns=self.key).set_index(self.key)
+        return _to_df(items=items, index=self.key)
+
+    def to_df(self):
+        """Return all the items of the replica as a dataframe indexed by the key
+        attributes."""
+        return _to_df(items=list(self._items.values()), index=self.key)
+
+    def _lookup(self, keys):
+        """Return the items of a list of keys, reading the missing keys from the table
+        if fallback is True."""
+        keys = list(keys)
+        missing = [key for key in keys if self._key_id(key) not in self._items]
+
+        if self.fallback and len(missing) > 0:
+            self._upsert(
+                get_items(
+                    keys=missing,
+                    table=self.table,
+                    attributes=self.attributes,
+                    preserve_order=False,
+                    boto3_kwargs=self.boto3_kwargs,
+                )
+            )
+
+        return [self._items.get(self._key_id(key)) for key in keys]
+
+    def _load(self):
+        """Load all the items of the table. With streams, the stream checkpoint is
+        taken before the scan so that no change made during the scan is missed."""
+        if self.stream:
+            _, self._checkpoint = self._read_changes(None)
+
+        self._items = {}
+        self._last_updated = None
+        self._upsert(
+            get_all_items(
+                table=self.table,
+                attributes=self.attributes,
+                boto3_kwargs=self.boto3_kwargs,
+            )
+        )
+        self._loaded = True
+
+    def _refresh_from_stream(self):
+        """Apply the changes read from the table stream since the last refresh."""
+        changes, self._checkpoint = self._read_changes(self._checkpoint)
+
+        for change in changes:
+            event = change.pop(EVENT_COLUMN)
+            change.pop(SEQUENCE_COLUMN)
+            if event == "REMOVE":
+                self._items.pop(self._key_id(change), None)
+            else:
+                if self.attributes is not None:
+                    change = {k: v for k, v in change.items() if k in self.attributes}
+                self._upsert([change])
+
+    def _read_changes(self, checkpoint):
+        """Read the stream changes after a checkpoint."""
+        return _read_changes(
+            table=self.table,
+            checkpoint=checkpoint,
+            start="TRIM_HORIZON",
+            max_workers=8,
+            deserializer=TypeDeserializer(),
+            boto3_kwargs=self.boto3_kwargs,
+        )
+
+    def _upsert(self, items):
+        """Add or replace items in the replica."""
+        for item in items:
+            self._items[self._key_id(item)] = item
+
+            if self.updated_attribute is not None:
+                updated = item.get(self.updated_attribute)
+                if updated is not None and (
+                    self._last_updated is None or updated > self._last_updated
+                ):
+                    self._last_updated = updated
+
+    def _key_id(self, key):
+        """Return the hashable identifier of a key (or item) dictionary."""
+        return tuple(key[name] for name in self.key)
@@ -1,4 +1,6 @@
+from .serde import compress
+from .serde import decompress
 from .serde import TypeDeserializer
 from .serde import TypeSerializer
 
-__all__ = ["TypeDeserializer", "TypeSerializer"]
+__all__ = ["compress", "decompress", "TypeDeserializer", "TypeSerializer"]
@@ -1,11 +1,145 @@
+import gzip
+import json
+
+from boto3.dynamodb.types import BINARY
+from boto3.dynamodb.types import BINARY_SET
+from boto3.dynamodb.types import LIST
 from boto3.dynamodb.types import NULL
 from boto3.dynamodb.types import NUMBER
+from boto3.dynamodb.types import NUMBER_SET
 from boto3.dynamodb.types import STRING
+from boto3.dynamodb.types import STRING_SET
 from boto3.dynamodb.types import TypeDeserializer as DDBTypeDeserializer
 from boto3.dynamodb.types import TypeSerializer as DDBTypeSerializer
 import numpy as np
 import pandas as pd
 
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Header prefixed to the compressed values, followed by one byte identifying the
+# codec and one byte identifying the type of the original value.
+_HEADER = b"\x00dpz"
+_CODEC_IDS = {"gzip": b"g", "zstd": b"z"}
+_FORMAT_IDS = {str: b"s", bytes: b"b", "json": b"j"}
+
+
+def compress(value, codec="gzip"):
+    """Compress a string, bytes, list or dictionary value into a bytes value that
+    can be stored in a binary attribute and is decompressed transparently by the
+    ``get_df`` function. Lists and dictionaries are encoded as JSON before being
+    compressed. Missing values (None, numpy.nan, pandas.NA) are returned as is.
+
+    Parameters
+    ----------
+    value : str, bytes, list or dict
+        Value to compress.
+
+    codec : str
+        Compression codec: 'gzip' (default) or 'zstd'. The 'zstd' codec requires the
+        ``zstandard`` package.
+
+    Returns
+    -------
+    bytes
+        The compressed value, prefixed with a header identifying the codec and the
+        type of the original value.
+
+    Examples
+    --------
+
+    >>> compress("a long text " * 100)
+    b'\x00dpzgs\x1f\x8b\x08\x00...'
+    """
+    if codec not in _CODEC_IDS:
+        raise ValueError("codec must be one of 'gzip' or 'zstd'")
+
+    if isinstance(value, str):
+        data, fmt = value.encode("utf-8"), _FORMAT_IDS[str]
+    elif isinstance(value, (bytes, bytearray)):
+        data, fmt = bytes(value), _FORMAT_IDS[bytes]
+    elif isinstance(value, (list, dict)):
+        data, fmt = json.dumps(value).encode("utf-8"), _FORMAT_IDS["json"]
+    elif value is None or pd.isna(value):
+        return value
+    else:
+        raise TypeError(
+            "Compressed values must be strings, bytes, lists or dictionaries"
+        )
+
+    return _HEADER + _CODEC_IDS[codec] + fmt + _compressor(codec)(data)
+
+
+def decompress(value):
+    """Decompress a value compressed with the ``compress`` function. Values without the
+    compression header are returned as is.
+
+    Parameters
+    ----------
+    value : bytes
+        Value to decompress.
+
+    Returns
+    -------
+    str, bytes, list or dict
+        The original value.
+
+    Examples
+    --------
+
+    >>> decompress(compress({"a": [1, 2]}, codec="zstd"))
+    {'a': [1, 2]}
+    """
+    if not _is_compressed(value):
+        return value
+
+    codec = {v: k for k, v in _CODEC_IDS.items()}[value[4:5]]
+    data = _decompressor(codec)(value[6:])
+    fmt = value[5:6]
+
+    if fmt == _FORMAT_IDS[bytes]:
+        return data
+    elif fmt == _FORMAT_IDS[str]:
+        return data.decode("utf-8")
+    else:
+        return json.loads(data)
+
+
+def _is_compressed(value):
+    """Return True if value is a bytes value with the compression header."""
+    return (
+        isinstance(value, (bytes, bytearray))
+        and value[:4] == _HEADER
+        and value[4:5] in _CODEC_IDS.values()
+        and value[5:6] in _FORMAT_IDS.values()
+    )
+
+
+def _compressor(codec):
+    """Return the compression function of a codec."""
+    if codec == "gzip":
+        return gzip.compress
+    return _zstandard().ZstdCompressor().compress
+
+
+def _decompressor(codec):
+    """Return the decompression function of a codec."""
+    if codec == "gzip":
+        return gzip.decompress
+    return _zstandard().ZstdDecompressor().decompress
+
+
+def _zstandard():
+    """Return the zstandard module, raising an ImportError if it is not installed."""
+    if zstandard is None:
+        raise ImportError(
+            "The zstandard package is required to use the 'zstd' codec. Install it "
+            "with: pip install dynamo-pandas[zstd]"
+        )
+    return zstandard
+
 
 class TypeSerializer(DDBTypeSerializer):
     """An extension of the `boto3.dynamodb.types.TypeSerializer
@@ -22,8 +156,20 @@ class TypeSerializer(DDBTypeSerializer):
         pandas nullable Int64(32, 16, 8)        {'N': str(value)}
         pandas.Timestamp                        {'S': str(value)}
         pandas.Timedelta                        {'S': str(value)}
+        numpy.ndarray (uint8 dtype)             {'B': value.tobytes()}
+        numpy.ndarray (other dtypes)            {'L': list}
+
+    Parameters
+    ----------
+    lists_as_sets : bool
+        If True, non-empty lists (or numpy arrays) of numbers, strings or bytes are
+        converted to DynamoDB number, string and binary sets instead of lists. Duplicate
+        values are therefore removed.
     """
 
+    def __init__(self, *, lists_as_sets=False):
+        self.lists_as_sets = lists_as_sets
+
     def _get_dynamodb_type(self, value):
 
         # Pandas NA values
@@ -42,11 +188,70 @@ class TypeSerializer(DDBTypeSerializer):
             else:
                 dynamodb_type = NUMBER
 
+        elif isinstance(value, np.ndarray) and value.dtype == np.uint8:
+            dynamodb_type = BINARY
+
+        elif (
+            self.lists_as_sets
+            and isinstance(value, (list, np.ndarray))
+            and len(value) > 0
+        ):
+            dynamodb_type = self._get_set_type(value)
+
+        elif isinstance(value, np.ndarray):
+            dynamodb_type = LIST
+
         else:
             dynamodb_type = super()._get_dynamodb_type(value)
 
         return dynamodb_type
 
+    def _get_set_type(self, values):
+        """Return the DynamoDB set type of a list of values or the list type if the
+        values are not all of a type supported by sets."""
+        if all(self._is_set_number(v) for v in values):
+            return NUMBER_SET
+        elif all(isinstance(v, str) for v in values):
+            return STRING_SET
+        elif all(isinstance(v, (bytes, bytearray)) for v in values):
+            return BINARY_SET
+        else:
+            return LIST
+
+    def _is_set_number(self, value):
+        """Return True if value is a number that can be stored in a number set."""
+        if isinstance(value, bool):
+            return False
+        elif isinstance(value, (float, np.floating)):
+            return not np.isnan(value)
+        else:
+            return isinstance(value, (int, np.integer))
+
+    def _serialize_ns(self, value):
+        return super()._serialize_ns(self._unique(value))
+
+    def _serialize_ss(self, value):
+        return super()._serialize_ss(self._unique(value))
+
+    def _serialize_bs(self, value):
+        return super()._serialize_bs(self._unique(value))
+
+    def _unique(self, values):
+        """Return the unique values of a list, or the values if already a set."""
+        if isinstance(values, (set, frozenset)):
+            return values
+        return list(dict.fromkeys(values))
+
+    def _serialize_b(self, value):
+        if isinstance(value, np.ndarray):
+            return value.tobytes()
+        return super()._serialize_b(value)
+
+    def _serialize_l(self, value):
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+        return super()._serialize_l(value)
+
     def _serialize_s(self, value):
         return str(value)
 
@@ -68,8 +273,54 @@ class TypeDeserializer(DDBTypeDeserializer):
         DynamoDB                                Python
         --------                                ------
         {'N': str(value)}                       int/float
+
+    Parameters
+    ----------
+    binary : str
+        Python type of the binary values: 'Binary' (default) for
+        ``boto3.dynamodb.types.Binary`` wrappers or 'bytes' for raw bytes.
+
+    sets : str
+        Python type of the number, string and binary sets: 'set' (default) or 'list'.
+
+    decompress : bool
+        If True, binary values compressed with the ``compress`` function are
+        decompressed into their original value. Default is False.
     """
 
+    def __init__(self, *, binary="Binary", sets="set", decompress=False):
+        if binary not in ("Binary", "bytes"):
+            raise ValueError("binary must be one of 'Binary' or 'bytes'")
+
+        if sets not in ("set", "list"):
+            raise ValueError("sets must be one of 'set' or 'list'")
+
+        self.binary = binary
+        self.sets = sets
+        self.decompress = decompress
+
+    def _deserialize_b(self, value):
+        if self.decompress and _is_compressed(value):
+            return decompress(value)
+        elif self.binary == "bytes":
+            return bytes(value)
+        return super()._deserialize_b(value)
+
+    def _deserialize_ns(self, value):
+        if self.sets == "list":
+            return list(map(self._deserialize_n, value))
+        return super()._deserialize_ns(value)
+
+    def _deserialize_ss(self, value):
+        if self.sets == "list":
+            return list(value)
+        return super()._deserialize_ss(value)
+
+    def _deserialize_bs(self, value):
+        if self.sets == "list":
+            return list(map(self._deserialize_b, value))
+        return super()._deserialize_bs(value)
+
     def _deserialize_n(self, value):
         v = float(value)
         if v % 1 == 0:
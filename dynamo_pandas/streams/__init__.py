@@ -0,0 +1,4 @@
+from .streams import apply_changes
+from .streams import read_stream
+
+__all__ = ["apply_changes", "read_stream"]
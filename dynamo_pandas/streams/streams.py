@@ -0,0 +1,293 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import pandas as pd
+
+from ..dynamo_pandas import _to_df
+from ..serde import TypeDeserializer
+from ..transactions import table_info
+
+# Names of the columns of the change batches holding the event name (INSERT, MODIFY
+# or REMOVE) and the sequence number of the stream records.
+EVENT_COLUMN = "_event"
+SEQUENCE_COLUMN = "_sequence_number"
+
+# Number of consecutive empty GetRecords pages after which a shard is considered read
+# up to its last record. Open shards can return empty pages before their records.
+_MAX_EMPTY_PAGES = 5
+
+
+def read_stream(
+    *,
+    table,
+    checkpoint=None,
+    start="TRIM_HORIZON",
+    max_workers=8,
+    binary="Binary",
+    sets="set",
+    boto3_kwargs={},
+):
+    """Read the new records of the DynamoDB stream of a table into a dataframe of
+    changes.
+
+    The shards of the stream are read concurrently, each from the position stored in
+    ``checkpoint`` (or from ``start`` for shards not in the checkpoint) until no more
+    records are available. Calling the function again with the returned checkpoint
+    returns the changes made since the previous call, which allows keeping a local
+    copy of a table up to date without scanning the table (see ``apply_changes``).
+
+    Parameters
+    ----------
+    table : str
+        Name of the DynamoDB table. A stream must be enabled on the table, with the
+        ``NEW_IMAGE`` or ``NEW_AND_OLD_IMAGES`` view type for the changes to contain
+        the attributes of the new items (only the keys are returned otherwise).
+
+    checkpoint : dict
+        Checkpoint returned by a previous call, mapping the id of each shard read to
+        the sequence number of the last record read from the shard, or to
+        'TRIM_HORIZON' for shards without records. If None (default), all the shards
+        are read from ``start``.
+
+    start : str
+        Position from which the shards not in the checkpoint are read: 'TRIM_HORIZON'
+        (default) for the oldest record available or 'LATEST' for only the new
+        records. With 'LATEST', the records already in the open shards are read to
+        find the position of their last record but are not returned, so that the
+        records written after the call are returned by the next call.
+
+    max_workers : int
+        Maximum number of shards read concurrently. Default is 8.
+
+    binary : str
+        Python type of the binary attribute values: 'Binary' (default) or 'bytes'.
+
+    sets : str
+        Python type of the set attribute values: 'set' (default) or 'list'.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')`` and
+        ``boto3.client('dynamodbstreams')`` function calls (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details).
+
+    Returns
+    -------
+    tuple[pandas.DataFrame, dict]
+        The dataframe of changes and the checkpoint to pass to the next call. Each
+        change is represented by a row with the attributes of the new item (only the
+        key attributes for removed items) and the ``_event`` ('INSERT', 'MODIFY' or
+        'REMOVE') and ``_sequence_number`` columns. The changes of each item are in the
+        order in which they were made.
+
+    Examples
+    --------
+
+    >>> changes, checkpoint = read_stream(table="players")
+    >>> print(changes)
+      _event       _sequence_number     player_id  rating
+    0 INSERT  100000000000000000001   player_five     3.1
+    1 MODIFY  100000000000000000002    player_one     4.4
+    2 REMOVE  100000000000000000003    player_two     NaN
+
+    The next call returns only the changes made since the previous call:
+
+    >>> changes, checkpoint = read_stream(table="players", checkpoint=checkpoint)
+    """  # noqa: E501
+    if start not in ("TRIM_HORIZON", "LATEST"):
+        raise ValueError("start must be one of 'TRIM_HORIZON' or 'LATEST'")
+
+    changes, checkpoint = _read_changes(
+        table=table,
+        checkpoint=checkpoint,
+        start=start,
+        max_workers=max_workers,
+        deserializer=TypeDeserializer(binary=binary, sets=sets, decompress=True),
+        boto3_kwargs=boto3_kwargs,
+    )
+
+    df = _to_df(changes)
+    if df.empty:
+        df = pd.DataFrame(columns=[EVENT_COLUMN, SEQUENCE_COLUMN])
+
+    return df, checkpoint
+
+
+def apply_changes(df, changes):
+    """Apply a dataframe of changes returned by the ``read_stream`` function to a
+    dataframe indexed by the key attributes of the table: inserted and modified items
+    are added or replaced (upserted) and removed items are dropped.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataframe of items indexed by the key attribute(s) of the table, for instance
+        as returned by ``get_df(table=..., index="player_id")``.
+
+    changes : pandas.DataFrame
+        Dataframe of changes returned by the ``read_stream`` function.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A new dataframe with the changes applied. Upserted rows are placed at the end
+        of the dataframe.
+
+    Examples
+    --------
+
+    >>> df = get_df(table="players", index="player_id")
+    >>> changes, checkpoint = read_stream(table="players", start="LATEST")
+    >>> df = apply_changes(df, changes)
+    """
+    key = list(df.index.names)
+    if any(name is None for name in key):
+        raise ValueError("df must be indexed by the key attributes of the table")
+
+    if changes.empty:
+        return df
+
+    # Only the last change of each item is applied.
+    last = changes.drop_duplicates(subset=key, keep="last").set_index(key)
+
+    upserts = last[last[EVENT_COLUMN] != "REMOVE"].drop(
+        columns=[EVENT_COLUMN, SEQUENCE_COLUMN]
+    )
+
+    return pd.concat([df.drop(index=df.index.intersection(last.index)), upserts])
+
+
+def _read_changes(*, table, checkpoint, start, max_workers, deserializer, boto3_kwargs):
+    """Read the new records of the stream of a table and return the list of change
+    dictionaries and the new checkpoint."""
+    if checkpoint is None:
+        checkpoint = {}
+
+    info = table_info(table=table, boto3_kwargs=boto3_kwargs)
+    if info["stream_arn"] is None:
+        # The stream may have been enabled since the table information was cached.
+        info = table_info(table=table, refresh=True, boto3_kwargs=boto3_kwargs)
+    if info["stream_arn"] is None:
+        raise ValueError(f"No stream is enabled on table '{table}'")
+
+    stream_arn = info["stream_arn"]
+    client = boto3.client("dynamodbstreams", **boto3_kwargs)
+    shards = _lineage_order(_describe_shards(client, stream_arn))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(
+            executor.map(
+                lambda shard: _read_shard(
+                    client,
+                    stream_arn,
+                    shard,
+                    checkpoint.get(shard["ShardId"]),
+                    start,
+                ),
+                shards,
+            )
+        )
+
+    # The position of every shard read is saved, including the shards without new
+    # records, so that the next call does not read them from start again.
+    changes = []
+    new_checkpoint = {}
+    for shard, (records, position) in zip(shards, results):
+        for record in records:
+            changes.append(_change(record, deserializer))
+
+        new_checkpoint[shard["ShardId"]] = position
+
+    return changes, new_checkpoint
+
+
+def _describe_shards(client, stream_arn):
+    """Return the list of the shards of a stream."""
+    shards = []
+    kwargs = {}
+    while True:
+        description = client.describe_stream(StreamArn=stream_arn, **kwargs)[
+            "StreamDescription"
+        ]
+        shards.extend(description["Shards"])
+
+        if "LastEvaluatedShardId" not in description:
+            return shards
+
+        kwargs = {"ExclusiveStartShardId": description["LastEvaluatedShardId"]}
+
+
+def _lineage_order(shards):
+    """Order shards so that parent shards are before their children."""
+    by_id = {shard["ShardId"]: shard for shard in shards}
+    ordered = []
+    visited = set()
+
+    def visit(shard):
+        if shard["ShardId"] in visited:
+            return
+        visited.add(shard["ShardId"])
+        parent = by_id.get(shard.get("ParentShardId"))
+        if parent is not None:
+            visit(parent)
+        ordered.append(shard)
+
+    for shard in shards:
+        visit(shard)
+
+    return ordered
+
+
+def _read_shard(client, stream_arn, shard, position, start):
+    """Read the records of a shard after a checkpoint position (or from start if None)
+    until no more records are available and return the records and the new position
+    of the shard. With start='LATEST', the records of the shard are read to find its
+    position but are not returned."""
+    skip = position is None and start == "LATEST"
+    if skip:
+        # The last record of a closed shard is known without reading the shard.
+        ending = shard.get("SequenceNumberRange", {}).get("EndingSequenceNumber")
+        if ending is not None:
+            return [], ending
+
+    if position is None or position == "TRIM_HORIZON":
+        kwargs = dict(ShardIteratorType="TRIM_HORIZON")
+        position = "TRIM_HORIZON"
+    else:
+        kwargs = dict(
+            ShardIteratorType="AFTER_SEQUENCE_NUMBER", SequenceNumber=position
+        )
+
+    iterator = client.get_shard_iterator(
+        StreamArn=stream_arn, ShardId=shard["ShardId"], **kwargs
+    ).get("ShardIterator")
+
+    records = []
+    empty_pages = 0
+    while iterator is not None and empty_pages < _MAX_EMPTY_PAGES:
+        response = client.get_records(ShardIterator=iterator, Limit=1000)
+        if len(response["Records"]) == 0:
+            empty_pages += 1
+        else:
+            empty_pages = 0
+            position = response["Records"][-1]["dynamodb"]["SequenceNumber"]
+            if not skip:
+                records.extend(response["Records"])
+
+        iterator = response.get("NextShardIterator")
+
+    return records, position
+
+
+def _change(record, deserializer):
+    """Convert a stream record into a change dictionary."""
+    data = record["dynamodb"]
+    if record["eventName"] == "REMOVE":
+        image = data["Keys"]
+    else:
+        image = data.get("NewImage", data["Keys"])
+
+    return {
+        EVENT_COLUMN: record["eventName"],
+        SEQUENCE_COLUMN: data["SequenceNumber"],
+        **deserializer.deserialize({"M": image}),
+    }
@@ -1,7 +1,31 @@
+from .transactions import conditional_put_items
+from .transactions import execute_statement
+from .transactions import execute_statements
 from .transactions import get_all_items
 from .transactions import get_item
 from .transactions import get_items
+from .transactions import get_items_multi
 from .transactions import put_item
 from .transactions import put_items
+from .transactions import put_items_multi
+from .transactions import query_items
+from .transactions import scan_pages
+from .transactions import table_info
+from .transactions import transact_put_items
 
-__all__ = ["get_all_items", "get_item", "get_items", "put_item", "put_items"]
+__all__ = [
+    "conditional_put_items",
+    "execute_statement",
+    "execute_statements",
+    "get_all_items",
+    "get_item",
+    "get_items",
+    "get_items_multi",
+    "put_item",
+    "put_items",
+    "put_items_multi",
+    "query_items",
+    "scan_pages",
+    "table_info",
+    "transact_put_items",
+]
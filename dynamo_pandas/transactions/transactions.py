@@ -1,4 +1,27 @@
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from functools import reduce
+import heapq
+from itertools import count
+from itertools import islice
+import operator
+from queue import Empty
+from queue import Full
+from queue import Queue
+import random
+import re
+import threading
+import time
+
 import boto3
+from boto3.dynamodb.conditions import ConditionBase
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+import pandas as pd
 
 from dynamo_pandas.serde import TypeDeserializer
 from dynamo_pandas.serde import TypeSerializer
@@ -7,22 +30,205 @@ ts = TypeSerializer()
 td = TypeDeserializer()
 
 
-def _deserialize(items):
+def _deserialize(items, metrics=None, tables=(), deserializer=None):
     """Convert dictionaries to DynamoDB format and back."""
-    return td.deserialize(ts.serialize(items))
+    if deserializer is None:
+        deserializer = td
+
+    start = time.perf_counter()
+    serialized = ts.serialize(items)
+    items = deserializer.deserialize(serialized)
+
+    if metrics is not None:
+        metrics.record(
+            operation="deserialize",
+            tables=tables,
+            latency=time.perf_counter() - start,
+            bytes_decoded=_size(serialized),
+        )
+
+    return items
+
+
+def _serialize(items, metrics=None, chunk_size=25, serializer=None):
+    """Lazily convert an iterable of (table, item dictionary) pairs to DynamoDB format.
+    Items are serialized in chunks of chunk_size items."""
+    if serializer is None:
+        serializer = ts
+
+    for chunk in _batches(items, batch_size=chunk_size):
+        start = time.perf_counter()
+        for _, item in chunk:
+            if not isinstance(item, dict) or len(item) == 0:
+                raise TypeError("items must be a list of non-empty dictionaries")
+
+        chunk = [(table, serializer.serialize(item)["M"]) for table, item in chunk]
+
+        if metrics is not None:
+            metrics.record(
+                operation="serialize",
+                tables=list(dict.fromkeys(table for table, _ in chunk)),
+                latency=time.perf_counter() - start,
+                bytes_serialized=sum(_size({"M": item}) for _, item in chunk),
+            )
+
+        yield from chunk
+
+
+def _size(value):
+    """Estimate the size in bytes of a value in DynamoDB format, following the
+    DynamoDB item size calculation rules."""
+    (dynamodb_type, v) = next(iter(value.items()))
+
+    if dynamodb_type == "S":
+        return len(v) if v.isascii() else len(v.encode("utf-8"))
+    elif dynamodb_type == "N":
+        return len(v) // 2 + 2
+    elif dynamodb_type == "B":
+        return len(v)
+    elif dynamodb_type in ("SS", "NS", "BS"):
+        return sum(_size({dynamodb_type[0]: e}) for e in v)
+    elif dynamodb_type == "L":
+        return 3 + sum(_size(e) + 1 for e in v)
+    elif dynamodb_type == "M":
+        return 3 + sum(_size({"S": k}) + _size(e) + 1 for k, e in v.items())
+    else:
+        return 1
 
 
-def _batches(items, batch_size):
-    """Split an iterable in batches."""
-    items = list(items)
-    start = 0
-    while start < len(items):
-        end = min(start + batch_size, len(items))
-        yield items[start:end]
-        start += batch_size
+def _consumed_capacity(response):
+    """Return the total capacity units consumed by a request from its response."""
+    consumed_capacity = response.get("ConsumedCapacity", [])
+    if isinstance(consumed_capacity, dict):
+        consumed_capacity = [consumed_capacity]
+
+    return sum(c.get("CapacityUnits", 0) for c in consumed_capacity)
+
+
+def _throttles(response):
+    """Return the number of attempts of a request retried by botocore, mostly
+    throttled attempts, from its response."""
+    return response.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+
+
+def _capacity_kwargs(metrics):
+    """Return the keyword arguments requesting the consumed capacity in the responses
+    if metrics are collected."""
+    return {} if metrics is None else {"ReturnConsumedCapacity": "TOTAL"}
+
+
+def _projection(attributes):
+    """Return the ProjectionExpression and ExpressionAttributeNames keyword arguments
+    projecting the attributes. Attributes can be document paths to nested attributes
+    (e.g. 'a.b[0]'). Placeholders are used for all the attribute names so that
+    reserved words and special characters are supported."""
+    names = {}
+    paths = []
+    for attribute in attributes:
+        path = ""
+        for element in attribute.split("."):
+            match = _PATH_ELEMENT.fullmatch(element)
+            if match is None:
+                raise ValueError(f"Invalid attribute path '{attribute}'")
+
+            (name, indexes) = match.groups()
+            placeholder = names.setdefault(name, f"#a{len(names)}")
+            path += ("." if path else "") + placeholder + indexes
+
+        paths.append(path)
+
+    return {
+        "ProjectionExpression": ", ".join(paths),
+        "ExpressionAttributeNames": {v: k for k, v in names.items()},
+    }
+
+
+def _path_root(attribute):
+    """Return the name of the top level attribute of an attribute path."""
+    return attribute.split(".")[0].split("[")[0]
+
+
+# Element of a document path: an attribute name followed by optional list indexes.
+_PATH_ELEMENT = re.compile(r"([^.\[\]]+)((?:\[\d+\])*)")
+
+
+# DynamoDB request and response size limits (bytes).
+_MAX_REQUEST_SIZE = 16 * 1024 * 1024
+_MAX_RESPONSE_SIZE = 16 * 1024 * 1024
+
+
+def _batches(items, batch_size, max_size=None, size=None):
+    """Lazily split an iterable in batches of at most batch_size items. If max_size is
+    specified, the batches are also limited to max_size bytes, the size of each item
+    being estimated by the size function."""
+    batch = []
+    batch_bytes = 0
+    for item in items:
+        item_bytes = 0 if max_size is None else size(item)
+
+        if (
+            len(batch) > 0
+            and max_size is not None
+            and batch_bytes + item_bytes > max_size
+        ):
+            yield batch
+            batch = []
+            batch_bytes = 0
+
+        batch.append(item)
+        batch_bytes += item_bytes
+
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+            batch_bytes = 0
+
+    if len(batch) > 0:
+        yield batch
 
 
-def get_item(*, key, table, attributes=None, boto3_kwargs={}):
+def _key_id(key):
+    """Return a hashable identifier of a key dictionary."""
+    return tuple(sorted(key.items()))
+
+
+def _align(items, keys, key_names, drop=(), missing="drop"):
+    """Return the items in the order of the keys, repeating the items of duplicate
+    keys. Keys without a matching item are skipped if missing is 'drop' or represented
+    by None if missing is 'na'. Attributes listed in drop are removed from the returned
+    items."""
+    index = {_key_id({k: item[k] for k in key_names}): item for item in items}
+
+    aligned = []
+    seen = set()
+    for key_id in map(_key_id, keys):
+        item = index.get(key_id)
+        if item is None:
+            if missing == "na":
+                aligned.append(None)
+            continue
+
+        if len(drop) > 0:
+            item = {k: v for k, v in item.items() if k not in drop}
+        elif key_id in seen:
+            item = dict(item)
+
+        seen.add(key_id)
+        aligned.append(item)
+
+    return aligned
+
+
+def _check_alignment(preserve_order, missing):
+    """Validate the preserve_order and missing parameters."""
+    if missing not in ("drop", "na"):
+        raise ValueError("missing must be one of 'drop' or 'na'")
+
+    if missing == "na" and not preserve_order:
+        raise ValueError("missing='na' requires preserve_order=True")
+
+
+def get_item(*, key, table, attributes=None, deserializer=None, boto3_kwargs={}):
     """Get a single item from a table.
 
     Parameters
@@ -35,7 +241,13 @@ def get_item(*, key, table, attributes=None, boto3_kwargs={}):
 
     attributes : list[str]
         Names of the item attributes to return. If None (default), all attributes are
-        returned.
+        returned. Nested attributes can be selected with document paths such as
+        ``"a.b[0]"``.
+
+    deserializer : dynamo_pandas.serde.TypeDeserializer
+        Deserializer converting the items from the DynamoDB format, for instance to
+        return binary values as bytes and sets as lists. If None (default), a
+        ``TypeDeserializer`` with default options is used.
 
     boto3_kwargs : dict
         Keyword arguments to pass to the underlying ``boto3.resource('dynamodb')``
@@ -73,14 +285,25 @@ def get_item(*, key, table, attributes=None, boto3_kwargs={}):
 
     kwargs = {}
     if attributes is not None:
-        kwargs["ProjectionExpression"] = ", ".join(attributes)
+        kwargs.update(_projection(attributes))
 
     item = table.get_item(Key=key, **kwargs).get("Item")
 
-    return _deserialize(item)
-
-
-def get_items(*, keys, table, attributes=None, boto3_kwargs={}):
+    return _deserialize(item, deserializer=deserializer)
+
+
+def get_items(
+    *,
+    keys,
+    table,
+    attributes=None,
+    preserve_order=True,
+    missing="drop",
+    deserializer=None,
+    max_workers=1,
+    boto3_kwargs={},
+    metrics=None,
+):
     """Get multiple items from a table.
 
     Parameters
@@ -93,18 +316,44 @@ def get_items(*, keys, table, attributes=None, boto3_kwargs={}):
 
     attributes : list[str]
         Names of the item attributes to return. If None (default), all attributes are
-        returned.
+        returned. Nested attributes can be selected with document paths such as
+        ``"a.b[0]"``.
+
+    preserve_order : bool
+        If True (default), the items are returned in the order of the keys, the items of
+        duplicate keys being repeated. If False, the items of the unique keys are
+        returned in the order of the responses, which avoids the key alignment step.
+
+    missing : str
+        Handling of the keys for which no item exists in the table: 'drop' (default)
+        skips them and 'na' returns None in their place. 'na' requires
+        ``preserve_order=True``.
+
+    deserializer : dynamo_pandas.serde.TypeDeserializer
+        Deserializer converting the items from the DynamoDB format, for instance to
+        return binary values as bytes and sets as lists. If None (default), a
+        ``TypeDeserializer`` with default options is used.
+
+    max_workers : int
+        Maximum number of batch requests in flight. Default is 1 (sequential
+        requests). With more than 1, the number of requests in flight is adapted
+        between 1 and ``max_workers`` (see ``get_items_multi``).
 
     boto3_kwargs : dict
         Keyword arguments to pass to the underlying ``boto3.resource('dynamodb')``
         function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.resource>`_
         for details).
 
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity, unprocessed keys/items and sizes
+        of the requests are recorded in this object (see ``dynamo_pandas.metrics``).
+
     Returns
     -------
     list[dict]
         List of dictionaties where each dictionary represents an item's attributes.
-        Only items for which the key exists in the table are returned.
+        Unless ``missing='na'``, only items for which the key exists in the table are
+        returned.
 
     Examples
     --------
@@ -118,8 +367,8 @@ def get_items(*, keys, table, attributes=None, boto3_kwargs={}):
     ...     table="players"
     ... )
     >>> print(items)
-    [{'bonus_points': 3, 'player_id': 'player_one', 'last_play': '2021-01-18 22:47:23', 'rating': 4.3, 'play_time': '2 days 17:41:55'},
-     {'bonus_points': 1, 'player_id': 'player_two', 'last_play': '2021-01-19 19:07:54', 'rating': 3.8, 'play_time': '0 days 22:07:34'}]
+    [{'bonus_points': 1, 'player_id': 'player_two', 'last_play': '2021-01-19 19:07:54', 'rating': 3.8, 'play_time': '0 days 22:07:34'},
+     {'bonus_points': 3, 'player_id': 'player_one', 'last_play': '2021-01-18 22:47:23', 'rating': 4.3, 'play_time': '2 days 17:41:55'}]
 
     Get only specific attributes:
 
@@ -129,43 +378,251 @@ def get_items(*, keys, table, attributes=None, boto3_kwargs={}):
     ...     attributes=["player_id", "play_time"]
     ... )
     >>> print(items)
-    [{'player_id': 'player_one', 'play_time': '2 days 17:41:55'}, {'player_id': 'player_two', 'play_time': '0 days 22:07:34'}]
+    [{'player_id': 'player_two', 'play_time': '0 days 22:07:34'}, {'player_id': 'player_one', 'play_time': '2 days 17:41:55'}]
     """  # noqa: E501
+    return get_items_multi(
+        keys={table: keys},
+        attributes=None if attributes is None else {table: attributes},
+        preserve_order=preserve_order,
+        missing=missing,
+        deserializer=deserializer,
+        max_workers=max_workers,
+        boto3_kwargs=boto3_kwargs,
+        metrics=metrics,
+    )[table]
+
+
+def get_items_multi(
+    *,
+    keys,
+    attributes=None,
+    preserve_order=True,
+    missing="drop",
+    deserializer=None,
+    max_workers=1,
+    boto3_kwargs={},
+    metrics=None,
+):
+    """Get multiple items from multiple tables.
+
+    The keys of all the tables are packed together in the batch requests so that
+    fetching items from several tables requires as few requests as possible.
 
-    def _request(keys, table=table, attributes=attributes):
-        table_dict = {"Keys": keys}
-
-        if attributes is not None:
-            table_dict["ProjectionExpression"] = ", ".join(attributes)
+    Parameters
+    ----------
+    keys : dict[str, list[dict]]
+        Dictionary of table names and the lists of key dictionaries of the items to get
+        from each table.
+
+    attributes : dict[str, list[str]]
+        Dictionary of table names and the names of the item attributes to return for
+        each table. If None (default) or for tables not in the dictionary, all
+        attributes are returned.
+
+    preserve_order : bool
+        If True (default), the items are returned in the order of the keys, the items of
+        duplicate keys being repeated. If False, the items of the unique keys are
+        returned in the order of the responses, which avoids the key alignment step.
+
+    missing : str
+        Handling of the keys for which no item exists in the table: 'drop' (default)
+        skips them and 'na' returns None in their place. 'na' requires
+        ``preserve_order=True``.
+
+    deserializer : dynamo_pandas.serde.TypeDeserializer
+        Deserializer converting the items from the DynamoDB format, for instance to
+        return binary values as bytes and sets as lists. If None (default), a
+        ``TypeDeserializer`` with default options is used.
+
+    max_workers : int
+        Maximum number of batch requests in flight. Default is 1 (sequential
+        requests). With more than 1, the batches are requested by a pool of threads
+        and the number of requests in flight is adapted by an additive increase /
+        multiplicative decrease controller: it is increased while the requests
+        succeed and halved when a request is throttled or returns unprocessed keys, to
+        find the highest throughput the table sustains.  The throttled and unprocessed
+        keys are requested again after an exponential backoff delay with jitter.
 
-        return {table: table_dict}
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.resource('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.resource>`_
+        for details).
 
-    def _get_items(keys, table=table, attributes=attributes):
-        response = resource.batch_get_item(RequestItems=_request(keys))
-        items = response["Responses"][table]
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity, unprocessed keys/items and sizes
+        of the requests are recorded in this object (see ``dynamo_pandas.metrics``).
 
-        while response["UnprocessedKeys"] != {}:
-            keys = response["UnprocessedKeys"][table]["Keys"]
-            response = resource.batch_get_item(RequestItems=_request(keys))
-            items.extend(response["Responses"][table])
+    Returns
+    -------
+    dict[str, list[dict]]
+        Dictionary of table names and the lists of dictionaries representing the items
+        of each table. Unless ``missing='na'``, only items for which the key exists in
+        the table are returned.
 
-        return items
+    Examples
+    --------
 
-    resource = boto3.resource("dynamodb", **boto3_kwargs)
+    >>> items = get_items_multi(
+    ...     keys={
+    ...         "players": [{"player_id": "player_two"}],
+    ...         "teams": [{"team_id": "team_a"}, {"team_id": "team_b"}],
+    ...     },
+    ...     attributes={"players": ["player_id", "rating"]},
+    ... )
+    >>> print(items)
+    {'players': [{'player_id': 'player_two', 'rating': 3.8}],
+     'teams': [{'team_id': 'team_a', 'name': 'Aces'}, {'team_id': 'team_b', 'name': 'Bees'}]}
+    """  # noqa: E501
+    _check_alignment(preserve_order, missing)
+
+    # Deduplicate the keys of each table and add the key attributes to the
+    # projection, if required, to map the items back to their keys.
+    unique_keys = {}
+    projections = {}
+    dropped_attributes = {}
+    for table, table_keys in keys.items():
+        unique_keys[table] = list({_key_id(key): key for key in table_keys}.values())
+
+        table_attributes = None if attributes is None else attributes.get(table)
+        if table_attributes is not None:
+            key_attributes = []
+            if preserve_order and len(unique_keys[table]) > 0:
+                roots = [_path_root(a) for a in table_attributes]
+                key_attributes = [k for k in unique_keys[table][0] if k not in roots]
+            projections[table] = _projection(list(table_attributes) + key_attributes)
+            dropped_attributes[table] = key_attributes
+
+    def _request(keys):
+        request_items = {}
+        for table, key in keys:
+            request_items.setdefault(table, {"Keys": []})["Keys"].append(key)
+
+        for table, table_dict in request_items.items():
+            if table in projections:
+                table_dict.update(projections[table])
+
+        return request_items
+
+    def _get_items(keys, retry=False):
+        """Request a batch of keys and return the unprocessed keys."""
+        nonlocal item_size
+        request_items = _request(keys)
+
+        start = time.perf_counter()
+        try:
+            response = _resource().batch_get_item(
+                RequestItems=request_items, **_capacity_kwargs(metrics)
+            )
+        except ClientError as e:
+            if controller is None or not _is_throttling(e):
+                raise
+            _record_throttling(
+                metrics, "BatchGetItem", list(request_items), start, e, keys, retry
+            )
+            return keys
+
+        for table, table_items in response["Responses"].items():
+            items[table].extend(table_items)
+            if len(table_items) > 0:
+                # Estimate the size of the items from the first item returned.
+                item_size = max(item_size, _size(ts.serialize(table_items[0])))
+
+        keys = [
+            (table, key)
+            for table, table_dict in response["UnprocessedKeys"].items()
+            for key in table_dict["Keys"]
+        ]
 
-    key_batches = _batches(keys, batch_size=100)
+        if metrics is not None:
+            metrics.record(
+                operation="BatchGetItem",
+                tables=list(request_items),
+                latency=time.perf_counter() - start,
+                consumed_capacity=_consumed_capacity(response),
+                throttles=_throttles(response),
+                items=sum(len(i) for i in response["Responses"].values()),
+                unprocessed=len(keys),
+                retry=retry,
+            )
 
-    items = []
-    for key_batch in key_batches:
-        items.extend(_get_items(key_batch))
+        return keys
 
-    return _deserialize(items)
+    if max_workers == 1:
+        resource = boto3.resource("dynamodb", **boto3_kwargs)
+        controller = None
 
+        def _resource():
+            return resource
 
-def get_all_items(*, table, attributes=None, boto3_kwargs={}):
+    else:
+        # Resources are not thread safe, each thread uses its own resource.
+        local = threading.local()
+        controller = _AIMDController(max_workers)
+
+        def _resource():
+            if not hasattr(local, "resource"):
+                local.resource = boto3.session.Session().resource(
+                    "dynamodb", **boto3_kwargs
+                )
+            return local.resource
+
+    items = {table: [] for table in keys}
+
+    # Estimated item size used to limit the size of the responses, updated as items
+    # are returned.
+    item_size = 1
+
+    table_keys = ((table, key) for table in keys for key in unique_keys[table])
+    key_batches = _batches(
+        table_keys,
+        batch_size=100,
+        max_size=_MAX_RESPONSE_SIZE,
+        size=lambda key: item_size,
+    )
+    if controller is None:
+        for key_batch in key_batches:
+            retry = False
+            while len(key_batch) > 0:
+                key_batch = _get_items(key_batch, retry=retry)
+                retry = True
+    else:
+        _run_adaptive(key_batches, _get_items, controller)
+
+    aligned_items = {}
+    for table, table_items in items.items():
+        table_items = _deserialize(
+            table_items, metrics=metrics, tables=[table], deserializer=deserializer
+        )
+        if preserve_order and len(unique_keys[table]) > 0:
+            # The keys go through the same conversion as the items so that the key
+            # values compare equal to the item values (e.g. Decimal and float).
+            table_items = _align(
+                table_items,
+                _deserialize(list(keys[table]), deserializer=deserializer),
+                key_names=list(unique_keys[table][0]),
+                drop=dropped_attributes.get(table, []),
+                missing=missing,
+            )
+        aligned_items[table] = table_items
+
+    return aligned_items
+
+
+def get_all_items(
+    *,
+    table,
+    attributes=None,
+    index_name=None,
+    filter_expression=None,
+    segments=None,
+    deserializer=None,
+    boto3_kwargs={},
+    metrics=None,
+):
     """Get all the items in a table.
 
-    This function performs a scan of the table.
+    This function performs a scan of the table or, if ``index_name`` is specified, of
+    one of its secondary indexes.
 
     Parameters
     ----------
@@ -174,13 +631,38 @@ def get_all_items(*, table, attributes=None, boto3_kwargs={}):
 
     attributes : list[str]
         Names of the item attributes to return. If None (default), all attributes are
-        returned.
+        returned. Nested attributes can be selected with document paths such as
+        ``"a.b[0]"``.
+
+    index_name : str
+        Name of a global or local secondary index of the table to read from instead of
+        the table. The requested attributes are validated against the attributes
+        projected in the index.
+
+    filter_expression : boto3.dynamodb.conditions.ConditionBase
+        Condition (e.g. ``Attr("updated_at").gt("2021-01-20")``) that the items must
+        satisfy to be returned. The filter is applied by DynamoDB after reading the
+        items, which reduces the transferred data but not the consumed capacity.
+
+    segments : int
+        If specified, the table is read by a parallel scan of ``segments`` segments
+        scanned concurrently (see ``scan_pages``). Cannot be combined with
+        ``index_name`` or ``filter_expression``.
+
+    deserializer : dynamo_pandas.serde.TypeDeserializer
+        Deserializer converting the items from the DynamoDB format, for instance to
+        return binary values as bytes and sets as lists. If None (default), a
+        ``TypeDeserializer`` with default options is used.
 
     boto3_kwargs : dict
         Keyword arguments to pass to the underlying ``boto3.resource('dynamodb')``
         function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.resource>`_
         for details).
 
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity, unprocessed keys/items and sizes
+        of the requests are recorded in this object (see ``dynamo_pandas.metrics``).
+
     Returns
     -------
     list[dict]
@@ -204,25 +686,501 @@ def get_all_items(*, table, attributes=None, boto3_kwargs={}):
      {'player_id': 'player_four', 'play_time': '0 days 03:45:49'},
      {'player_id': 'player_one', 'play_time': '2 days 17:41:55'},
      {'player_id': 'player_two', 'play_time': '0 days 22:07:34'}]
+
+    Scan a (sparse) secondary index:
+
+    >>> items = get_all_items(table="players", index_name="bonus-index")
+    >>> print(items)
+    [{'player_id': 'player_three', 'bonus_points': 4},
+     {'player_id': 'player_one', 'bonus_points': 3},
+     {'player_id': 'player_two', 'bonus_points': 1}]
     """  # noqa: E501
+    if segments is not None:
+        if index_name is not None or filter_expression is not None:
+            raise ValueError(
+                "segments cannot be combined with index_name or filter_expression"
+            )
+
+        return [
+            item
+            for _, items, _ in scan_pages(
+                table=table,
+                attributes=attributes,
+                segments=segments,
+                deserializer=deserializer,
+                boto3_kwargs=boto3_kwargs,
+                metrics=metrics,
+            )
+            for item in items
+        ]
+
+    kwargs = {}
+    if index_name is not None:
+        _check_index_attributes(table, index_name, attributes, boto3_kwargs)
+        kwargs["IndexName"] = index_name
+
+    if attributes is not None:
+        kwargs.update(_projection(attributes))
+
+    if filter_expression is not None:
+        kwargs["FilterExpression"] = filter_expression
+
     table = boto3.resource("dynamodb", **boto3_kwargs).Table(table)
 
+    items = _paginate(table.scan, "Scan", table.name, metrics, **kwargs)
+
+    return _deserialize(
+        items, metrics=metrics, tables=[table.name], deserializer=deserializer
+    )
+
+
+def scan_pages(
+    *,
+    table,
+    attributes=None,
+    segments=1,
+    segment_ids=None,
+    exclusive_start_keys=None,
+    page_size=None,
+    raw=False,
+    deserializer=None,
+    boto3_kwargs={},
+    metrics=None,
+):
+    """Scan a table and yield the items page by page, as they are read.
+
+    With ``segments`` greater than 1, a parallel scan is performed: the table is split
+    in segments scanned concurrently by separate threads. The pages are yielded as
+    they are read so that only a few pages are held in memory, for instance to write
+    the items of large tables to files.
+
+    Parameters
+    ----------
+    table : str
+        Name of the DynamoDB table.
+
+    attributes : list[str]
+        Names of the item attributes to return. If None (default), all attributes are
+        returned.
+
+    segments : int
+        Number of segments of the parallel scan. Default is 1 (sequential scan).
+
+    segment_ids : list[int]
+        Segments to scan. If None (default), all the segments are scanned. Used with
+        ``exclusive_start_keys`` to resume an interrupted scan.
+
+    exclusive_start_keys : dict[int, dict]
+        Dictionary of segments -> the last evaluated key (in DynamoDB format) yielded
+        with the last page read from the segment, to resume the scan of the segments
+        after these keys.
+
+    page_size : int
+        Maximum number of items per page. If None (default), the pages are limited
+        only by the 1 MB limit of the scan requests.
+
+    raw : bool
+        If True, the items are yielded in DynamoDB format without being deserialized.
+
+    deserializer : dynamo_pandas.serde.TypeDeserializer
+        Deserializer converting the items from the DynamoDB format. If None (default),
+        a ``TypeDeserializer`` with default options is used.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details).
+
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity and number of items of the
+        requests are recorded in this object (see ``dynamo_pandas.metrics``).
+
+    Yields
+    ------
+    tuple[int, list[dict], dict]
+        The segment, the items of the page and the last evaluated key of the page (in
+        DynamoDB format), which is None for the last page of the segment.
+
+    Examples
+    --------
+
+    >>> for segment, items, last_key in scan_pages(table="players", segments=4):
+    ...     print(segment, len(items))
+    0 1
+    2 1
+    1 1
+    3 1
+    """  # noqa: E501
+    if deserializer is None:
+        deserializer = td
+
+    kwargs = dict(TableName=table, **_capacity_kwargs(metrics))
+    if attributes is not None:
+        kwargs.update(_projection(attributes))
+
+    if page_size is not None:
+        kwargs["Limit"] = page_size
+
+    if segment_ids is None:
+        segment_ids = range(segments)
+    segment_ids = list(segment_ids)
+
+    if exclusive_start_keys is None:
+        exclusive_start_keys = {}
+
+    client = boto3.client("dynamodb", **boto3_kwargs)
+
+    # Pages are passed from the segment threads through a bounded queue so that only
+    # a few pages are held in memory if they are consumed slower than they are read.
+    pages = Queue(maxsize=2 * len(segment_ids))
+    stop = threading.Event()
+
+    def put(value):
+        while not stop.is_set():
+            try:
+                pages.put(value, timeout=0.1)
+                return
+            except Full:
+                pass
+
+    def scan_segment(segment):
+        try:
+            segment_kwargs = dict(kwargs)
+            if segments > 1:
+                segment_kwargs.update(Segment=segment, TotalSegments=segments)
+
+            start_key = exclusive_start_keys.get(segment)
+            while not stop.is_set():
+                if start_key is not None:
+                    segment_kwargs["ExclusiveStartKey"] = start_key
+
+                start = time.perf_counter()
+                response = client.scan(**segment_kwargs)
+
+                if metrics is not None:
+                    metrics.record(
+                        operation="Scan",
+                        tables=[table],
+                        latency=time.perf_counter() - start,
+                        consumed_capacity=_consumed_capacity(response),
+                        throttles=_throttles(response),
+                        items=len(response["Items"]),
+                    )
+
+                start_key = response.get("LastEvaluatedKey")
+                put((segment, response["Items"], start_key))
+
+                if start_key is None:
+                    break
+        except Exception as e:
+            put(e)
+        finally:
+            put(None)
+
+    threads = [
+        threading.Thread(target=scan_segment, args=(segment,), daemon=True)
+        for segment in segment_ids
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        remaining = len(threads)
+        while remaining > 0:
+            try:
+                page = pages.get(timeout=0.1)
+            except Empty:
+                continue
+
+            if page is None:
+                remaining -= 1
+                continue
+            elif isinstance(page, Exception):
+                raise page
+
+            segment, items, last_key = page
+            if not raw:
+                items = [deserializer.deserialize({"M": item}) for item in items]
+
+            yield segment, items, last_key
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def query_items(
+    *,
+    keys,
+    table,
+    index_name=None,
+    attributes=None,
+    deserializer=None,
+    boto3_kwargs={},
+    metrics=None,
+):
+    """Get the items matching a list of keys from a table or a secondary index.
+
+    A query is performed for each key so that, unlike ``get_items``, keys can target
+    secondary indexes and keys made of only the partition key of a table with a
+    composite primary key return all the matching items.
+
+    Parameters
+    ----------
+    keys : list[dict]
+        List of key dictionaries. Each dictionary must contain the partition key and
+        optionally the sort key of the table or index.
+
+    table : str
+        Name of the DynamoDB table.
+
+    index_name : str
+        Name of a global or local secondary index of the table to query instead of the
+        table. The requested attributes are validated against the attributes projected
+        in the index.
+
+    attributes : list[str]
+        Names of the item attributes to return. If None (default), all attributes are
+        returned. Nested attributes can be selected with document paths such as
+        ``"a.b[0]"``.
+
+    deserializer : dynamo_pandas.serde.TypeDeserializer
+        Deserializer converting the items from the DynamoDB format, for instance to
+        return binary values as bytes and sets as lists. If None (default), a
+        ``TypeDeserializer`` with default options is used.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.resource('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.resource>`_
+        for details).
+
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity, unprocessed keys/items and sizes
+        of the requests are recorded in this object (see ``dynamo_pandas.metrics``).
+
+    Returns
+    -------
+    list[dict]
+        List of dictionaries where each dictionary represents an item's attributes.
+        Items are returned in the order of the keys.
+
+    Examples
+    --------
+
+    >>> items = query_items(
+    ...     keys=[{"bonus_points": 4}, {"bonus_points": 1}],
+    ...     table="players",
+    ...     index_name="bonus-index",
+    ... )
+    >>> print(items)
+    [{'player_id': 'player_three', 'bonus_points': 4},
+     {'player_id': 'player_two', 'bonus_points': 1}]
+    """  # noqa: E501
     kwargs = {}
+    if index_name is not None:
+        _check_index_attributes(table, index_name, attributes, boto3_kwargs)
+        kwargs["IndexName"] = index_name
+
     if attributes is not None:
-        kwargs["ProjectionExpression"] = ", ".join(attributes)
+        kwargs.update(_projection(attributes))
 
-    response = table.scan(**kwargs)
+    table = boto3.resource("dynamodb", **boto3_kwargs).Table(table)
+
+    items = []
+    for key in keys:
+        conditions = [Key(name).eq(value) for name, value in key.items()]
+        items.extend(
+            _paginate(
+                table.query,
+                "Query",
+                table.name,
+                metrics,
+                KeyConditionExpression=reduce(operator.and_, conditions),
+                **kwargs,
+            )
+        )
+
+    return _deserialize(
+        items, metrics=metrics, tables=[table.name], deserializer=deserializer
+    )
 
-    items = response["Items"]
 
-    while "LastEvaluatedKey" in response:
-        response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"], **kwargs)
+def _paginate(method, operation, table_name, metrics, **kwargs):
+    """Call a paginated Table method (scan or query) until all the pages are read and
+    return the items of all the pages."""
+    kwargs.update(_capacity_kwargs(metrics))
+
+    items = []
+    start_key = {}
+    while True:
+        start = time.perf_counter()
+        response = method(**start_key, **kwargs)
         items.extend(response["Items"])
 
-    return _deserialize(items)
+        if metrics is not None:
+            metrics.record(
+                operation=operation,
+                tables=[table_name],
+                latency=time.perf_counter() - start,
+                consumed_capacity=_consumed_capacity(response),
+                throttles=_throttles(response),
+                items=len(response["Items"]),
+            )
+
+        if "LastEvaluatedKey" not in response:
+            return items
+
+        start_key = {"ExclusiveStartKey": response["LastEvaluatedKey"]}
+
+
+# Cache of the table information: (table, boto3_kwargs) -> (time read, information).
+_table_info_cache = {}
+_table_info_lock = threading.Lock()
+
+
+def table_info(*, table, ttl=300, refresh=False, boto3_kwargs={}):
+    """Return the key schema, attribute types, indexes and capacity of a table.
+
+    The information is read with a DescribeTable request and cached for ``ttl``
+    seconds so that the functions requiring the key schema of a table do not send a
+    control plane request on each call.
+
+    Parameters
+    ----------
+    table : str
+        Name of the DynamoDB table.
+
+    ttl : float
+        Maximum age in seconds of the cached information of the table. Default is
+        300.
 
+    refresh : bool
+        If True, the table is described again even if its information is cached.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details). The information is cached separately for each set of keyword
+        arguments.
+
+    Returns
+    -------
+    dict
+        Dictionary with the following keys:
+
+        * ``partition_key``: name of the partition key attribute.
+        * ``sort_key``: name of the sort key attribute, or None.
+        * ``key``: list of the names of the key attributes.
+        * ``attribute_types``: dictionary of the names -> types ('S', 'N' or 'B') of
+          the key attributes of the table and its indexes.
+        * ``indexes``: dictionary of the index names -> dictionaries with the
+          ``type`` ('global' or 'local'), ``key`` (list of the key attributes) and
+          ``projection`` (the DynamoDB projection) of the secondary indexes.
+        * ``billing_mode``: 'PROVISIONED' or 'PAY_PER_REQUEST'.
+        * ``read_capacity`` and ``write_capacity``: provisioned capacity units, or None
+          in on-demand mode.
+        * ``stream_arn``: ARN of the stream of the table, or None.
+        * ``description``: the complete DescribeTable response.
+
+    Examples
+    --------
+
+    >>> info = table_info(table="players")
+    >>> info["key"]
+    ['player_id']
+    >>> info["attribute_types"]
+    {'player_id': 'S'}
+    """  # noqa: E501
+    cache_key = (table, repr(sorted(boto3_kwargs.items())))
+
+    with _table_info_lock:
+        cached = _table_info_cache.get(cache_key)
+    if cached is not None and not refresh and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    info = _table_info(_describe_table(table, boto3_kwargs))
+    with _table_info_lock:
+        _table_info_cache[cache_key] = (time.monotonic(), info)
+
+    return info
+
+
+def _table_info(description):
+    """Return the table information dictionary of a DescribeTable response."""
+
+    def key_names(key_schema):
+        return [
+            k["AttributeName"]
+            for k in sorted(key_schema, key=lambda k: k["KeyType"] != "HASH")
+        ]
+
+    key = key_names(description["KeySchema"])
+
+    indexes = {}
+    for index_type in ("global", "local"):
+        for index in description.get(f"{index_type.capitalize()}SecondaryIndexes", []):
+            indexes[index["IndexName"]] = dict(
+                type=index_type,
+                key=key_names(index["KeySchema"]),
+                projection=index["Projection"],
+            )
+
+    billing_mode = description.get("BillingModeSummary", {}).get(
+        "BillingMode", "PROVISIONED"
+    )
+    throughput = description.get("ProvisionedThroughput", {})
+    provisioned = billing_mode == "PROVISIONED"
+
+    return dict(
+        partition_key=key[0],
+        sort_key=key[1] if len(key) > 1 else None,
+        key=key,
+        attribute_types={
+            a["AttributeName"]: a["AttributeType"]
+            for a in description.get("AttributeDefinitions", [])
+        },
+        indexes=indexes,
+        billing_mode=billing_mode,
+        read_capacity=throughput.get("ReadCapacityUnits") if provisioned else None,
+        write_capacity=throughput.get("WriteCapacityUnits") if provisioned else None,
+        stream_arn=description.get("LatestStreamArn"),
+        description=description,
+    )
 
-def put_item(*, item, table, return_response=False, boto3_kwargs={}):
+
+def _describe_table(table, boto3_kwargs):
+    """Return the description of a table."""
+    client = boto3.client("dynamodb", **boto3_kwargs)
+    return client.describe_table(TableName=table)["Table"]
+
+
+def _check_index_attributes(table, index_name, attributes, boto3_kwargs):
+    """Raise a ValueError if the index does not exist or if attributes are not
+    projected in the index."""
+    info = table_info(table=table, boto3_kwargs=boto3_kwargs)
+
+    if index_name not in info["indexes"]:
+        # The index may have been created since the table information was cached.
+        info = table_info(table=table, refresh=True, boto3_kwargs=boto3_kwargs)
+        if index_name not in info["indexes"]:
+            raise ValueError(f"Index '{index_name}' not found in table '{table}'")
+
+    index = info["indexes"][index_name]
+    projection = index["projection"]
+    if attributes is None or projection["ProjectionType"] == "ALL":
+        return
+
+    projected = set(info["key"] + index["key"])
+    projected.update(projection.get("NonKeyAttributes", []))
+
+    not_projected = [a for a in attributes if _path_root(a) not in projected]
+    if len(not_projected) > 0:
+        raise ValueError(
+            f"Attributes {not_projected} are not projected in index '{index_name}'"
+        )
+
+
+def put_item(*, item, table, return_response=False, serializer=None, boto3_kwargs={}):
     """Add or update an item in a table. If the item does not exist in the table it is
     created, otherwise the existing item is replaced with the new one.
 
@@ -240,6 +1198,11 @@ def put_item(*, item, table, return_response=False, boto3_kwargs={}):
     return_response : bool
         If True, the response from the boto3 API call will be returned.
 
+    serializer : dynamo_pandas.serde.TypeSerializer
+        Serializer converting the items to the DynamoDB format, for instance to store
+        lists as sets. If None (default), a ``TypeSerializer`` with default options is
+        used.
+
     boto3_kwargs : dict
         Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
         function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
@@ -268,30 +1231,60 @@ def put_item(*, item, table, return_response=False, boto3_kwargs={}):
 
     client = boto3.client("dynamodb", **boto3_kwargs)
 
-    response = client.put_item(TableName=table, Item=ts.serialize(item)["M"])
+    if serializer is None:
+        serializer = ts
+
+    response = client.put_item(TableName=table, Item=serializer.serialize(item)["M"])
 
     if return_response:
         return response
 
 
-def _put_items(items, table, boto3_kwargs):
-    """Adapter function to format the items, call the client batch_write_item function
-    and return the unprocessed items (if any) in the format they were provided."""
-    client = boto3.client("dynamodb", **boto3_kwargs)
-
-    response = client.batch_write_item(
-        RequestItems={table: [{"PutRequest": {"Item": item}} for item in items]}
+def _is_items_iterable(items):
+    """Return True if items is an iterable of items (but not a single item or a
+    dataframe, whose iteration yields its column names)."""
+    return isinstance(items, Iterable) and not isinstance(
+        items, (dict, str, bytes, pd.DataFrame)
     )
 
-    if response["UnprocessedItems"] != {}:
-        return [
-            item["PutRequest"]["Item"] for item in response["UnprocessedItems"][table]
-        ]
-    else:
-        return []
 
+def _put_items(items, client, metrics=None, retry=False):
+    """Adapter function to format the (table, item) pairs, call the client
+    batch_write_item function and return the unprocessed items (if any) in the format
+    they were provided."""
+    request_items = {}
+    for table, item in items:
+        request_items.setdefault(table, []).append({"PutRequest": {"Item": item}})
+
+    start = time.perf_counter()
+    response = client.batch_write_item(
+        RequestItems=request_items, **_capacity_kwargs(metrics)
+    )
 
-def put_items(*, items, table, boto3_kwargs={}):
+    unprocessed_items = [
+        (table, item["PutRequest"]["Item"])
+        for table, table_items in response["UnprocessedItems"].items()
+        for item in table_items
+    ]
+
+    if metrics is not None:
+        metrics.record(
+            operation="BatchWriteItem",
+            tables=list(request_items),
+            latency=time.perf_counter() - start,
+            consumed_capacity=_consumed_capacity(response),
+            throttles=_throttles(response),
+            items=len(items) - len(unprocessed_items),
+            unprocessed=len(unprocessed_items),
+            retry=retry,
+        )
+
+    return unprocessed_items
+
+
+def put_items(
+    *, items, table, serializer=None, max_workers=1, boto3_kwargs={}, metrics=None
+):
     """Add or update multiple items in a table. If the item(s) do not exist in the
     table they are created, otherwise the existing items are replaced with the new ones.
 
@@ -300,16 +1293,32 @@ def put_items(*, items, table, boto3_kwargs={}):
     Parameters
     ----------
     items : list[dict]
-        List of dictionaries where each dictionary represents an item's attributes.
+        List, or any other iterable such as a generator, of dictionaries where each
+        dictionary represents an item's attributes. Items are serialized and written
+        as they are consumed from the iterable.
 
     table : str
         Name of the DynamoDB table.
 
+    serializer : dynamo_pandas.serde.TypeSerializer
+        Serializer converting the items to the DynamoDB format, for instance to store
+        lists as sets. If None (default), a ``TypeSerializer`` with default options is
+        used.
+
+    max_workers : int
+        Maximum number of batch requests in flight. Default is 1 (sequential
+        requests). With more than 1, the number of requests in flight is adapted
+        between 1 and ``max_workers`` (see ``put_items_multi``).
+
     boto3_kwargs : dict
         Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
         function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
         for details).
 
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity, unprocessed keys/items and sizes
+        of the requests are recorded in this object (see ``dynamo_pandas.metrics``).
+
     Examples
     --------
 
@@ -326,20 +1335,891 @@ def put_items(*, items, table, boto3_kwargs={}):
       'rating': 4.8}]
     >>> put_items(items=items, table="players)
     """  # noqa: E501
-    if not isinstance(items, list):
+    if not _is_items_iterable(items):
         raise TypeError("items must be a list of non-empty dictionaries")
 
-    items_to_process = [i["M"] for i in ts.serialize(items)["L"]]
+    put_items_multi(
+        items={table: items},
+        serializer=serializer,
+        max_workers=max_workers,
+        boto3_kwargs=boto3_kwargs,
+        metrics=metrics,
+    )
 
-    batch_size = 25
-    while len(items_to_process) > 0:
-        batch_items = items_to_process[:batch_size]
-        items_to_process = items_to_process[batch_size:]
 
-        unprocessed_items = _put_items(batch_items, table, boto3_kwargs)
+def put_items_multi(
+    *, items, serializer=None, max_workers=1, boto3_kwargs={}, metrics=None
+):
+    """Add or update multiple items in multiple tables. If the item(s) do not exist in
+    the tables they are created, otherwise the existing items are replaced with the new
+    ones.
+
+    The items of all the tables are packed together in the batch requests so that
+    writing items to several tables requires as few requests as possible.
+
+    Items can use supported numpy or pandas data types.
+
+    Parameters
+    ----------
+    items : dict[str, list[dict]]
+        Dictionary of table names and the lists (or other iterables) of dictionaries
+        representing the items to put in each table.
+
+    serializer : dynamo_pandas.serde.TypeSerializer
+        Serializer converting the items to the DynamoDB format, for instance to store
+        lists as sets. If None (default), a ``TypeSerializer`` with default options is
+        used.
+
+    max_workers : int
+        Maximum number of batch requests in flight. Default is 1 (sequential
+        requests). With more than 1, the batches are written by a pool of threads and
+        the number of requests in flight is adapted by an additive increase /
+        multiplicative decrease controller: it is increased while the requests
+        succeed and halved when a request is throttled or returns unprocessed items,
+        to find the highest throughput the table sustains.  The throttled and unprocessed
+        items are requested again after an exponential backoff delay with jitter.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details).
+
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity, unprocessed keys/items and sizes
+        of the requests are recorded in this object (see ``dynamo_pandas.metrics``).
+
+    Examples
+    --------
+
+    >>> put_items_multi(
+    ...     items={
+    ...         "players": [{"player_id": "player_five", "rating": 4.1}],
+    ...         "teams": [{"team_id": "team_c", "name": "Cats"}],
+    ...     }
+    ... )
+    """  # noqa: E501
+    if not isinstance(items, dict):
+        raise TypeError("items must be a dictionary of table names and lists of items")
+
+    for table_items in items.values():
+        if not _is_items_iterable(table_items):
+            raise TypeError("items must be a list of non-empty dictionaries")
+
+    stream = _serialize(
+        ((table, item) for table in items for item in items[table]),
+        metrics=metrics,
+        serializer=serializer,
+    )
+
+    client = boto3.client("dynamodb", **boto3_kwargs)
+
+    _write_items(stream, client, metrics=metrics, max_workers=max_workers)
+
+
+def _write_items(stream, client, metrics=None, max_workers=1):
+    """Write an iterable of (table, item) pairs, with items in DynamoDB format, in
+    batch requests, retrying the unprocessed items. With max_workers > 1, the batches
+    are written concurrently by up to max_workers threads."""
+    if max_workers > 1:
+        _write_items_adaptive(stream, client, metrics, max_workers)
+        return
+
+    # Queue of (table, item, retry) tuples, refilled from the stream as batches are
+    # sent so that only about one batch of items is held in memory.
+    queue = deque()
+    stream = iter(stream)
+
+    batch_size = 25
+    while True:
+        for table, item in islice(stream, max(batch_size - len(queue), 0)):
+            queue.append((table, item, False))
+
+        if len(queue) == 0:
+            break
+
+        batch_items = []
+        batch_bytes = 0
+        retry = False
+        while len(queue) > 0 and len(batch_items) < batch_size:
+            (table, item, is_retry) = queue[0]
+            item_bytes = _size({"M": item})
+            if len(batch_items) > 0 and batch_bytes + item_bytes > _MAX_REQUEST_SIZE:
+                break
+
+            queue.popleft()
+            batch_items.append((table, item))
+            batch_bytes += item_bytes
+            retry = retry or is_retry
+
+        unprocessed_items = _put_items(
+            batch_items, client, metrics=metrics, retry=retry
+        )
 
         if len(unprocessed_items) > batch_size // 2:
             batch_size = max(batch_size // 2, 1)
 
         # Put unprocessed items at back of queue.
-        items_to_process.extend(unprocessed_items)
+        queue.extend((table, item, True) for table, item in unprocessed_items)
+
+
+def _write_items_adaptive(stream, client, metrics, max_workers):
+    """Write an iterable of (table, item) pairs in batch requests sent concurrently,
+    the number of requests in flight being adapted by an AIMD controller."""
+
+    def write_batch(batch, retry):
+        start = time.perf_counter()
+        try:
+            return _put_items(batch, client, metrics=metrics, retry=retry)
+        except ClientError as e:
+            if not _is_throttling(e):
+                raise
+            tables = list(dict.fromkeys(table for table, _ in batch))
+            _record_throttling(
+                metrics, "BatchWriteItem", tables, start, e, batch, retry
+            )
+            return batch
+
+    batches = _batches(
+        stream,
+        batch_size=25,
+        max_size=_MAX_REQUEST_SIZE,
+        size=lambda table_item: _size({"M": table_item[1]}),
+    )
+    _run_adaptive(batches, write_batch, _AIMDController(max_workers))
+
+
+def _record_throttling(metrics, operation, tables, start, error, batch, retry):
+    """Record a request rejected with a throttling error, whose keys or items are all
+    unprocessed."""
+    if metrics is not None:
+        metrics.record(
+            operation=operation,
+            tables=tables,
+            latency=time.perf_counter() - start,
+            throttles=_throttles(error.response) + 1,
+            unprocessed=len(batch),
+            retry=retry,
+        )
+
+
+# Base and maximum delays in seconds of the exponential backoff of the retries.
+_BACKOFF_BASE = 0.05
+_BACKOFF_MAX = 5.0
+
+
+def _backoff(attempt):
+    """Return the delay before a retry (attempt >= 1), with exponential backoff and
+    full jitter."""
+    return random.uniform(0, min(_BACKOFF_MAX, _BACKOFF_BASE * 2**attempt))
+
+
+def _run_adaptive(batches, function, controller):
+    """Send batches with function(batch, retry), which returns the unprocessed part of
+    the batch, in a pool of threads, and raise the first error.
+
+    A request (new batch or retry) is sent only when the controller allows it, the
+    retries counting as requests in flight. The unprocessed parts of the batches are
+    sent again after an exponential backoff delay with jitter.
+    """
+    batches = iter(batches)
+    exhausted = False
+    # Heap of (time, sequence number, batch, attempt) of the retries.
+    retries = []
+    sequence = count()
+    # Dictionary of the futures in flight -> (epoch, attempt).
+    pending = {}
+
+    def submit(batch, attempt):
+        future = executor.submit(function, batch, attempt > 0)
+        pending[future] = (controller.epoch, attempt)
+
+    with ThreadPoolExecutor(max_workers=controller.maximum) as executor:
+        try:
+            while True:
+                now = time.monotonic()
+                if controller.allows(len(pending)):
+                    if len(retries) > 0 and retries[0][0] <= now:
+                        _, _, batch, attempt = heapq.heappop(retries)
+                        submit(batch, attempt)
+                        continue
+
+                    if not exhausted:
+                        batch = next(batches, None)
+                        if batch is None:
+                            exhausted = True
+                        else:
+                            submit(batch, 0)
+                            continue
+
+                if exhausted and len(pending) == 0 and len(retries) == 0:
+                    return
+
+                timeout = None
+                if len(retries) > 0 and controller.allows(len(pending)):
+                    timeout = max(retries[0][0] - now, 0)
+
+                if len(pending) == 0:
+                    time.sleep(timeout)
+                    continue
+
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    epoch, attempt = pending.pop(future)
+                    unprocessed = future.result()
+                    controller.update(len(unprocessed) > 0, epoch)
+                    if len(unprocessed) > 0:
+                        heapq.heappush(
+                            retries,
+                            (
+                                time.monotonic() + _backoff(attempt + 1),
+                                next(sequence),
+                                unprocessed,
+                                attempt + 1,
+                            ),
+                        )
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+# Error codes of the requests rejected because the capacity of the table, or the
+# request rate of the account, is exceeded.
+_THROTTLING_ERRORS = {
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "ThrottlingException",
+}
+
+
+def _is_throttling(error):
+    """Return True if an exception is a throttling error of a DynamoDB request."""
+    return (
+        isinstance(error, ClientError)
+        and error.response.get("Error", {}).get("Code") in _THROTTLING_ERRORS
+    )
+
+
+class _AIMDController:
+    """Additive increase/multiplicative decrease controller of the number of batch
+    requests in flight.
+
+    The limit starts at 1 and is increased by 1 for each successful request until the
+    first throttling (slow start, doubling the limit after each round of requests),
+    then by 1 / limit (1 per round of requests) up to maximum. It is halved when a
+    request is throttled or returns unprocessed keys/items, once per round: the
+    requests sent before the last decrease do not decrease the limit again.
+    """
+
+    def __init__(self, maximum):
+        self.maximum = maximum
+        self.limit = 1.0
+        self.epoch = 0
+        self.slow_start = True
+        self._lock = threading.Lock()
+
+    def allows(self, in_flight):
+        """Return True if a new request can be sent with in_flight requests in
+        flight."""
+        return in_flight < int(self.limit)
+
+    def update(self, throttled, epoch):
+        """Update the limit with the outcome of a request sent at epoch."""
+        with self._lock:
+            if throttled:
+                if epoch == self.epoch:
+                    self.limit = max(self.limit / 2, 1.0)
+                    self.epoch += 1
+                    self.slow_start = False
+            elif self.slow_start:
+                self.limit = min(self.limit + 1, self.maximum)
+            else:
+                self.limit = min(self.limit + 1 / self.limit, self.maximum)
+
+
+_MAX_TRANSACTION_SIZE = 4 * 1024 * 1024
+
+
+def _condition_kwargs(condition, serializer=None):
+    """Return the ConditionExpression, ExpressionAttributeNames and
+    ExpressionAttributeValues keyword arguments of a condition expression string or a
+    boto3 condition object (e.g. ``Attr('a').not_exists()``)."""
+    if condition is None:
+        return {}
+
+    if isinstance(condition, str):
+        return {"ConditionExpression": condition}
+
+    if not isinstance(condition, ConditionBase):
+        raise TypeError(
+            "condition must be a condition expression string or a boto3 condition"
+        )
+
+    if serializer is None:
+        serializer = ts
+
+    expression = ConditionExpressionBuilder().build_expression(condition)
+    kwargs = {"ConditionExpression": expression.condition_expression}
+    if expression.attribute_name_placeholders:
+        kwargs["ExpressionAttributeNames"] = expression.attribute_name_placeholders
+    if expression.attribute_value_placeholders:
+        kwargs["ExpressionAttributeValues"] = {
+            name: serializer.serialize(value)
+            for name, value in expression.attribute_value_placeholders.items()
+        }
+
+    return kwargs
+
+
+# Conditions comparing the version attribute of the items to put with the version
+# attribute of the existing items, mapped to the comparison operator.
+_VERSION_CONDITIONS = {"version_gt": "<", "version_ge": "<="}
+
+
+def _item_conditions(condition, version_attribute=None, serializer=None):
+    """Return a function returning the condition keyword arguments of a serialized
+    item. Version conditions compare the version attribute of each item with the one
+    of the existing item, other conditions are the same for all the items."""
+    if isinstance(condition, str) and condition in _VERSION_CONDITIONS:
+        if version_attribute is None:
+            raise ValueError(
+                f"A version attribute is required with the '{condition}' condition"
+            )
+
+        kwargs = {
+            "ConditionExpression": (
+                f"attribute_not_exists(#v) OR #v {_VERSION_CONDITIONS[condition]} :v"
+            ),
+            "ExpressionAttributeNames": {"#v": version_attribute},
+        }
+
+        def conditions(item):
+            if version_attribute not in item:
+                raise ValueError(
+                    f"Items must have a '{version_attribute}' version attribute"
+                )
+            return dict(
+                kwargs, ExpressionAttributeValues={":v": item[version_attribute]}
+            )
+
+        return conditions
+
+    kwargs = _condition_kwargs(condition, serializer=serializer)
+    return lambda item: kwargs
+
+
+def _transact_put(group, table, conditions, client, metrics=None):
+    """Put a group of serialized items in a single TransactWriteItems request and
+    return None if the transaction is committed or the error message otherwise."""
+    start = time.perf_counter()
+    try:
+        response = client.transact_write_items(
+            TransactItems=[
+                {"Put": dict(TableName=table, Item=item, **conditions(item))}
+                for item in group
+            ],
+            **_capacity_kwargs(metrics),
+        )
+        error = None
+    except ClientError as e:
+        response = e.response
+        error = str(e)
+
+    if metrics is not None:
+        metrics.record(
+            operation="TransactWriteItems",
+            tables=[table],
+            latency=time.perf_counter() - start,
+            consumed_capacity=_consumed_capacity(response),
+            throttles=_throttles(response),
+            items=len(group) if error is None else 0,
+            unprocessed=0 if error is None else len(group),
+        )
+
+    return error
+
+
+def transact_put_items(
+    *,
+    items,
+    table,
+    condition=None,
+    version_attribute=None,
+    max_workers=8,
+    serializer=None,
+    boto3_kwargs={},
+    metrics=None,
+):
+    """Add or update multiple items in a table in groups written atomically. The items
+    are split in groups of up to 100 items (and 4 MB), each group being written in a
+    single TransactWriteItems request: either all the items of a group are written or
+    none is. The groups are written concurrently and the result of each group is
+    reported so that only the failed groups need to be written again.
+
+    Transactions consume twice the write capacity of non-transactional writes. The
+    items of a group must have distinct keys.
+
+    Parameters
+    ----------
+    items : list[dict]
+        List (or other iterable) of dictionaries representing the items to put in the
+        table.
+
+    table : str
+        Name of the DynamoDB table.
+
+    condition : str or boto3.dynamodb.conditions.ConditionBase
+        Condition that each item must satisfy for its group to be written, either as a
+        condition expression string (e.g. ``"attribute_not_exists(id)"``), as a boto3
+        condition object (e.g. ``Attr("version").lt(3)``) or as one of the version
+        conditions 'version_gt' or 'version_ge', which write an item only if no item
+        with the same key exists or if the ``version_attribute`` of the item is greater
+        (or equal) than the one of the existing item.
+
+    version_attribute : str
+        Name of the version (or timestamp) attribute compared by the 'version_gt' and
+        'version_ge' conditions.
+
+    max_workers : int
+        Maximum number of groups written concurrently. Default is 8.
+
+    serializer : dynamo_pandas.serde.TypeSerializer
+        Serializer converting the items to the DynamoDB format, for instance to store
+        lists as sets. If None (default), a ``TypeSerializer`` with default options is
+        used.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details).
+
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity and items of the failed groups
+        (as unprocessed items) are recorded in this object (see
+        ``dynamo_pandas.metrics``).
+
+    Returns
+    -------
+    list[tuple]
+        One ``(start, stop, error)`` tuple per group where ``start`` and ``stop`` are
+        the positions of the group items in ``items`` and ``error`` is None if the
+        group is committed or the error message otherwise.
+
+    Examples
+    --------
+
+    >>> results = transact_put_items(
+    ...     items=[{"player_id": "player_five"}, {"player_id": "player_six"}],
+    ...     table="players",
+    ...     condition="attribute_not_exists(player_id)",
+    ... )
+    >>> print(results)
+    [(0, 2, None)]
+    """  # noqa: E501
+    if not _is_items_iterable(items):
+        raise TypeError("items must be a list of non-empty dictionaries")
+
+    conditions = _item_conditions(condition, version_attribute, serializer=serializer)
+    stream = _serialize(
+        ((table, item) for item in items), metrics=metrics, serializer=serializer
+    )
+    groups = list(
+        _batches(
+            (item for _, item in stream),
+            batch_size=100,
+            max_size=_MAX_TRANSACTION_SIZE,
+            size=lambda item: _size({"M": item}),
+        )
+    )
+
+    client = boto3.client("dynamodb", **boto3_kwargs)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        errors = list(
+            executor.map(
+                lambda group: _transact_put(group, table, conditions, client, metrics),
+                groups,
+            )
+        )
+
+    results = []
+    start = 0
+    for group, error in zip(groups, errors):
+        results.append((start, start + len(group), error))
+        start += len(group)
+
+    return results
+
+
+def _conditional_put(item, table, conditions, client, metrics=None):
+    """Put a serialized item with a PutItem request conditioned by the item condition
+    and return False if the condition is not satisfied, True otherwise."""
+    start = time.perf_counter()
+    try:
+        response = client.put_item(
+            TableName=table,
+            Item=item,
+            **conditions(item),
+            **_capacity_kwargs(metrics),
+        )
+        written = True
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        response = e.response
+        written = False
+
+    if metrics is not None:
+        metrics.record(
+            operation="PutItem",
+            tables=[table],
+            latency=time.perf_counter() - start,
+            consumed_capacity=_consumed_capacity(response),
+            throttles=_throttles(response),
+            items=int(written),
+        )
+
+    return written
+
+
+def conditional_put_items(
+    *,
+    items,
+    table,
+    condition,
+    version_attribute=None,
+    max_workers=8,
+    serializer=None,
+    boto3_kwargs={},
+    metrics=None,
+):
+    """Add or update multiple items in a table, each item being written only if it
+    satisfies a condition. The items are written concurrently in separate PutItem
+    requests and the items rejected by the condition are reported.
+
+    With a version condition, an item is only written if it is newer than the existing
+    item. This allows several writers to write to the same table in parallel, or
+    writes to be retried, without overwriting newer data.
+
+    Parameters
+    ----------
+    items : list[dict]
+        List (or other iterable) of dictionaries representing the items to put in the
+        table.
+
+    table : str
+        Name of the DynamoDB table.
+
+    condition : str or boto3.dynamodb.conditions.ConditionBase
+        Condition that each item must satisfy to be written, either as a condition
+        expression string (e.g. ``"attribute_not_exists(id)"``), as a boto3 condition
+        object (e.g. ``Attr("version").lt(3)``) or as one of the version conditions
+        'version_gt' or 'version_ge', which write an item only if no item with the same
+        key exists or if the ``version_attribute`` of the item is greater (or equal)
+        than the one of the existing item.
+
+    version_attribute : str
+        Name of the version (or timestamp) attribute compared by the 'version_gt' and
+        'version_ge' conditions.
+
+    max_workers : int
+        Maximum number of items written concurrently. Default is 8.
+
+    serializer : dynamo_pandas.serde.TypeSerializer
+        Serializer converting the items to the DynamoDB format, for instance to store
+        lists as sets. If None (default), a ``TypeSerializer`` with default options is
+        used.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details).
+
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity and number of written items are
+        recorded in this object (see ``dynamo_pandas.metrics``).
+
+    Returns
+    -------
+    list[int]
+        Positions in ``items`` of the items rejected by the condition.
+
+    Examples
+    --------
+
+    >>> rejected = conditional_put_items(
+    ...     items=[
+    ...         {"player_id": "player_one", "rating": 4.4, "version": 3},
+    ...         {"player_id": "player_two", "rating": 3.6, "version": 1},
+    ...     ],
+    ...     table="players",
+    ...     condition="version_gt",
+    ...     version_attribute="version",
+    ... )
+    >>> print(rejected)
+    [1]
+    """  # noqa: E501
+    if not _is_items_iterable(items):
+        raise TypeError("items must be a list of non-empty dictionaries")
+
+    conditions = _item_conditions(condition, version_attribute, serializer=serializer)
+    stream = _serialize(
+        ((table, item) for item in items), metrics=metrics, serializer=serializer
+    )
+
+    client = boto3.client("dynamodb", **boto3_kwargs)
+
+    rejected = []
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for position, (_, item) in enumerate(stream):
+                # Limit the number of items serialized ahead of the writes to the items
+                # being written.
+                if len(pending) >= max_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if not future.result():
+                            rejected.append(pending[future])
+                        del pending[future]
+
+                future = executor.submit(
+                    _conditional_put, item, table, conditions, client, metrics
+                )
+                pending[future] = position
+
+            for future, position in pending.items():
+                if not future.result():
+                    rejected.append(position)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    return sorted(rejected)
+
+
+_STATEMENT_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+"([^"]+)"', re.IGNORECASE)
+
+
+def _statement_tables(statement):
+    """Return the names of the tables referenced by a PartiQL statement."""
+    return list(dict.fromkeys(_STATEMENT_TABLE.findall(statement)))
+
+
+def _is_read_statement(statement):
+    """Return True if a PartiQL statement is a SELECT statement."""
+    return statement.lstrip().upper().startswith("SELECT")
+
+
+def execute_statement(
+    *,
+    statement,
+    parameters=None,
+    serializer=None,
+    deserializer=None,
+    boto3_kwargs={},
+    metrics=None,
+):
+    """Execute a PartiQL statement and return the items it returns. All the pages of
+    the results are read.
+
+    Parameters
+    ----------
+    statement : str
+        PartiQL statement to execute. Values can be passed as ``?`` placeholders bound
+        to the ``parameters``.
+
+    parameters : list
+        Values of the placeholders of the statement, in order. Values can use supported
+        numpy or pandas data types.
+
+    serializer : dynamo_pandas.serde.TypeSerializer
+        Serializer converting the parameters to the DynamoDB format. If None (default),
+        a ``TypeSerializer`` with default options is used.
+
+    deserializer : dynamo_pandas.serde.TypeDeserializer
+        Deserializer converting the items from the DynamoDB format, for instance to
+        return binary values as bytes and sets as lists. If None (default), a
+        ``TypeDeserializer`` with default options is used.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details).
+
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity and sizes of the requests are
+        recorded in this object (see ``dynamo_pandas.metrics``).
+
+    Returns
+    -------
+    list[dict]
+        List of dictionaries where each dictionary represents an item's attributes.
+        The list is empty for statements that do not return items.
+
+    Examples
+    --------
+
+    >>> items = execute_statement(
+    ...     statement='SELECT player_id, rating FROM "players" WHERE player_id = ?',
+    ...     parameters=["player_two"],
+    ... )
+    >>> print(items)
+    [{'player_id': 'player_two', 'rating': 3.8}]
+    """  # noqa: E501
+    if serializer is None:
+        serializer = ts
+
+    if deserializer is None:
+        deserializer = td
+
+    kwargs = dict(Statement=statement, **_capacity_kwargs(metrics))
+    if parameters:
+        kwargs["Parameters"] = [serializer.serialize(value) for value in parameters]
+
+    client = boto3.client("dynamodb", **boto3_kwargs)
+
+    items = []
+    while True:
+        start = time.perf_counter()
+        response = client.execute_statement(**kwargs)
+        items.extend(response.get("Items", []))
+
+        if metrics is not None:
+            metrics.record(
+                operation="ExecuteStatement",
+                tables=_statement_tables(statement),
+                read=_is_read_statement(statement),
+                latency=time.perf_counter() - start,
+                consumed_capacity=_consumed_capacity(response),
+                throttles=_throttles(response),
+                items=len(response.get("Items", [])),
+            )
+
+        if "NextToken" not in response:
+            break
+
+        kwargs["NextToken"] = response["NextToken"]
+
+    return [deserializer.deserialize({"M": item}) for item in items]
+
+
+def execute_statements(
+    *,
+    statement,
+    parameters,
+    serializer=None,
+    deserializer=None,
+    boto3_kwargs={},
+    metrics=None,
+):
+    """Execute a PartiQL statement once for each list of parameters. The statements
+    are sent in BatchExecuteStatement requests of up to 25 statements, which packs more
+    work in each round trip than individual requests, for instance to update or
+    conditionally write many items.
+
+    Parameters
+    ----------
+    statement : str
+        PartiQL statement to execute, with values passed as ``?`` placeholders bound to
+        the ``parameters``. Batch statements must target a single item, for instance
+        with the primary key in the ``WHERE`` clause.
+
+    parameters : list[list]
+        Lists (or other iterable) of values of the placeholders of the statement, one
+        list per execution of the statement. Values can use supported numpy or pandas
+        data types.
+
+    serializer : dynamo_pandas.serde.TypeSerializer
+        Serializer converting the parameters to the DynamoDB format. If None (default),
+        a ``TypeSerializer`` with default options is used.
+
+    deserializer : dynamo_pandas.serde.TypeDeserializer
+        Deserializer converting the items from the DynamoDB format, for instance to
+        return binary values as bytes and sets as lists. If None (default), a
+        ``TypeDeserializer`` with default options is used.
+
+    boto3_kwargs : dict
+        Keyword arguments to pass to the underlying ``boto3.client('dynamodb')``
+        function call (see `boto3 docs <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/core/session.html#boto3.session.Session.client>`_
+        for details).
+
+    metrics : dynamo_pandas.metrics.Metrics
+        If specified, the latency, consumed capacity and sizes of the requests are
+        recorded in this object (see ``dynamo_pandas.metrics``).
+
+    Returns
+    -------
+    list[dict]
+        The item returned by each execution of the statement, in the order of the
+        parameters. The value is None for statements that do not return an item.
+
+    Raises
+    ------
+    RuntimeError
+        If the execution of any statement fails, once all the statements are
+        executed. The failed statements are identified by the position of their
+        parameters.
+
+    Examples
+    --------
+
+    >>> execute_statements(
+    ...     statement='UPDATE "players" SET rating = ? WHERE player_id = ?',
+    ...     parameters=[[4.5, "player_one"], [3.9, "player_two"]],
+    ... )
+    [None, None]
+    """  # noqa: E501
+    if serializer is None:
+        serializer = ts
+
+    if deserializer is None:
+        deserializer = td
+
+    client = boto3.client("dynamodb", **boto3_kwargs)
+    tables = _statement_tables(statement)
+
+    results = []
+    errors = []
+    for batch in _batches(parameters, batch_size=25):
+        statements = [
+            dict(
+                Statement=statement,
+                Parameters=[serializer.serialize(value) for value in values],
+            )
+            for values in batch
+        ]
+
+        start = time.perf_counter()
+        response = client.batch_execute_statement(
+            Statements=statements, **_capacity_kwargs(metrics)
+        )
+
+        if metrics is not None:
+            metrics.record(
+                operation="BatchExecuteStatement",
+                tables=tables,
+                read=_is_read_statement(statement),
+                latency=time.perf_counter() - start,
+                consumed_capacity=_consumed_capacity(response),
+                throttles=_throttles(response),
+                items=len(statements),
+            )
+
+        for result in response["Responses"]:
+            if "Error" in result:
+                errors.append((len(results), result["Error"]))
+                results.append(None)
+            elif "Item" in result:
+                results.append(deserializer.deserialize({"M": result["Item"]}))
+            else:
+                results.append(None)
+
+    if len(errors) > 0:
+        position, error = errors[0]
+        raise RuntimeError(
+            f"Failed to execute the statement for the parameters at positions "
+            f"{[position for position, _ in errors]} "
+            f"(first error: {error.get('Code')}: {error.get('Message')})"
+        )
+
+    return results
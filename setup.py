@@ -39,7 +39,13 @@ setup(
     packages=find_packages(),
     python_requires=">=3.9",
     install_requires=["pandas>=1.2"],
-    extras_require={"boto3": ["boto3"]},
+    extras_require={
+        "boto3": ["boto3"],
+        "fsspec": ["fsspec"],
+        "orjson": ["orjson"],
+        "zstd": ["zstandard"],
+    },
+    entry_points={"console_scripts": ["dynamo-pandas=dynamo_pandas.cli:main"]},
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "License :: OSI Approved :: MIT License",
@@ -8,6 +8,7 @@ from test_data import large_table_items
 from test_data import test_df
 
 from dynamo_pandas.transactions import put_item
+from dynamo_pandas.transactions.transactions import _table_info_cache
 
 
 @pytest.fixture()
@@ -22,7 +23,9 @@ def aws_credentials():
 
 @pytest.fixture()
 def ddb_client(aws_credentials):
-    """Fixture to mock the dynamodb client using moto."""
+    """Fixture to mock the dynamodb client using moto. The cached table information
+    is cleared as the tables of each test are new tables."""
+    _table_info_cache.clear()
     with mock_aws():
         yield boto3.client("dynamodb")
 
@@ -105,3 +108,93 @@ def large_objects_table(ddb_client):
         assert response["ResponseMetadata"]["HTTPStatusCode"] == 200
 
     yield table_name
+
+
+@pytest.fixture()
+def gsi_table(ddb_client):
+    """Fixture providing a table with a sparse global secondary index named
+    'letter-index' and yielding the name of the table. The table primary key is named
+    'id' and is of numerical type. The index partition key is the 'letter' attribute,
+    present only on items with an even id, and the index projects the 'score'
+    attribute in addition to the keys."""
+    table_name = "test-gsi-table"
+    response = ddb_client.create_table(
+        AttributeDefinitions=[
+            dict(AttributeName="id", AttributeType="N"),
+            dict(AttributeName="letter", AttributeType="S"),
+        ],
+        TableName=table_name,
+        KeySchema=[dict(AttributeName="id", KeyType="HASH")],
+        GlobalSecondaryIndexes=[
+            dict(
+                IndexName="letter-index",
+                KeySchema=[dict(AttributeName="letter", KeyType="HASH")],
+                Projection=dict(ProjectionType="INCLUDE", NonKeyAttributes=["score"]),
+            )
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    assert response["ResponseMetadata"]["HTTPStatusCode"] == 200
+
+    for i in range(10):
+        item = dict(id=i, score=i * 10, other="x")
+        if i % 2 == 0:
+            item["letter"] = "a" if i < 5 else "b"
+        response = put_item(item=item, table=table_name, return_response=True)
+        assert response["ResponseMetadata"]["HTTPStatusCode"] == 200
+
+    yield table_name
+
+
+@pytest.fixture()
+def stream_table(ddb_client):
+    """Fixture generating an empty table with a stream enabled (NEW_AND_OLD_IMAGES view
+    type) and yielding the name of the table. The table primary key is named 'id' and
+    is of numerical type."""
+    table_name = "test-stream-table"
+    response = ddb_client.create_table(
+        AttributeDefinitions=[dict(AttributeName="id", AttributeType="N")],
+        TableName=table_name,
+        KeySchema=[dict(AttributeName="id", KeyType="HASH")],
+        BillingMode="PAY_PER_REQUEST",
+        StreamSpecification=dict(
+            StreamEnabled=True, StreamViewType="NEW_AND_OLD_IMAGES"
+        ),
+    )
+    assert response["ResponseMetadata"]["HTTPStatusCode"] == 200
+    yield table_name
+
+
+@pytest.fixture()
+def composite_table(ddb_client):
+    """Fixture generating an empty table with a composite primary key and yielding the
+    name of the table. The partition key is named 'player' and is of string type, the
+    sort key is named 'game' and is of numerical type. The table has a local secondary
+    index named 'score-index' with the 'score' attribute as sort key."""
+    table_name = "test-composite-table"
+    response = ddb_client.create_table(
+        AttributeDefinitions=[
+            dict(AttributeName="player", AttributeType="S"),
+            dict(AttributeName="game", AttributeType="N"),
+            dict(AttributeName="score", AttributeType="N"),
+        ],
+        TableName=table_name,
+        KeySchema=[
+            dict(AttributeName="player", KeyType="HASH"),
+            dict(AttributeName="game", KeyType="RANGE"),
+        ],
+        LocalSecondaryIndexes=[
+            dict(
+                IndexName="score-index",
+                KeySchema=[
+                    dict(AttributeName="player", KeyType="HASH"),
+                    dict(AttributeName="score", KeyType="RANGE"),
+                ],
+                Projection=dict(ProjectionType="KEYS_ONLY"),
+            )
+        ],
+        BillingMode="PROVISIONED",
+        ProvisionedThroughput=dict(ReadCapacityUnits=10, WriteCapacityUnits=20),
+    )
+    assert response["ResponseMetadata"]["HTTPStatusCode"] == 200
+    yield table_name
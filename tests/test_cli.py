@@ -0,0 +1,282 @@
+import json
+import os
+import threading
+import time
+from unittest import mock
+
+import pandas as pd
+import pytest
+from test_data import large_table_items
+
+from dynamo_pandas import get_df
+from dynamo_pandas import put_df
+from dynamo_pandas import read_export
+from dynamo_pandas.cli import main
+from dynamo_pandas.cli.cli import _RateLimiter
+from dynamo_pandas.transactions import put_item
+
+large_df = pd.DataFrame(large_table_items)
+
+
+def sorted_df(df):
+    """Return the dataframe sorted by id with a default index and sorted columns."""
+    return df.sort_values("id").reset_index(drop=True)[sorted(df.columns)]
+
+
+class Test_export:
+    """Test the export command."""
+
+    @pytest.mark.parametrize("format", ["ddbjson", "csv"])
+    def test_export(self, ddb_client, large_table, tmp_path, format):
+        """Test that all the items are exported, one file per scanned page."""
+        output = tmp_path / "export"
+        main(
+            ["export", large_table, str(output), "--format", format, "--segments", "3"]
+        )
+
+        files = [f for f in os.listdir(output) if f.startswith("part-")]
+        assert len(files) >= 3
+        if format == "ddbjson":
+            df = read_export(output)
+        else:
+            df = pd.concat(pd.read_csv(output / f) for f in files)
+
+        pd.testing.assert_frame_equal(
+            sorted_df(df), sorted_df(large_df), check_dtype=False
+        )
+
+    def test_binary_and_sets_csv(self, ddb_client, empty_table, tmp_path):
+        """Test that binary and set attributes are exported to csv files as bytes and
+        lists."""
+        put_item(item=dict(id=0, blob=b"\x01\x02", tags={"a"}), table=empty_table)
+
+        main(["export", empty_table, str(tmp_path), "--format", "csv", "--quiet"])
+
+        df = pd.read_csv(tmp_path / "part-0000-000000.csv")
+        assert df.to_dict("records") == [dict(id=0, blob="b'\\x01\\x02'", tags="['a']")]
+        assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
+
+    def test_binary_and_sets_parquet(self, ddb_client, empty_table, tmp_path):
+        """Test that binary and set attributes are exported to parquet files as bytes
+        and lists."""
+        pytest.importorskip("pyarrow")
+        put_item(item=dict(id=0, blob=b"\x01\x02", tags={"a", "b"}), table=empty_table)
+
+        main(["export", empty_table, str(tmp_path), "--format", "parquet", "--quiet"])
+
+        df = pd.read_parquet(tmp_path / "part-0000-000000.parquet")
+        assert df.blob.tolist() == [b"\x01\x02"]
+        assert sorted(df.tags[0]) == ["a", "b"]
+
+    def test_missing_parquet_engine(self, ddb_client, large_table, tmp_path, capsys):
+        """Test that a missing parquet engine is reported as an error, without leaving
+        a temporary file."""
+        error = ImportError("Unable to find a usable engine")
+        with mock.patch.object(pd.DataFrame, "to_parquet", side_effect=error):
+            with pytest.raises(SystemExit) as e:
+                main(["export", large_table, str(tmp_path), "--format", "parquet"])
+
+        assert e.value.code == 1
+        assert "Unable to find a usable engine" in capsys.readouterr().err
+        assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
+
+    def test_existing_export(self, ddb_client, large_table, tmp_path, capsys):
+        """Test that exporting into the directory of a previous export without --resume
+        fails."""
+        main(["export", large_table, str(tmp_path), "--quiet"])
+
+        with pytest.raises(SystemExit) as e:
+            main(["export", large_table, str(tmp_path), "--quiet"])
+
+        assert e.value.code == 1
+        assert "use --resume to resume it" in capsys.readouterr().err
+
+    def test_resume(self, ddb_client, large_table, tmp_path):
+        """Test that an interrupted export is resumed after the last written page."""
+        original_replace = os.replace
+        calls = []
+
+        def interrupted_replace(src, dst):
+            calls.append(dst)
+            if len(calls) == 4:
+                raise KeyboardInterrupt
+            original_replace(src, dst)
+
+        with mock.patch("os.replace", interrupted_replace):
+            with pytest.raises(KeyboardInterrupt):
+                main(["export", large_table, str(tmp_path), "--segments", "2"])
+
+        with open(tmp_path / "_checkpoint.json") as f:
+            checkpoint = json.load(f)
+        assert sum(s["page"] for s in checkpoint["state"].values()) == 1
+
+        main(["export", large_table, str(tmp_path), "--resume", "--quiet"])
+
+        with open(tmp_path / "_checkpoint.json") as f:
+            checkpoint = json.load(f)
+        assert all(s["done"] for s in checkpoint["state"].values())
+        pd.testing.assert_frame_equal(
+            sorted_df(read_export(tmp_path)), sorted_df(large_df), check_dtype=False
+        )
+
+
+class Test_import:
+    """Test the import command."""
+
+    def test_import_export(self, ddb_client, large_table, empty_table, tmp_path):
+        """Test that an exported table is imported into another table."""
+        main(["export", large_table, str(tmp_path), "--segments", "2", "--quiet"])
+        main(["import", str(tmp_path), empty_table, "--workers", "1", "--quiet"])
+
+        pd.testing.assert_frame_equal(
+            sorted_df(get_df(table=empty_table)), sorted_df(large_df), check_dtype=False
+        )
+
+    def test_import_csv(self, ddb_client, empty_table, tmp_path):
+        """Test that a csv file is imported."""
+        path = tmp_path / "items.csv"
+        large_df.to_csv(path, index=False)
+
+        main(["import", str(path), empty_table, "--quiet"])
+
+        pd.testing.assert_frame_equal(
+            sorted_df(get_df(table=empty_table)), sorted_df(large_df), check_dtype=False
+        )
+
+    def test_csv_round_trip(self, ddb_client, composite_table, tmp_path):
+        """Test that a table exported to csv files, with empty segments, is imported
+        with its string keys read as strings."""
+        df = pd.DataFrame(dict(player=["007", "008"], game=[1, 2], score=[10, 20]))
+        put_df(df, table=composite_table)
+
+        main(
+            ["export", composite_table, str(tmp_path), "--format", "csv"]
+            + ["--segments", "4", "--quiet"]
+        )
+        for player, game in zip(df.player, df.game):
+            ddb_client.delete_item(
+                TableName=composite_table,
+                Key={"player": {"S": player}, "game": {"N": str(game)}},
+            )
+        main(["import", str(tmp_path), composite_table, "--workers", "1", "--quiet"])
+
+        result = get_df(table=composite_table).sort_values("game")
+        assert result.player.tolist() == ["007", "008"]
+
+    def test_sparse_items(self, ddb_client, empty_table, tmp_path):
+        """Test that exported items with different attributes are imported without
+        the attributes of the other items."""
+        put_item(item=dict(id=1, letter="a"), table=empty_table)
+        put_item(item=dict(id=2, other=b"\x01"), table=empty_table)
+
+        main(["export", empty_table, str(tmp_path), "--quiet"])
+        for id in (1, 2):
+            ddb_client.delete_item(TableName=empty_table, Key={"id": {"N": str(id)}})
+        main(["import", str(tmp_path), empty_table, "--workers", "1", "--quiet"])
+
+        items = sorted(
+            ddb_client.scan(TableName=empty_table)["Items"], key=lambda i: i["id"]["N"]
+        )
+        assert items == [
+            {"id": {"N": "1"}, "letter": {"S": "a"}},
+            {"id": {"N": "2"}, "other": {"B": b"\x01"}},
+        ]
+
+    def test_csv_empty_values(self, ddb_client, empty_table, tmp_path):
+        """Test that the empty values of csv files are not written as NULL values."""
+        path = tmp_path / "items.csv"
+        path.write_text("id,letter,other\n1,a,\n2,,b\n")
+
+        main(["import", str(path), empty_table, "--quiet"])
+
+        items = sorted(
+            ddb_client.scan(TableName=empty_table)["Items"], key=lambda i: i["id"]["N"]
+        )
+        assert items == [
+            {"id": {"N": "1"}, "letter": {"S": "a"}},
+            {"id": {"N": "2"}, "other": {"S": "b"}},
+        ]
+
+    def test_empty_csv_file(self, ddb_client, empty_table, tmp_path):
+        """Test that empty csv files are skipped."""
+        (tmp_path / "empty.csv").write_text("\n")
+        large_df.to_csv(tmp_path / "items.csv", index=False)
+
+        main(["import", str(tmp_path), empty_table, "--workers", "1", "--quiet"])
+
+        assert len(get_df(table=empty_table)) == len(large_df)
+
+    def test_missing_input(self, ddb_client, empty_table, tmp_path, capsys):
+        """Test that importing a missing file fails."""
+        with pytest.raises(SystemExit):
+            main(["import", str(tmp_path / "missing.csv"), empty_table])
+
+        assert "No files to import found" in capsys.readouterr().err
+
+    def test_resume(self, ddb_client, empty_table, tmp_path):
+        """Test that the chunks already imported are skipped on resume."""
+        path = tmp_path / "items.csv"
+        large_df.to_csv(path, index=False)
+        with open(f"{path}.{empty_table}.import.json", "w") as f:
+            json.dump({str(path): [0]}, f)
+
+        main(["import", str(path), empty_table, "--resume", "--quiet"])
+
+        assert len(get_df(table=empty_table)) == 0
+
+        main(["import", str(path), empty_table, "--quiet"])
+
+        assert len(get_df(table=empty_table)) == len(large_df)
+
+    def test_chunks_written_concurrently(self, ddb_client, empty_table, tmp_path):
+        """Test that the chunks of a single file are written concurrently and that the
+        written chunks are recorded in the progress file."""
+        path = tmp_path / "items.csv"
+        pd.DataFrame(dict(id=range(4000))).to_csv(path, index=False)
+
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+
+        def write_items(items, client, **kwargs):
+            """Fake _write_items function recording the number of concurrent calls."""
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+
+        with mock.patch("dynamo_pandas.cli.cli._write_items", write_items):
+            main(["import", str(path), empty_table, "--workers", "4", "--quiet"])
+
+        assert max_in_flight > 1
+        with open(f"{path}.{empty_table}.import.json") as f:
+            assert sorted(json.load(f)[str(path)]) == [0, 1, 2, 3]
+
+
+class Test_RateLimiter:
+    """Test the _RateLimiter class."""
+
+    def test_delay(self):
+        """Test that the writing thread is delayed when the consumed capacity exceeds
+        the rate."""
+        limiter = _RateLimiter(10)
+        event = dict(operation="BatchWriteItem", consumed_capacity=None, items=25)
+
+        with mock.patch("time.sleep") as sleep:
+            limiter(event)
+
+        delay = sleep.call_args.args[0]
+        assert 2 < delay <= 2.5
+
+    def test_other_operations(self):
+        """Test that the read operations are not limited."""
+        limiter = _RateLimiter(10)
+        event = dict(operation="Scan", consumed_capacity=100, items=25)
+
+        with mock.patch("time.sleep") as sleep:
+            limiter(event)
+
+        sleep.assert_not_called()
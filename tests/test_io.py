@@ -0,0 +1,194 @@
+import base64
+import gzip
+import io
+import json
+from unittest import mock
+
+from boto3.dynamodb.types import Binary
+import numpy as np
+import pandas as pd
+import pytest
+from test_data import test_df
+
+from dynamo_pandas import read_ddb_json
+from dynamo_pandas import read_export
+from dynamo_pandas import to_ddb_json
+from dynamo_pandas.serde import TypeDeserializer
+from dynamo_pandas.serde import TypeSerializer
+
+test_df_items = test_df.to_dict("records")
+
+# Items of a sample export in DynamoDB JSON format, split in two data files.
+export_items = [
+    [
+        {"id": {"N": "0"}, "A": {"S": "abc"}, "B": {"N": "1.5"}},
+        {
+            "id": {"N": "1"},
+            "A": {"NULL": True},
+            "C": {"B": base64.b64encode(b"\x00\x01").decode()},
+            "D": {"M": {"a": {"L": [{"N": "1"}, {"BOOL": True}]}}},
+        },
+    ],
+    [
+        {
+            "id": {"N": "2"},
+            "E": {"SS": ["x"]},
+            "F": {"BS": [base64.b64encode(b"a").decode()]},
+        }
+    ],
+]
+
+
+@pytest.fixture()
+def export_dir(tmp_path):
+    """Fixture writing a sample export in a temporary directory, with the structure of
+    DynamoDB exports to S3, and yielding the path of the export directory."""
+    export = tmp_path / "AWSDynamoDB" / "01234567890123-abcdefgh"
+    (export / "data").mkdir(parents=True)
+    (export / "manifest-files.json").write_text("{}")
+
+    for i, file_items in enumerate(export_items):
+        with gzip.open(export / "data" / f"file{i}.json.gz", "wt") as f:
+            for item in file_items:
+                f.write(json.dumps({"Item": item}) + "\n")
+
+    yield export
+
+
+class Test_read_export:
+    """Test the read_export function."""
+
+    def test_directory(self, export_dir):
+        """Test that all the data files of a directory are read."""
+        df = read_export(export_dir)
+
+        assert df.id.tolist() == [0, 1, 2]
+        assert df.A[0] == "abc" and df.A[1] is None
+        assert df.B[0] == 1.5
+        assert df.C[1] == Binary(b"\x00\x01")
+        assert df.D[1] == {"a": [1, True]}
+        assert df.E[2] == {"x"}
+        assert df.F[2] == {Binary(b"a")}
+
+    def test_glob_pattern(self, export_dir):
+        """Test reading the files matching a glob pattern."""
+        df = read_export(str(export_dir / "data" / "file1.*"))
+
+        assert df.id.tolist() == [2]
+
+    def test_options(self, export_dir):
+        """Test the attributes, index, binary and sets parameters."""
+        df = read_export(
+            export_dir,
+            attributes=["id", "C", "F"],
+            index="id",
+            binary="bytes",
+            sets="list",
+        )
+
+        assert df.columns.tolist() == ["C", "F"]
+        assert df.C[1] == b"\x00\x01"
+        assert df.F[2] == [b"a"]
+
+    def test_processes(self, export_dir):
+        """Test reading the files in parallel processes."""
+        df = read_export(export_dir, processes=2)
+
+        assert df.equals(read_export(export_dir))
+
+    def test_no_files_raises(self, tmp_path):
+        """Test that a FileNotFoundError is raised if no data files are found."""
+        with pytest.raises(FileNotFoundError, match="No data files found"):
+            read_export(tmp_path)
+
+    def test_url_requires_fsspec(self, monkeypatch):
+        """Test that reading a filesystem URL without fsspec raises an ImportError."""
+        monkeypatch.setattr("dynamo_pandas.io.io.fsspec", None)
+
+        with pytest.raises(ImportError, match="fsspec package is required"):
+            read_export("s3://bucket/export/")
+
+    @pytest.mark.parametrize(
+        "paths, isdir, exists",
+        [
+            ([], False, False),
+            (["bucket/export"], True, True),
+            (["bucket/x"], False, False),
+        ],
+    )
+    def test_url_no_files_raises(self, monkeypatch, paths, isdir, exists):
+        """Test that a FileNotFoundError is raised if a filesystem URL glob, directory
+        or path matches no data files."""
+        fs = mock.Mock()
+        fs.isdir.return_value = isdir
+        fs.exists.return_value = exists
+        fs.glob.return_value = []
+        fsspec = mock.Mock()
+        fsspec.get_fs_token_paths.return_value = (fs, None, paths)
+        monkeypatch.setattr("dynamo_pandas.io.io.fsspec", fsspec)
+
+        with pytest.raises(FileNotFoundError, match="No data files found"):
+            read_export("s3://bucket/export/")
+
+    def test_dtype(self, export_dir):
+        """Test the dtype parameter."""
+        df = read_export(export_dir, attributes=["id", "B"], dtype={"B": "Float64"})
+
+        assert df.B.dtype == pd.Float64Dtype()
+
+
+class Test_ddb_json:
+    """Test the to_ddb_json and read_ddb_json functions."""
+
+    @pytest.mark.parametrize("file_name", ["items.json", "items.json.gz"])
+    def test_round_trip(self, tmp_path, file_name):
+        """Test that a dataframe written to a file is read back."""
+        path = tmp_path / file_name
+
+        to_ddb_json(test_df, path)
+        df = read_ddb_json(path)
+
+        td, ts = TypeDeserializer(), TypeSerializer()
+        expected = [td.deserialize(ts.serialize(item)) for item in test_df_items]
+        assert df.equals(pd.DataFrame(expected))
+
+    def test_format(self, tmp_path):
+        """Test that the lines are written in DynamoDB JSON format, binary values being
+        base64 encoded, and can be read as export files."""
+        path = tmp_path / "items.json.gz"
+        df = pd.DataFrame(dict(id=[0], A=[np.array([1, 2], dtype="uint8")], B=[1.5]))
+
+        to_ddb_json(df, path)
+
+        with gzip.open(path, "rt") as f:
+            assert json.loads(f.readline()) == {
+                "Item": {"id": {"N": "0"}, "A": {"B": "AQI="}, "B": {"N": "1.5"}}
+            }
+        assert read_export(path, binary="bytes").A[0] == b"\x01\x02"
+
+    def test_file_objects(self):
+        """Test writing to and reading from file objects."""
+        buffer = io.StringIO()
+
+        to_ddb_json(pd.DataFrame(dict(id=[0, 1])), buffer)
+        buffer.seek(0)
+
+        assert read_ddb_json(buffer).id.tolist() == [0, 1]
+
+    def test_chunksize(self, tmp_path):
+        """Test reading a file in chunks of rows."""
+        path = tmp_path / "items.json"
+        to_ddb_json(pd.DataFrame(dict(id=range(5))), path)
+
+        chunks = list(read_ddb_json(path, chunksize=2, index="id"))
+
+        assert [chunk.index.tolist() for chunk in chunks] == [[0, 1], [2, 3], [4]]
+
+    def test_without_orjson(self, tmp_path, monkeypatch):
+        """Test that the standard json module is used if orjson is not installed."""
+        monkeypatch.setattr("dynamo_pandas.io.io.orjson", None)
+        path = tmp_path / "items.json"
+
+        to_ddb_json(pd.DataFrame(dict(id=[0], A=["a"])), path)
+
+        assert read_ddb_json(path).to_dict("records") == [dict(id=0, A="a")]
@@ -1,16 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import multiprocessing
 import re
 from unittest import mock
 
+import numpy as np
 from packaging.version import parse as parse_version
 import pandas as pd
 import pytest
+from test_data import large_table_items
 from test_data import test_df
 
+from dynamo_pandas import copy_table
+from dynamo_pandas import execute_df
 from dynamo_pandas import get_df
 from dynamo_pandas import keys
+from dynamo_pandas import keys_from_df
 from dynamo_pandas import put_df
+from dynamo_pandas.dynamo_pandas import _flatten
 from dynamo_pandas.dynamo_pandas import _to_df
 from dynamo_pandas.dynamo_pandas import _to_items
+from dynamo_pandas.metrics import Metrics
+from dynamo_pandas.transactions import conditional_put_items
+from dynamo_pandas.transactions import get_all_items
+from dynamo_pandas.transactions import put_item
+from dynamo_pandas.transactions import put_items
+from dynamo_pandas.transactions import transact_put_items
 
 # List of item dictionaries with pandas dtypes
 test_items_pd = test_df.to_dict("records")
@@ -29,13 +44,100 @@ class Test_keys:
         """Test that the keys function works with only a partition key."""
         assert keys(id=range(3)) == [{"id": 0}, {"id": 1}, {"id": 2}]
 
-    def test_two_or_more_kwargs_raises(self):
-        """Test that two or more keyword arguments raises a ValueError."""
-        with pytest.raises(
-            ValueError,
-            match=re.escape("Only one key attribute (partition key) is supported."),
-        ):
-            keys(id=[1, 2, 3], di=[3, 2, 1])
+    def test_composite_key(self):
+        """Test that the values of multiple key attributes are paired."""
+        assert keys(id=np.array([1, 1, 2]), sk=pd.Series(["a", "b", "a"])) == [
+            {"id": 1, "sk": "a"},
+            {"id": 1, "sk": "b"},
+            {"id": 2, "sk": "a"},
+        ]
+
+    def test_native_types(self):
+        """Test that numpy values are converted to Python types."""
+        (key,) = keys(id=np.array([1], dtype="int64"))
+
+        assert type(key["id"]) is int
+
+    def test_different_lengths_raises(self):
+        """Test that key attributes with different numbers of values raise a
+        ValueError."""
+        with pytest.raises(ValueError, match="same number of values"):
+            keys(id=[1, 2, 3], di=[3, 2])
+
+    def test_no_kwargs_raises(self):
+        """Test that calling keys without key attributes raises a ValueError."""
+        with pytest.raises(ValueError, match="At least one key attribute"):
+            keys()
+
+
+class Test_keys_from_df:
+    """Test the keys_from_df function."""
+
+    def test_columns(self):
+        """Test that the unique keys are returned in the order of their first row."""
+        df = pd.DataFrame(
+            dict(player=["b", "a", "b", "a"], game=[2, 1, 2, 3], score=[1, 2, 3, 4])
+        )
+
+        assert keys_from_df(df, columns=["player", "game"]) == [
+            dict(player="b", game=2),
+            dict(player="a", game=1),
+            dict(player="a", game=3),
+        ]
+
+    def test_index(self):
+        """Test that index levels can be used as key columns."""
+        df = pd.DataFrame(dict(player=["a", "a"], game=[1, 2], score=[1, 2])).set_index(
+            ["player", "game"]
+        )
+
+        keys_list = keys_from_df(df, columns=["player", "game"])
+
+        assert keys_list == [dict(player="a", game=1), dict(player="a", game=2)]
+        assert all(type(key["game"]) is int for key in keys_list)
+
+    def test_table(self, ddb_client, composite_table):
+        """Test that the key columns are read from the table description."""
+        df = pd.DataFrame(dict(score=[1, 2], game=[1, 2], player=["a", "b"]))
+
+        assert keys_from_df(df, table=composite_table) == [
+            dict(player="a", game=1),
+            dict(player="b", game=2),
+        ]
+
+    def test_get_df(self, ddb_client, composite_table):
+        """Test that the keys can be used to get the rows of a table."""
+        df = pd.DataFrame(
+            dict(player=["a", "a", "b"], game=[1, 2, 1], score=[10, 20, 30])
+        )
+        put_df(df, table=composite_table)
+
+        result = get_df(
+            table=composite_table,
+            keys=keys_from_df(pd.concat([df, df]).iloc[1:], table=composite_table),
+        )
+
+        pd.testing.assert_frame_equal(
+            result[["player", "game", "score"]],
+            df.iloc[[1, 2, 0]].reset_index(drop=True),
+        )
+
+    def test_missing_values_raises(self):
+        """Test that missing key values raise a ValueError."""
+        df = pd.DataFrame(dict(id=[1, None]))
+
+        with pytest.raises(ValueError, match="cannot contain missing values"):
+            keys_from_df(df, columns=["id"])
+
+    def test_missing_columns_raises(self):
+        """Test that key columns not found in the dataframe raise a ValueError."""
+        with pytest.raises(ValueError, match=re.escape("Key columns ['sk'] not found")):
+            keys_from_df(pd.DataFrame(dict(id=[1])), columns=["id", "sk"])
+
+    def test_no_columns_raises(self):
+        """Test that a ValueError is raised without columns or table."""
+        with pytest.raises(ValueError, match="columns or table must be specified"):
+            keys_from_df(pd.DataFrame(dict(id=[1])))
 
 
 class Test_get_df:
@@ -167,6 +269,84 @@ class Test_get_df:
             )
         )
 
+    def test_keys_order(self, test_df_table):
+        """Test that the rows are returned in the order of the keys, including
+        duplicate keys."""
+        df = get_df(table=test_df_table, keys=keys(id=[2, 0, 2]), attributes=["id"])
+
+        assert list(df.id) == [2, 0, 2]
+
+    def test_missing_na(self, test_df_table):
+        """Test that missing="na" returns rows with missing values for the keys not in
+        the table."""
+        df = get_df(
+            table=test_df_table,
+            keys=keys(id=[3, 0, 4]),
+            attributes=["id", "B"],
+            missing="na",
+        )
+
+        assert list(df.id) == [3, 0, 4]
+        assert df.B.isna().tolist() == [True, False, True]
+
+    def test_missing_na_requires_preserve_order(self, test_df_table):
+        """Test that missing="na" with preserve_order=False raises a ValueError."""
+        with pytest.raises(
+            ValueError, match=re.escape("missing='na' requires preserve_order=True")
+        ):
+            get_df(
+                table=test_df_table,
+                keys=keys(id=[0]),
+                preserve_order=False,
+                missing="na",
+            )
+
+    def test_index(self, test_df_table):
+        """Test that the index parameter sets the dataframe index."""
+        df = get_df(
+            table=test_df_table,
+            keys=keys(id=[1, 0]),
+            attributes=["id", "B"],
+            index="id",
+        )
+
+        assert df.equals(pd.DataFrame({"B": [3, 2]}, index=pd.Index([1, 0], name="id")))
+
+    def test_flatten(self, empty_table):
+        """Test that flatten=True flattens the nested maps into columns."""
+        put_df(
+            pd.DataFrame(dict(id=[0, 1], a=[dict(b=1, c=dict(d="x")), dict(b=2)])),
+            table=empty_table,
+        )
+
+        df = get_df(table=empty_table, keys=keys(id=[0, 1]), flatten=True, sep="_")
+
+        assert list(df.columns) == ["id", "a_b", "a_c_d"]
+        assert df.a_b.tolist() == [1, 2]
+        assert df.a_c_d.tolist()[0] == "x" and pd.isna(df.a_c_d.tolist()[1])
+
+    def test_index_name_scan(self, gsi_table):
+        """Test that index_name without keys scans the secondary index."""
+        df = get_df(table=gsi_table, index_name="letter-index", attributes=["id"])
+
+        assert sorted(df.id) == [0, 2, 4, 6, 8]
+
+    def test_index_name_keys(self, gsi_table):
+        """Test that index_name with keys queries the secondary index."""
+        df = get_df(
+            table=gsi_table,
+            keys=keys(letter=["a"]),
+            index_name="letter-index",
+            index="id",
+        )
+
+        assert df.sort_index()[["score", "letter"]].equals(
+            pd.DataFrame(
+                {"score": [0, 20, 40], "letter": "a"},
+                index=pd.Index([0, 2, 4], name="id"),
+            )
+        )
+
     @pytest.mark.skipif(
         parse_version(pd.__version__) < parse_version("1.5"),
         reason="https://github.com/DrGFreeman/dynamo-pandas/issues/24",
@@ -255,6 +435,140 @@ class Test_put_df:
             )
         )
 
+    def test_binary_and_sets(self, ddb_client, empty_table):
+        """Test writing binary arrays and lists as sets and reading them back as bytes
+        and lists."""
+        df = pd.DataFrame(
+            dict(
+                id=[0, 1],
+                data=[np.array([1, 2], dtype="uint8"), np.array([3], dtype="uint8")],
+                tags=[["a", "b", "a"], ["c"]],
+            )
+        )
+
+        put_df(df, table=empty_table, lists_as_sets=True)
+        result = get_df(
+            table=empty_table, keys=keys(id=[0, 1]), binary="bytes", sets="list"
+        )
+
+        assert result.data.tolist() == [b"\x01\x02", b"\x03"]
+        assert sorted(result.tags[0]) == ["a", "b"]
+        assert result.tags[1] == ["c"]
+
+    def test_compress(self, ddb_client, empty_table):
+        """Test that compressed columns are stored as binary attributes and
+        decompressed by get_df."""
+        df = pd.DataFrame(
+            dict(id=[0, 1], text=["abc " * 1000, None], doc=[{"a": [1, 2]}, {"b": 1}])
+        )
+
+        put_df(df, table=empty_table, compress={"text": "gzip", "doc": "gzip"})
+
+        item = ddb_client.get_item(TableName=empty_table, Key={"id": {"N": "0"}})
+        assert "B" in item["Item"]["text"]
+        assert len(item["Item"]["text"]["B"]) < 100
+
+        result = get_df(table=empty_table, keys=keys(id=[0, 1]))
+        assert result.text[0] == "abc " * 1000
+        assert result.text[1] is None
+        assert result.doc.tolist() == [{"a": [1, 2]}, {"b": 1}]
+
+    def test_compress_missing_column(self, ddb_client, empty_table):
+        """Test that compressing a column not in the dataframe raises a ValueError."""
+        with pytest.raises(
+            ValueError, match=re.escape("Compressed columns ['x'] not found")
+        ):
+            put_df(test_df, table=empty_table, compress={"x": "gzip"})
+
+    def test_transactional(self, ddb_client, empty_table):
+        """Test that the rows of the groups that failed the condition are returned."""
+        df = pd.DataFrame(dict(id=range(150), A="a"))
+        put_df(df.iloc[[120]].assign(A="b"), table=empty_table)
+
+        # Moto is not thread safe, the groups are therefore written sequentially.
+        with mock.patch(
+            "dynamo_pandas.dynamo_pandas.transact_put_items",
+            partial(transact_put_items, max_workers=1),
+        ):
+            failed_df = put_df(
+                df,
+                table=empty_table,
+                transactional=True,
+                condition="attribute_not_exists(id)",
+            )
+
+        assert failed_df.equals(df.iloc[100:])
+        assert len(get_df(table=empty_table)) == 101
+
+    def test_version_condition(self, ddb_client, empty_table):
+        """Test that the rows older than the items in the table are returned."""
+        put_df(pd.DataFrame(dict(id=[0, 1], v=[2, 2], A="old")), table=empty_table)
+        df = pd.DataFrame(dict(id=[0, 1, 2], v=[1, 3, 1], A="new"))
+
+        # Moto is not thread safe, the rows are therefore written sequentially.
+        with mock.patch(
+            "dynamo_pandas.dynamo_pandas.conditional_put_items",
+            partial(conditional_put_items, max_workers=1),
+        ):
+            rejected_df = put_df(
+                df, table=empty_table, condition="version_gt", version_column="v"
+            )
+
+        assert rejected_df.equals(df.iloc[[0]])
+        assert get_df(table=empty_table).A.tolist() == ["old", "new", "new"]
+
+    def test_transactional_processes_raises(self, ddb_client, empty_table):
+        """Test that transactional cannot be combined with processes."""
+        with pytest.raises(ValueError, match="transactional and condition cannot be"):
+            put_df(test_df, table=empty_table, transactional=True, processes=2)
+
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork",
+        reason="moto mocks are only inherited by forked processes",
+    )
+    def test_processes(self, ddb_client, empty_table):
+        """Test that the rows are written by multiple processes and that the metrics of
+        the processes are aggregated."""
+        df = pd.DataFrame(dict(id=range(100), A="a"))
+        metrics = Metrics()
+
+        put_df(df, table=empty_table, processes=3, metrics=metrics)
+
+        assert metrics.items == 100
+        assert metrics.requests == 6
+
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork",
+        reason="moto mocks are only inherited by forked processes",
+    )
+    def test_processes_failures(self, ddb_client):
+        """Test that failed ranges of rows are reported once all ranges are
+        processed."""
+        df = pd.DataFrame(dict(id=range(10)))
+
+        with pytest.raises(
+            RuntimeError,
+            match="Failed to put the rows 0:5, 5:10 of the dataframe",
+        ):
+            put_df(df, table="missing-table", processes=2)
+
+    def test_processes_ranges(self):
+        """Test that each process only receives the rows of its range."""
+        df = pd.DataFrame(dict(id=range(10)))
+
+        with mock.patch(
+            "dynamo_pandas.dynamo_pandas.ProcessPoolExecutor", ThreadPoolExecutor
+        ), mock.patch(
+            "dynamo_pandas.dynamo_pandas._put_df_range", return_value=None
+        ) as put_df_range:
+            put_df(df, table="table", processes=3)
+
+        assert [c.args[0].id.tolist() for c in put_df_range.call_args_list] == [
+            [0, 1, 2],
+            [3, 4, 5],
+            [6, 7, 8, 9],
+        ]
+
     def test_boto3_kwargs_are_passed(self, ddb_client, empty_table):
         """Test that the boto3_kwargs are passed to the boto3.client() function call."""
         # Moto does not raise the expected ResourceNotFoundError (see
@@ -272,6 +586,242 @@ class Test_put_df:
             assert client.call_args[1] == dict(region_name="ca-central-1")
 
 
+class Test_put_df_on_duplicate:
+    """Test the on_duplicate parameter of the put_df function."""
+
+    df = pd.DataFrame(
+        dict(player=["a", "a", "b", "a"], game=[1, 2, 1, 1], score=[1, 2, 3, 4])
+    )
+
+    @pytest.mark.parametrize(
+        "on_duplicate, scores", [("last", [4, 2, 3]), ("first", [1, 2, 3])]
+    )
+    def test_keep(self, ddb_client, composite_table, on_duplicate, scores):
+        """Test that only the last or first row of each key is written."""
+        put_df(self.df, table=composite_table, on_duplicate=on_duplicate)
+
+        df = get_df(table=composite_table).sort_values(["player", "game"])
+        assert df["score"].tolist() == scores
+
+    def test_error(self, ddb_client, composite_table):
+        """Test that duplicate keys raise a ValueError before any row is written."""
+        with pytest.raises(ValueError, match=re.escape("positions [3] have the same")):
+            put_df(self.df, table=composite_table, on_duplicate="error")
+
+        assert get_df(table=composite_table).empty
+
+    def test_transactional(self, ddb_client, composite_table):
+        """Test that the returned rows of a transactional write refer to the
+        deduplicated rows."""
+        failed = put_df(
+            self.df,
+            table=composite_table,
+            transactional=True,
+            on_duplicate="last",
+        )
+
+        assert failed.empty
+        assert len(get_df(table=composite_table)) == 3
+
+    def test_missing_key_columns(self, ddb_client, composite_table):
+        """Test that a dataframe without the key columns raises a ValueError."""
+        with pytest.raises(ValueError, match=re.escape("Key columns ['game']")):
+            put_df(
+                self.df.drop(columns="game"), table=composite_table, on_duplicate="last"
+            )
+
+    def test_invalid_option(self, ddb_client, composite_table):
+        """Test that an invalid on_duplicate value raises a ValueError."""
+        with pytest.raises(ValueError, match="on_duplicate must be one of"):
+            put_df(self.df, table=composite_table, on_duplicate="any")
+
+
+class Test_put_df_schedule:
+    """Test the schedule parameter of the put_df function."""
+
+    df = pd.DataFrame(
+        dict(
+            player=["a"] * 4 + ["b"] * 2 + ["c"] * 3,
+            game=[1, 2, 3, 4, 1, 2, 1, 2, 3],
+            score=range(9),
+        )
+    )
+
+    def test_round_robin(self, ddb_client, composite_table):
+        """Test that the rows are written interleaved across the partition keys."""
+        written = []
+
+        def put_items_list(*, items, **kwargs):
+            items = list(items)
+            written.extend(items)
+            put_items(items=items, **kwargs)
+
+        with mock.patch("dynamo_pandas.dynamo_pandas.put_items", put_items_list):
+            put_df(self.df, table=composite_table, schedule="round_robin")
+
+        players = [item["player"] for item in written]
+        games = [item["game"] for item in written]
+
+        assert all(a != b for a, b in zip(players, players[1:4]))
+        assert games == sorted(games)
+        assert sorted(players[:3]) == ["a", "b", "c"]
+        assert len(get_df(table=composite_table)) == len(self.df)
+
+    def test_transactional(self, ddb_client, composite_table):
+        """Test that the rows are written with the transactional option."""
+        failed = put_df(
+            self.df, table=composite_table, schedule="round_robin", transactional=True
+        )
+
+        assert failed.empty
+        assert len(get_df(table=composite_table)) == len(self.df)
+
+    def test_missing_partition_key(self, ddb_client, composite_table):
+        """Test that a dataframe without the partition key raises a ValueError."""
+        with pytest.raises(ValueError, match="Partition key column 'player'"):
+            put_df(
+                self.df.drop(columns="player"),
+                table=composite_table,
+                schedule="round_robin",
+            )
+
+    def test_invalid_option(self, ddb_client, composite_table):
+        """Test that an invalid schedule value raises a ValueError."""
+        with pytest.raises(ValueError, match="schedule must be None or 'round_robin'"):
+            put_df(self.df, table=composite_table, schedule="random")
+
+
+class Test_put_df_max_workers:
+    """Test the max_workers parameter of the put_df and get_df functions."""
+
+    def test_max_workers(self, ddb_client, empty_table):
+        """Test that max_workers is passed to the put_items and get_items
+        functions."""
+        with mock.patch("dynamo_pandas.dynamo_pandas.put_items") as put_items_mock:
+            put_df(test_df, table=empty_table, max_workers=4)
+
+        assert put_items_mock.call_args.kwargs["max_workers"] == 4
+
+        with mock.patch("dynamo_pandas.dynamo_pandas.get_items") as get_items_mock:
+            get_items_mock.return_value = []
+            get_df(table=empty_table, keys=keys(id=[0]), max_workers=4)
+
+        assert get_items_mock.call_args.kwargs["max_workers"] == 4
+
+    def test_processes(self, ddb_client, empty_table):
+        """Test that combining max_workers with processes raises a ValueError."""
+        with pytest.raises(ValueError, match="max_workers cannot be combined"):
+            put_df(test_df, table=empty_table, max_workers=4, processes=2)
+
+
+class Test_execute_df:
+    """Test the execute_df function."""
+
+    def test_select(self, ddb_client, test_df_table):
+        """Test that the items returned by a statement are returned as a dataframe."""
+        df = execute_df(
+            f'SELECT id, B FROM "{test_df_table}" WHERE id = ?',
+            parameters=[1],
+            index="id",
+        )
+
+        assert df.equals(pd.DataFrame(dict(id=[1], B=[3])).set_index("id"))
+
+    def test_dataframe_parameters(self, ddb_client, test_df_table):
+        """Test that the statement is executed for each row of a dataframe of
+        parameters."""
+        parameters = pd.DataFrame(dict(B=[20, 40], id=[0, 2]))
+
+        df = execute_df(
+            f'UPDATE "{test_df_table}" SET B = ? WHERE id = ?', parameters=parameters
+        )
+
+        assert df.empty
+        assert get_df(table=test_df_table).B.tolist() == [20, 3, 40]
+
+
+class Test_copy_table:
+    """Test the copy_table function."""
+
+    def test_copy(self, ddb_client, large_table, empty_table):
+        """Test that all the items are copied and that they are not deserialized
+        without a transform."""
+        with mock.patch(
+            "dynamo_pandas.serde.TypeDeserializer.deserialize"
+        ) as deserialize:
+            written = copy_table(
+                source=large_table, destination=empty_table, segments=3, max_workers=1
+            )
+
+        deserialize.assert_not_called()
+        assert written == len(large_table_items)
+        items = get_all_items(table=empty_table)
+        assert sorted(items, key=lambda item: item["id"]) == large_table_items
+
+    def test_mixed_types(self, ddb_client, test_df_table, empty_table):
+        """Test that the items of all types are copied unchanged."""
+        copy_table(source=test_df_table, destination=empty_table, max_workers=1)
+
+        assert get_all_items(table=empty_table) == get_all_items(table=test_df_table)
+
+    def test_transform(self, ddb_client, large_table, empty_table):
+        """Test that the transform is applied to the dataframes of the pages."""
+
+        def transform(df):
+            df = df[df["number"] < 500].rename(columns={"letter": "character"})
+            return df.assign(double=df["number"] * 2)
+
+        written = copy_table(
+            source=large_table,
+            destination=empty_table,
+            transform=transform,
+            segments=2,
+            max_workers=1,
+        )
+
+        expected = [
+            dict(
+                id=item["id"],
+                character=item["letter"],
+                number=item["number"],
+                double=item["number"] * 2,
+            )
+            for item in large_table_items
+            if item["number"] < 500
+        ]
+        assert written == len(expected)
+        items = get_all_items(table=empty_table)
+        assert sorted(items, key=lambda item: item["id"]) == expected
+
+    def test_transform_sparse_items(self, ddb_client, test_df_table, empty_table):
+        """Test that the attributes an item did not have are not added to the item by
+        a transform, while NULL attributes are kept."""
+        for item in get_all_items(table=test_df_table):
+            ddb_client.delete_item(
+                TableName=test_df_table, Key={"id": {"N": str(item["id"])}}
+            )
+        put_item(item=dict(id=1, a="x", c="y"), table=test_df_table)
+        put_item(item=dict(id=2, b=1.5, c=None), table=test_df_table)
+
+        copy_table(
+            source=test_df_table,
+            destination=empty_table,
+            transform=lambda df: df,
+            max_workers=1,
+        )
+
+        items = ddb_client.scan(TableName=empty_table)["Items"]
+        assert sorted(items, key=lambda i: i["id"]["N"]) == [
+            {"id": {"N": "1"}, "a": {"S": "x"}, "c": {"S": "y"}},
+            {"id": {"N": "2"}, "b": {"N": "1.5"}, "c": {"NULL": True}},
+        ]
+
+    def test_invalid_transform(self, ddb_client, large_table, empty_table):
+        """Test that a transform that is not callable raises a TypeError."""
+        with pytest.raises(TypeError, match="transform must be a function"):
+            copy_table(source=large_table, destination=empty_table, transform="x")
+
+
 class Test__to_df:
     """Test the _to_df function."""
 
@@ -335,6 +885,23 @@ class Test__to_df:
         ]
 
 
+class Test__flatten:
+    """Test the _flatten function."""
+
+    def test_nested_maps(self):
+        """Test that nested maps are flattened and that lists and empty maps are
+        kept."""
+        item = dict(id=0, a=dict(b=1, c=dict(d=[1, 2]), e={}), f=[dict(g=1)])
+
+        assert _flatten(item, sep=".") == {
+            "id": 0,
+            "a.b": 1,
+            "a.c.d": [1, 2],
+            "a.e": {},
+            "f": [dict(g=1)],
+        }
+
+
 class Test__to_items:
     """Test the _to_items function."""
 
@@ -345,6 +912,34 @@ class Test__to_items:
         # Compare dictionary string values as pd.NA and np.nan fail comparison
         assert str(items) == str(test_items_pd)
 
+    def test_chunk_size(self):
+        """Test that with chunk_size, the items are generated by chunks of rows."""
+        items = _to_items(test_df, chunk_size=2)
+
+        assert not isinstance(items, list)
+        assert str(list(items)) == str(test_items_pd)
+
+    @pytest.mark.parametrize("chunk_size", [None, 1])
+    def test_dropna(self, chunk_size):
+        """Test that with dropna, the missing values are left out of the items but not
+        the None values."""
+        df = pd.DataFrame(
+            dict(
+                id=[0, 1],
+                A=pd.array([1, pd.NA], dtype="Int64"),
+                B=[np.nan, 2.5],
+                C=[pd.NaT, pd.Timestamp("2021-01-01")],
+                D=[None, [1]],
+            )
+        )
+
+        items = list(_to_items(df, chunk_size=chunk_size, dropna=True))
+
+        assert items == [
+            dict(id=0, A=1, D=None),
+            dict(id=1, B=2.5, C=pd.Timestamp("2021-01-01"), D=[1]),
+        ]
+
     def test_invalid_type_raises(self):
         """Test that a type different than a DataFrame raises a TypeError."""
         with pytest.raises(TypeError, match="df must be a pandas DataFrame"):
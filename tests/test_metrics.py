@@ -0,0 +1,243 @@
+import logging
+from unittest import mock
+
+from test_data import large_table_items
+from test_data import test_df
+
+from dynamo_pandas import get_df
+from dynamo_pandas import keys
+from dynamo_pandas import put_df
+from dynamo_pandas.metrics import logging_callback
+from dynamo_pandas.metrics import Metrics
+from dynamo_pandas.transactions import execute_statement
+from dynamo_pandas.transactions import get_all_items
+from dynamo_pandas.transactions import get_items
+from dynamo_pandas.transactions import put_items
+
+
+class Test_Metrics:
+    """Test the Metrics class."""
+
+    def test_record_updates_totals(self):
+        """Test that recorded events are added to the totals."""
+        metrics = Metrics()
+        metrics.record(
+            operation="BatchGetItem",
+            tables=["t"],
+            latency=0.5,
+            consumed_capacity=2.0,
+            items=3,
+            unprocessed=1,
+            retry=True,
+            throttles=2,
+        )
+        metrics.record(
+            operation="BatchWriteItem",
+            tables=["t"],
+            latency=0.25,
+            consumed_capacity=4.0,
+            items=2,
+        )
+        metrics.record(
+            operation="serialize", tables=["t"], latency=0.25, bytes_serialized=10
+        )
+
+        assert metrics.to_dict() == dict(
+            requests=2,
+            retries=1,
+            throttles=2,
+            unprocessed=1,
+            items=5,
+            latency=1.0,
+            read_capacity_units=2.0,
+            write_capacity_units=4.0,
+            bytes_serialized=10,
+            bytes_decoded=0,
+        )
+
+    def test_callbacks_receive_events(self):
+        """Test that the callbacks are called with each event."""
+        events = []
+        metrics = Metrics(callbacks=[events.append])
+        metrics.record(operation="Scan", tables=["t"], latency=0.1, items=4)
+
+        assert events == [
+            dict(
+                operation="Scan",
+                tables=["t"],
+                read=True,
+                latency=0.1,
+                consumed_capacity=0.0,
+                items=4,
+                unprocessed=0,
+                retry=False,
+                throttles=0,
+                bytes_serialized=0,
+                bytes_decoded=0,
+            )
+        ]
+
+    def test_read(self):
+        """Test that the capacity of the requests recorded as reads is added to the
+        read capacity units."""
+        metrics = Metrics()
+        metrics.record(
+            operation="ExecuteStatement", tables=["t"], latency=0.1, consumed_capacity=1
+        )
+        metrics.record(
+            operation="ExecuteStatement",
+            tables=["t"],
+            latency=0.1,
+            consumed_capacity=2,
+            read=True,
+        )
+
+        assert metrics.write_capacity_units == 1
+        assert metrics.read_capacity_units == 2
+
+    def test_merge(self):
+        """Test that the totals of other metrics are added to the totals."""
+        metrics = Metrics()
+        metrics.record(operation="Scan", tables=["t"], latency=0.5, items=4)
+        other = Metrics()
+        other.record(operation="BatchWriteItem", tables=["t"], latency=0.5, items=2)
+
+        metrics.merge(other)
+        metrics.merge(other.to_dict())
+
+        assert metrics.requests == 3
+        assert metrics.items == 8
+        assert metrics.latency == 1.5
+
+
+class Test_logging_callback:
+    """Test the logging_callback function."""
+
+    def test_logs_events(self, caplog):
+        """Test that the events are logged to the dynamo_pandas logger."""
+        metrics = Metrics(callbacks=[logging_callback()])
+
+        with caplog.at_level(logging.INFO, logger="dynamo_pandas"):
+            metrics.record(operation="Scan", tables=["t"], latency=0.1, items=4)
+
+        assert caplog.records[0].getMessage().startswith("Scan tables=['t']")
+
+
+class Test_instrumentation:
+    """Test the collection of metrics by the get and put functions."""
+
+    def test_get_items(self, ddb_client, large_table):
+        """Test that get_items records a request per batch and the decoding step."""
+        events = []
+        metrics = Metrics(callbacks=[events.append])
+
+        get_items(keys=keys(id=range(150)), table=large_table, metrics=metrics)
+
+        assert [e["operation"] for e in events] == [
+            "BatchGetItem",
+            "BatchGetItem",
+            "deserialize",
+        ]
+        assert metrics.requests == 2
+        assert metrics.items == 150
+        assert metrics.bytes_decoded > 0
+
+    def test_get_items_unprocessed_keys(self, ddb_client, large_table):
+        """Test that unprocessed keys and the corresponding retries are recorded."""
+
+        def batch_get_item(RequestItems, ReturnConsumedCapacity):
+            """Fake batch_get_item function that gets no more than 75 keys and returns
+            the remainder as unprocessed keys."""
+            keys = RequestItems[large_table]["Keys"]
+            return {
+                "Responses": {
+                    large_table: [large_table_items[k["id"]] for k in keys[:75]]
+                },
+                "UnprocessedKeys": (
+                    {large_table: {"Keys": keys[75:]}} if len(keys) > 75 else {}
+                ),
+                "ConsumedCapacity": [
+                    {"TableName": large_table, "CapacityUnits": len(keys[:75]) / 2}
+                ],
+            }
+
+        metrics = Metrics()
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.resource().batch_get_item.side_effect = batch_get_item
+
+            get_items(keys=keys(id=range(250)), table=large_table, metrics=metrics)
+
+        assert metrics.requests == 5
+        assert metrics.retries == 2
+        assert metrics.unprocessed == 50
+        assert metrics.items == 250
+        assert metrics.read_capacity_units == 125
+
+    def test_execute_statement(self, ddb_client, empty_table):
+        """Test that the capacity of SELECT statements is recorded as read capacity
+        and the capacity of other statements as write capacity."""
+        metrics = Metrics()
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().execute_statement.return_value = {
+                "Items": [],
+                "ConsumedCapacity": {"CapacityUnits": 1.5},
+            }
+
+            execute_statement(
+                statement=f'select * from "{empty_table}"', metrics=metrics
+            )
+            execute_statement(
+                statement=f"INSERT INTO \"{empty_table}\" VALUE {{'id': 1}}",
+                metrics=metrics,
+            )
+
+        assert metrics.read_capacity_units == 1.5
+        assert metrics.write_capacity_units == 1.5
+
+    def test_throttles(self, ddb_client, empty_table):
+        """Test that the attempts retried by botocore are recorded as throttles."""
+        metrics = Metrics()
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().batch_write_item.return_value = {
+                "UnprocessedItems": {},
+                "ResponseMetadata": {"RetryAttempts": 3},
+            }
+
+            put_items(items=[dict(id=0)], table=empty_table, metrics=metrics)
+
+        assert metrics.throttles == 3
+
+    def test_get_all_items(self, ddb_client, large_table):
+        """Test that get_all_items records the scan requests."""
+        metrics = Metrics()
+
+        items = get_all_items(table=large_table, metrics=metrics)
+
+        assert metrics.requests >= 1
+        assert metrics.items == len(items)
+        assert metrics.read_capacity_units > 0
+
+    def test_put_items(self, ddb_client, empty_table):
+        """Test that put_items records the serialization and the request of each
+        batch."""
+        events = []
+        metrics = Metrics(callbacks=[events.append])
+
+        put_items(items=large_table_items, table=empty_table, metrics=metrics)
+
+        assert [e["operation"] for e in events] == [
+            "serialize",
+            "BatchWriteItem",
+        ] * 10
+        assert metrics.items == len(large_table_items)
+        assert metrics.bytes_serialized > 0
+
+    def test_get_df_put_df(self, ddb_client, empty_table):
+        """Test that metrics are passed through the get_df and put_df functions."""
+        metrics = Metrics()
+
+        put_df(test_df, table=empty_table, metrics=metrics)
+        get_df(table=empty_table, metrics=metrics)
+
+        assert metrics.requests == 2
+        assert metrics.items == 2 * len(test_df)
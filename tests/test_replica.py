@@ -0,0 +1,113 @@
+from unittest import mock
+
+from boto3.dynamodb.conditions import Attr
+import pandas as pd
+import pytest
+
+from dynamo_pandas import keys
+from dynamo_pandas import put_df
+from dynamo_pandas.replica import TableReplica
+from dynamo_pandas.transactions import get_all_items
+from dynamo_pandas.transactions import put_item
+
+
+class Test_TableReplica:
+    """Test the TableReplica class."""
+
+    def test_lookup(self, ddb_client, test_df_table):
+        """Test that the items are looked up locally, in the order of the keys."""
+        replica = TableReplica(table=test_df_table, key="id", attributes=["B"])
+        replica.refresh()
+
+        with mock.patch("dynamo_pandas.replica.replica.get_items") as get_items:
+            df = replica.lookup(keys(id=[2, 0, 5]))
+            get_items.assert_called_once()
+
+        assert df.equals(pd.DataFrame(dict(id=[2, 0], B=[4, 2])).set_index("id"))
+        assert len(replica) == 3
+        assert {"id": 1} in replica
+
+    def test_fallback(self, ddb_client, test_df_table):
+        """Test that keys not in the replica are read from the table and cached."""
+        replica = TableReplica(table=test_df_table, key="id", attributes=["B"])
+
+        assert replica.get({"id": 1}) == dict(id=1, B=3)
+        assert replica.get({"id": 5}) is None
+        assert len(replica) == 1
+
+    def test_no_fallback(self, ddb_client, test_df_table):
+        """Test that keys not in the replica are not read if fallback is False."""
+        replica = TableReplica(table=test_df_table, key="id", fallback=False)
+
+        df = replica.lookup(keys(id=[1]))
+
+        assert df.empty and df.index.names == ["id"]
+
+    def test_full_refresh(self, ddb_client, test_df_table):
+        """Test that the replica is reloaded without stream or updated attribute."""
+        replica = TableReplica(table=test_df_table, key="id", attributes=["A"])
+        replica.refresh()
+
+        ddb_client.delete_item(TableName=test_df_table, Key={"id": {"N": "0"}})
+        replica.refresh()
+
+        assert replica.to_df().index.tolist() == [1, 2]
+
+    def test_updated_attribute_refresh(self, ddb_client, empty_table):
+        """Test that only the items updated since the last refresh are scanned."""
+        put_df(
+            pd.DataFrame(dict(id=[0, 1], A="a", updated=["2021-01-01", "2021-01-02"])),
+            table=empty_table,
+        )
+        replica = TableReplica(
+            table=empty_table, key="id", attributes=["A"], updated_attribute="updated"
+        )
+        replica.refresh()
+
+        put_item(item=dict(id=1, A="b", updated="2021-01-03"), table=empty_table)
+        put_item(item=dict(id=2, A="c", updated="2021-01-04"), table=empty_table)
+
+        with mock.patch(
+            "dynamo_pandas.replica.replica.get_all_items", wraps=get_all_items
+        ) as scan:
+            replica.refresh()
+
+        assert scan.call_args.kwargs["filter_expression"] == Attr("updated").gte(
+            "2021-01-02"
+        )
+        assert replica.to_df().A.tolist() == ["a", "b", "c"]
+
+    def test_updated_attribute_same_timestamp(self, ddb_client, empty_table):
+        """Test that items written after a refresh with the same updated value as the
+        last updated value of the replica are picked up by the next refresh."""
+        put_df(
+            pd.DataFrame(dict(id=[0, 1], A="a", updated="2021-01-01T00:00:00")),
+            table=empty_table,
+        )
+        replica = TableReplica(table=empty_table, key="id", updated_attribute="updated")
+        replica.refresh()
+
+        put_item(
+            item=dict(id=2, A="b", updated="2021-01-01T00:00:00"), table=empty_table
+        )
+        replica.refresh()
+
+        assert replica.to_df().A.to_dict() == {0: "a", 1: "a", 2: "b"}
+
+    def test_stream_refresh(self, ddb_client, stream_table):
+        """Test that the changes of the table stream are applied."""
+        put_df(pd.DataFrame(dict(id=[0, 1], A=["a", "b"])), table=stream_table)
+        replica = TableReplica(table=stream_table, key="id", stream=True)
+        replica.refresh()
+
+        put_item(item=dict(id=1, A="x"), table=stream_table)
+        put_item(item=dict(id=2, A="y"), table=stream_table)
+        ddb_client.delete_item(TableName=stream_table, Key={"id": {"N": "0"}})
+        replica.refresh()
+
+        assert replica.to_df().A.to_dict() == {1: "x", 2: "y"}
+
+    def test_stream_and_updated_attribute_raises(self):
+        """Test that combining stream and updated_attribute raises a ValueError."""
+        with pytest.raises(ValueError, match="cannot be combined with stream"):
+            TableReplica(table="t", key="id", updated_attribute="u", stream=True)
@@ -0,0 +1,145 @@
+from boto3.dynamodb.types import Binary
+import numpy as np
+import pandas as pd
+import pytest
+
+from dynamo_pandas import serde
+from dynamo_pandas.serde import compress
+from dynamo_pandas.serde import decompress
+from dynamo_pandas.serde import TypeDeserializer
+from dynamo_pandas.serde import TypeSerializer
+
+
+class Test_TypeSerializer:
+    """Test the TypeSerializer class."""
+
+    def test_lists_by_default(self):
+        """Test that lists are serialized as lists by default."""
+        assert TypeSerializer().serialize([1, 2]) == {"L": [{"N": "1"}, {"N": "2"}]}
+
+    def test_uint8_array_as_binary(self):
+        """Test that numpy arrays of uint8 values are serialized as binary values."""
+        assert TypeSerializer().serialize(np.array([1, 2], dtype="uint8")) == {
+            "B": b"\x01\x02"
+        }
+
+    def test_array_as_list(self):
+        """Test that other numpy arrays are serialized as lists."""
+        assert TypeSerializer().serialize(np.array([1.5, 2.0])) == {
+            "L": [{"N": "1.5"}, {"N": "2"}]
+        }
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ([1, 2, 1], {"NS": ["1", "2"]}),
+            (np.array([1, 2]), {"NS": ["1", "2"]}),
+            (["a", "b", "a"], {"SS": ["a", "b"]}),
+            ([b"a", b"b"], {"BS": [b"a", b"b"]}),
+            ([1, "a"], {"L": [{"N": "1"}, {"S": "a"}]}),
+            ([True, False], {"L": [{"N": "1"}, {"N": "0"}]}),
+            ([], {"L": []}),
+        ],
+    )
+    def test_lists_as_sets(self, value, expected):
+        """Test that non-empty lists of numbers, strings or bytes are serialized as
+        sets of unique values when lists_as_sets is True."""
+        assert TypeSerializer(lists_as_sets=True).serialize(value) == expected
+
+
+class Test_TypeDeserializer:
+    """Test the TypeDeserializer class."""
+
+    def test_defaults(self):
+        """Test that binary values and sets are deserialized as Binary and sets by
+        default."""
+        td = TypeDeserializer()
+
+        assert td.deserialize({"B": b"ab"}) == Binary(b"ab")
+        assert td.deserialize({"NS": ["1", "2"]}) == {1, 2}
+
+    def test_binary_as_bytes(self):
+        """Test that binary values are deserialized as bytes."""
+        td = TypeDeserializer(binary="bytes")
+
+        value = td.deserialize({"B": b"ab"})
+        assert type(value) is bytes and value == b"ab"
+        assert td.deserialize({"BS": [b"a"]}) == {b"a"}
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ({"NS": ["1", "2.5"]}, [1, 2.5]),
+            ({"SS": ["a", "b"]}, ["a", "b"]),
+            ({"BS": [b"a"]}, [Binary(b"a")]),
+        ],
+    )
+    def test_sets_as_lists(self, value, expected):
+        """Test that sets are deserialized as lists."""
+        assert TypeDeserializer(sets="list").deserialize(value) == expected
+
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        [
+            (dict(binary="str"), "binary must be one of 'Binary' or 'bytes'"),
+            (dict(sets="tuple"), "sets must be one of 'set' or 'list'"),
+        ],
+    )
+    def test_invalid_options(self, kwargs, message):
+        """Test that invalid options raise a ValueError."""
+        with pytest.raises(ValueError, match=message):
+            TypeDeserializer(**kwargs)
+
+
+class Test_compress:
+    """Test the compress and decompress functions."""
+
+    @pytest.mark.parametrize(
+        "value", ["abc" * 100, b"\x00\x01" * 100, [1, "a", None], {"a": {"b": 1}}]
+    )
+    def test_round_trip(self, value):
+        """Test that compressed values are decompressed into the original value."""
+        compressed = compress(value)
+
+        assert isinstance(compressed, bytes)
+        assert decompress(compressed) == value
+
+    def test_size_reduction(self):
+        """Test that compressible values are reduced in size."""
+        value = "a long text " * 1000
+        assert len(compress(value)) < len(value) / 10
+
+    @pytest.mark.parametrize("value", [None, np.nan, pd.NA])
+    def test_missing_values(self, value):
+        """Test that missing values are not compressed."""
+        assert compress(value) is value
+
+    def test_not_compressed(self):
+        """Test that values without the compression header are returned as is."""
+        assert decompress(b"abc") == b"abc"
+
+    def test_invalid_codec(self):
+        """Test that an invalid codec raises a ValueError."""
+        with pytest.raises(ValueError, match="codec must be one of 'gzip' or 'zstd'"):
+            compress("abc", codec="lz4")
+
+    def test_invalid_type(self):
+        """Test that unsupported value types raise a TypeError."""
+        with pytest.raises(TypeError, match="Compressed values must be strings"):
+            compress(1.5)
+
+    def test_zstd_not_installed(self, monkeypatch):
+        """Test that the zstd codec raises an ImportError if zstandard is not
+        installed."""
+        monkeypatch.setattr(serde.serde, "zstandard", None)
+
+        with pytest.raises(ImportError, match="zstandard package is required"):
+            compress("abc", codec="zstd")
+
+    def test_deserializer_decompress(self):
+        """Test that the TypeDeserializer decompresses compressed binary values if
+        decompress is True."""
+        value = {"B": compress("abc")}
+
+        assert TypeDeserializer(decompress=True).deserialize(value) == "abc"
+        assert TypeDeserializer().deserialize(value) == Binary(compress("abc"))
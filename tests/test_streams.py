@@ -0,0 +1,181 @@
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from dynamo_pandas import get_df
+from dynamo_pandas import put_df
+from dynamo_pandas.streams import apply_changes
+from dynamo_pandas.streams import read_stream
+from dynamo_pandas.streams.streams import _lineage_order
+from dynamo_pandas.streams.streams import _MAX_EMPTY_PAGES
+from dynamo_pandas.streams.streams import _read_shard
+from dynamo_pandas.transactions import put_item
+
+
+class Test_read_stream:
+    """Test the read_stream function."""
+
+    def test_changes(self, ddb_client, stream_table):
+        """Test that the inserted, modified and removed items are returned in order."""
+        put_df(pd.DataFrame(dict(id=[0, 1], A=["a", "b"])), table=stream_table)
+        put_item(item=dict(id=1, A="c"), table=stream_table)
+        ddb_client.delete_item(TableName=stream_table, Key={"id": {"N": "0"}})
+
+        changes, checkpoint = read_stream(table=stream_table)
+
+        assert changes._event.tolist() == ["INSERT", "INSERT", "MODIFY", "REMOVE"]
+        assert changes.id.tolist() == [0, 1, 1, 0]
+        assert changes.A.tolist()[:3] == ["a", "b", "c"]
+        assert pd.isna(changes.A[3])
+        assert list(checkpoint.values()) == [changes._sequence_number.iloc[-1]]
+
+    def test_checkpoint(self, ddb_client, stream_table):
+        """Test that only the changes after the checkpoint are returned."""
+        put_item(item=dict(id=0, A="a"), table=stream_table)
+        _, checkpoint = read_stream(table=stream_table)
+
+        put_item(item=dict(id=1, A="b"), table=stream_table)
+        changes, new_checkpoint = read_stream(table=stream_table, checkpoint=checkpoint)
+
+        assert changes.id.tolist() == [1]
+        assert new_checkpoint != checkpoint
+
+        changes, last_checkpoint = read_stream(
+            table=stream_table, checkpoint=new_checkpoint
+        )
+        assert changes.empty
+        assert changes.columns.tolist() == ["_event", "_sequence_number"]
+        assert last_checkpoint == new_checkpoint
+
+    def test_latest_checkpoint(self, ddb_client, stream_table):
+        """Test that reading from LATEST saves the position of the shards without new
+        records so that the changes made after the call are returned by the next
+        call."""
+        put_item(item=dict(id=0, A="a"), table=stream_table)
+        changes, checkpoint = read_stream(table=stream_table, start="LATEST")
+
+        assert changes.empty
+        assert len(checkpoint) == 1
+
+        put_item(item=dict(id=1, A="b"), table=stream_table)
+        changes, _ = read_stream(
+            table=stream_table, checkpoint=checkpoint, start="LATEST"
+        )
+
+        assert changes.id.tolist() == [1]
+
+    def test_empty_shard_checkpoint(self, ddb_client, stream_table):
+        """Test that the shards without records are saved in the checkpoint."""
+        changes, checkpoint = read_stream(table=stream_table, start="LATEST")
+        assert list(checkpoint.values()) == ["TRIM_HORIZON"]
+
+        put_item(item=dict(id=0, A="a"), table=stream_table)
+        changes, _ = read_stream(table=stream_table, checkpoint=checkpoint)
+
+        assert changes.id.tolist() == [0]
+
+    def test_no_stream_raises(self, ddb_client, empty_table):
+        """Test that a ValueError is raised if no stream is enabled on the table."""
+        with pytest.raises(ValueError, match="No stream is enabled on table"):
+            read_stream(table=empty_table)
+
+    def test_invalid_start_raises(self, ddb_client, stream_table):
+        """Test that an invalid start raises a ValueError."""
+        with pytest.raises(ValueError, match="start must be one of"):
+            read_stream(table=stream_table, start="AT_SEQUENCE_NUMBER")
+
+
+class Test__read_shard:
+    """Test the _read_shard function."""
+
+    def record(self, sequence_number):
+        return dict(dynamodb=dict(SequenceNumber=sequence_number))
+
+    def client(self, pages):
+        client = mock.Mock()
+        client.get_shard_iterator.return_value = dict(ShardIterator="0")
+        client.get_records.side_effect = lambda ShardIterator, Limit: dict(
+            Records=pages[int(ShardIterator)],
+            NextShardIterator=str(int(ShardIterator) + 1),
+        )
+        return client
+
+    def test_empty_pages(self):
+        """Test that the records after empty pages are read and that the shard is read
+        until a bounded number of consecutive empty pages."""
+        pages = [[], [], [self.record("1")], [], [self.record("2")]] + [[]] * 10
+        client = self.client(pages)
+
+        records, position = _read_shard(
+            client, "arn", dict(ShardId="s"), None, "LATEST"
+        )
+
+        assert records == []
+        assert position == "2"
+        assert client.get_records.call_count == 5 + _MAX_EMPTY_PAGES
+
+        records, position = _read_shard(
+            client, "arn", dict(ShardId="s"), "TRIM_HORIZON", "LATEST"
+        )
+
+        assert records == [self.record("1"), self.record("2")]
+        assert position == "2"
+
+    def test_closed_shard(self):
+        """Test that closed shards are not read from LATEST."""
+        client = self.client([])
+        shard = dict(ShardId="s", SequenceNumberRange=dict(EndingSequenceNumber="9"))
+
+        assert _read_shard(client, "arn", shard, None, "LATEST") == ([], "9")
+        client.get_records.assert_not_called()
+
+
+class Test__lineage_order:
+    """Test the _lineage_order function."""
+
+    def test_parents_first(self):
+        """Test that parent shards are ordered before their children."""
+        shards = [
+            dict(ShardId="c", ParentShardId="b"),
+            dict(ShardId="b", ParentShardId="a"),
+            dict(ShardId="d", ParentShardId="a"),
+            dict(ShardId="a", ParentShardId="expired"),
+        ]
+
+        assert [s["ShardId"] for s in _lineage_order(shards)] == ["a", "b", "c", "d"]
+
+
+class Test_apply_changes:
+    """Test the apply_changes function."""
+
+    def test_mirror(self, ddb_client, stream_table):
+        """Test that applying the changes keeps a dataframe in sync with the table."""
+        put_df(pd.DataFrame(dict(id=[0, 1, 2], A=["a", "b", "c"])), table=stream_table)
+        df = get_df(table=stream_table, index="id")
+        _, checkpoint = read_stream(table=stream_table)
+
+        put_item(item=dict(id=1, A="x", B=1), table=stream_table)
+        put_item(item=dict(id=3, A="d"), table=stream_table)
+        ddb_client.delete_item(TableName=stream_table, Key={"id": {"N": "2"}})
+        put_item(item=dict(id=1, A="y"), table=stream_table)
+        changes, _ = read_stream(table=stream_table, checkpoint=checkpoint)
+
+        df = apply_changes(df, changes)
+
+        expected = get_df(table=stream_table, index="id")
+        assert df.sort_index().A.tolist() == expected.sort_index().A.tolist()
+        assert df.index.tolist() == [0, 3, 1]
+        assert pd.isna(df.B[1])
+
+    def test_no_changes(self):
+        """Test that an empty dataframe of changes returns the dataframe."""
+        df = pd.DataFrame(dict(id=[0], A=["a"])).set_index("id")
+        changes = pd.DataFrame(columns=["_event", "_sequence_number"])
+
+        assert apply_changes(df, changes) is df
+
+    def test_not_indexed_raises(self):
+        """Test that a dataframe not indexed by the keys raises a ValueError."""
+        with pytest.raises(ValueError, match="df must be indexed by the key"):
+            apply_changes(pd.DataFrame(dict(id=[0])), pd.DataFrame())
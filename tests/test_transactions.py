@@ -1,19 +1,41 @@
 import base64
+from decimal import Decimal
 import os
+import re
 import sys
+import threading
+import time
 from unittest import mock
 
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
 import pandas as pd
 import pytest
 from test_data import large_table_items
 from test_data import test_df
 
 from dynamo_pandas import keys
+from dynamo_pandas.metrics import Metrics
+from dynamo_pandas.transactions import conditional_put_items
+from dynamo_pandas.transactions import execute_statement
+from dynamo_pandas.transactions import execute_statements
 from dynamo_pandas.transactions import get_all_items
 from dynamo_pandas.transactions import get_item
 from dynamo_pandas.transactions import get_items
+from dynamo_pandas.transactions import get_items_multi
 from dynamo_pandas.transactions import put_item
 from dynamo_pandas.transactions import put_items
+from dynamo_pandas.transactions import put_items_multi
+from dynamo_pandas.transactions import query_items
+from dynamo_pandas.transactions import scan_pages
+from dynamo_pandas.transactions import table_info
+from dynamo_pandas.transactions import transact_put_items
+from dynamo_pandas.transactions.transactions import _AIMDController
+from dynamo_pandas.transactions.transactions import _backoff
+from dynamo_pandas.transactions.transactions import _batches
+from dynamo_pandas.transactions.transactions import _describe_table
+from dynamo_pandas.transactions.transactions import _projection
+from dynamo_pandas.transactions.transactions import _run_adaptive
 
 
 class Test_put_item:
@@ -189,6 +211,20 @@ class Test_get_item:
 class Test_get_items:
     """Test the get_items function."""
 
+    @pytest.mark.parametrize("preserve_order", [True, False])
+    def test_fractional_number_key(self, ddb_client, empty_table, preserve_order):
+        """Test that items with fractional number keys, passed as Decimal, are
+        returned."""
+        put_items(items=[dict(id=0.1, A="a"), dict(id=2.0, A="b")], table=empty_table)
+
+        items = get_items(
+            keys=[{"id": Decimal("0.1")}, {"id": Decimal("2.0")}],
+            table=empty_table,
+            preserve_order=preserve_order,
+        )
+
+        assert items == [dict(id=0.1, A="a"), dict(id=2, A="b")]
+
     def test_multiple_existing(self, ddb_client, test_df_table):
         """Test with multiple existing items."""
         items = get_items(keys=[{"id": 0}, {"id": 2}], table=test_df_table)
@@ -319,6 +355,65 @@ class Test_get_items:
 
         assert items == large_table_items
 
+    def test_duplicate_keys(self, ddb_client, test_df_table):
+        """Test that duplicate keys are requested once and that their items are
+        returned in the order of the keys."""
+        items = get_items(
+            keys=[{"id": 2}, {"id": 0}, {"id": 2}, {"id": 3}],
+            table=test_df_table,
+            attributes=["id", "B"],
+        )
+
+        assert items == [{"id": 2, "B": 4}, {"id": 0, "B": 2}, {"id": 2, "B": 4}]
+        assert items[0] is not items[2]
+
+    def test_preserve_order_false(self, ddb_client, test_df_table):
+        """Test that with preserve_order=False, the items of the unique keys are
+        returned without the key attributes not in attributes."""
+        items = get_items(
+            keys=[{"id": 1}, {"id": 0}, {"id": 1}],
+            table=test_df_table,
+            attributes=["B"],
+            preserve_order=False,
+        )
+
+        assert sorted(items, key=lambda i: i["B"]) == [{"B": 2}, {"B": 3}]
+
+    def test_missing_na(self, ddb_client, test_df_table):
+        """Test that missing="na" returns None for the keys not in the table."""
+        items = get_items(
+            keys=[{"id": 3}, {"id": 0}],
+            table=test_df_table,
+            attributes=["B"],
+            missing="na",
+        )
+
+        assert items == [None, {"B": 2}]
+
+    def test_invalid_missing_raises(self, ddb_client, test_df_table):
+        """Test that an invalid missing value raises a ValueError."""
+        with pytest.raises(ValueError, match="missing must be one of 'drop' or 'na'"):
+            get_items(keys=[{"id": 0}], table=test_df_table, missing="skip")
+
+    def test_attributes_without_key(self, ddb_client, test_df_table):
+        """Test that the key attributes are not returned if not in attributes."""
+        items = get_items(
+            keys=[{"id": 1}, {"id": 0}], table=test_df_table, attributes=["B"]
+        )
+
+        assert items == [{"B": 3}, {"B": 2}]
+
+    def test_large_objects_batch_size(self, ddb_client, large_objects_table):
+        """Test that the number of keys per request is reduced to limit the size of the
+        responses once the size of the items is known."""
+        with mock.patch(
+            "dynamo_pandas.transactions.transactions._batches", wraps=_batches
+        ) as batches:
+            get_items(keys=keys(id=range(100)), table=large_objects_table)
+
+        sizes = batches.call_args[1]["size"]
+        assert sizes({"id": 0}) > 390 * 1024
+
     def test_boto3_kwargs_are_passed(self, ddb_client, test_df_table):
         """Test that the boto3_kwargs are passed to the boto3.resource() function
         call."""
@@ -344,9 +439,207 @@ class Test_get_items:
         assert items
 
 
+class Test__batches:
+    """Test the _batches function."""
+
+    def test_batch_size(self):
+        """Test that the items are split in batches of batch_size items."""
+        assert list(_batches(range(7), batch_size=3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_lazy(self):
+        """Test that the iterable is consumed as the batches are requested."""
+        items = iter(range(7))
+        batches = _batches(items, batch_size=3)
+
+        assert next(batches) == [0, 1, 2]
+        assert list(items) == [3, 4, 5, 6]
+
+    def test_max_size(self):
+        """Test that the batches are limited to max_size bytes."""
+        batches = _batches([4, 4, 1, 8, 2], batch_size=3, max_size=9, size=lambda i: i)
+
+        assert list(batches) == [[4, 4, 1], [8], [2]]
+
+    def test_item_larger_than_max_size(self):
+        """Test that items larger than max_size are returned in their own batch."""
+        batches = _batches([1, 12, 1], batch_size=3, max_size=9, size=lambda i: i)
+
+        assert list(batches) == [[1], [12], [1]]
+
+
+class Test__projection:
+    """Test the _projection function."""
+
+    def test_placeholders(self):
+        """Test that placeholders are used for all attribute names."""
+        assert _projection(["name", "status", "name"]) == {
+            "ProjectionExpression": "#a0, #a1, #a0",
+            "ExpressionAttributeNames": {"#a0": "name", "#a1": "status"},
+        }
+
+    def test_document_paths(self):
+        """Test that document paths are converted using placeholders for each
+        element."""
+        assert _projection(["a.b[0]", "a.c[1][2]"]) == {
+            "ProjectionExpression": "#a0.#a1[0], #a0.#a2[1][2]",
+            "ExpressionAttributeNames": {"#a0": "a", "#a1": "b", "#a2": "c"},
+        }
+
+    def test_invalid_path_raises(self):
+        """Test that an invalid document path raises a ValueError."""
+        with pytest.raises(
+            ValueError, match=re.escape("Invalid attribute path 'a..b'")
+        ):
+            _projection(["a..b"])
+
+
+class Test_reserved_words_and_paths:
+    """Test the projection of attributes named with reserved words and of document
+    paths by the get functions."""
+
+    items = [
+        dict(id=i, name=f"n{i}", status="ok", a=dict(b=[i, 2 * i], c="x"))
+        for i in range(3)
+    ]
+
+    def test_get_item(self, ddb_client, empty_table):
+        """Test with the get_item function."""
+        put_items(items=self.items, table=empty_table)
+
+        # Moto does not support list indexes following a placeholder in projection
+        # expressions so only a nested map attribute is tested here.
+        item = get_item(
+            key=dict(id=1), table=empty_table, attributes=["name", "status", "a.b"]
+        )
+
+        assert item == {"name": "n1", "status": "ok", "a": {"b": [1, 2]}}
+
+    def test_get_items(self, ddb_client, empty_table):
+        """Test with the get_items function."""
+        put_items(items=self.items, table=empty_table)
+
+        items = get_items(
+            keys=keys(id=[2, 0]), table=empty_table, attributes=["name", "a.c"]
+        )
+
+        assert items == [
+            {"name": "n2", "a": {"c": "x"}},
+            {"name": "n0", "a": {"c": "x"}},
+        ]
+
+    def test_get_all_items(self, ddb_client, empty_table):
+        """Test with the get_all_items function."""
+        put_items(items=self.items, table=empty_table)
+
+        items = get_all_items(table=empty_table, attributes=["id", "status"])
+
+        assert sorted(items, key=lambda i: i["id"]) == [
+            {"id": i, "status": "ok"} for i in range(3)
+        ]
+
+    def test_query_items(self, ddb_client, empty_table):
+        """Test with the query_items function."""
+        put_items(items=self.items, table=empty_table)
+
+        items = query_items(keys=keys(id=[1]), table=empty_table, attributes=["name"])
+
+        assert items == [{"name": "n1"}]
+
+
+class Test_get_items_multi:
+    """Test the get_items_multi function."""
+
+    def test_multiple_tables(self, ddb_client, test_df_table, large_table):
+        """Test that items are returned from multiple tables with the attributes
+        specified for each table."""
+        items = get_items_multi(
+            keys={test_df_table: [{"id": 0}, {"id": 3}], large_table: keys(id=[5])},
+            attributes={test_df_table: ["id", "A"]},
+        )
+
+        assert items == {
+            test_df_table: [{"id": 0, "A": "abc"}],
+            large_table: [large_table_items[5]],
+        }
+
+    def test_shared_batches(self, ddb_client, test_df_table, large_table):
+        """Test that the number of requests depends on the total number of keys."""
+        requests = []
+
+        def batch_get_item(RequestItems):
+            """Fake batch_get_item function recording the requests."""
+            requests.append(RequestItems)
+            return {
+                "Responses": {
+                    table: [dict(k) for k in table_dict["Keys"]]
+                    for table, table_dict in RequestItems.items()
+                },
+                "UnprocessedKeys": {},
+            }
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.resource().batch_get_item.side_effect = batch_get_item
+
+            items = get_items_multi(
+                keys={
+                    test_df_table: keys(id=range(60)),
+                    large_table: keys(id=range(60)),
+                }
+            )
+
+        assert [len(i) for i in items.values()] == [60, 60]
+        assert len(requests) == 2
+        assert set(requests[0]) == {test_df_table, large_table}
+
+
+class Test_query_items:
+    """Test the query_items function."""
+
+    def test_index_name(self, ddb_client, gsi_table):
+        """Test that the items matching each key of the index are returned in the
+        order of the keys."""
+        items = query_items(
+            keys=[{"letter": "b"}, {"letter": "a"}],
+            table=gsi_table,
+            index_name="letter-index",
+            attributes=["id", "score"],
+        )
+
+        assert [item["id"] for item in items[:2]] in ([6, 8], [8, 6])
+        assert sorted(item["id"] for item in items[2:]) == [0, 2, 4]
+        assert items[0] == {"id": items[0]["id"], "score": items[0]["id"] * 10}
+
+    def test_table(self, ddb_client, test_df_table):
+        """Test that the table is queried if index_name is not specified."""
+        items = query_items(keys=[{"id": 1}, {"id": 3}], table=test_df_table)
+
+        assert [item["id"] for item in items] == [1]
+
+
 class Test_get_all_items:
     """Test the get_all_items function."""
 
+    def test_filter_expression(self, ddb_client, test_df_table):
+        """Test that only the items satisfying the filter expression are returned,
+        also with projected attributes."""
+        items = get_all_items(
+            table=test_df_table, attributes=["id"], filter_expression=Attr("B").gt(2)
+        )
+
+        assert items == [dict(id=1), dict(id=2)]
+
+    def test_segments(self, ddb_client, large_table):
+        """Test that all the items are returned by a parallel scan."""
+        items = get_all_items(table=large_table, segments=3)
+
+        assert sorted(items, key=lambda item: item["id"]) == large_table_items
+
+    def test_segments_with_filter_expression(self, ddb_client, large_table):
+        """Test that combining segments with a filter expression raises a
+        ValueError."""
+        with pytest.raises(ValueError, match="segments cannot be combined"):
+            get_all_items(table=large_table, segments=3, filter_expression="id > 1")
+
     def test_mixed_types(self, ddb_client, test_df_table):
         """Test that the items from test_df_table are returned with the correct data
         types."""
@@ -407,6 +700,35 @@ class Test_get_all_items:
 
         assert [item.keys() == ["A"] for item in items]
 
+    def test_index_name(self, ddb_client, gsi_table):
+        """Test that index_name scans the secondary index."""
+        items = get_all_items(table=gsi_table, index_name="letter-index")
+
+        assert sorted(item["id"] for item in items) == [0, 2, 4, 6, 8]
+        assert all("other" not in item for item in items)
+
+    def test_index_name_attributes_not_projected_raises(self, ddb_client, gsi_table):
+        """Test that requesting attributes not projected in the index raises a
+        ValueError."""
+        with pytest.raises(
+            ValueError,
+            match=re.escape(
+                "Attributes ['other'] are not projected in index 'letter-index'"
+            ),
+        ):
+            get_all_items(
+                table=gsi_table,
+                index_name="letter-index",
+                attributes=["id", "score", "other"],
+            )
+
+    def test_index_name_not_found_raises(self, ddb_client, gsi_table):
+        """Test that an index not in the table raises a ValueError."""
+        with pytest.raises(
+            ValueError, match="Index 'number-index' not found in table 'test-gsi-table'"
+        ):
+            get_all_items(table=gsi_table, index_name="number-index")
+
     def test_boto3_kwargs_are_passed(self, ddb_client, test_df_table):
         """Test that the boto3_kwargs are passed to the boto3.resource() function
         call."""
@@ -465,6 +787,54 @@ class Test_put_items:
 
         assert len(get_all_items(table=empty_table)) == len(items)
 
+    def test_request_size_limit(self, ddb_client, empty_table):
+        """Test that the batches are limited to the 16 MB request size."""
+        requests = []
+
+        def batch_write_item(RequestItems):
+            """Fake batch_write_item function recording the requests."""
+            requests.append(len(RequestItems[empty_table]))
+            return {"UnprocessedItems": {}}
+
+        items = [dict(id=i, A="a" * 1024 * 1024) for i in range(25)]
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().batch_write_item.side_effect = batch_write_item
+
+            put_items(items=items, table=empty_table)
+
+        assert requests == [15, 10]
+
+    def test_generator(self, ddb_client, empty_table):
+        """Test that items can be provided by a generator."""
+        put_items(items=(dict(id=i) for i in range(60)), table=empty_table)
+
+        assert len(get_all_items(table=empty_table)) == 60
+
+    def test_items_consumed_lazily(self, ddb_client, empty_table):
+        """Test that the items are consumed from the iterable as batches are sent."""
+        consumed = []
+        consumed_at_request = []
+
+        def items():
+            """Generator recording the items consumed."""
+            for i in range(100):
+                consumed.append(i)
+                yield dict(id=i)
+
+        def batch_write_item(RequestItems):
+            """Fake batch_write_item function recording the number of items consumed
+            at each request."""
+            consumed_at_request.append(len(consumed))
+            return {"UnprocessedItems": {}}
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().batch_write_item.side_effect = batch_write_item
+
+            put_items(items=items(), table=empty_table)
+
+        assert consumed_at_request == [25, 50, 75, 100]
+
     def test_item_not_a_list_raises(self, ddb_client, empty_table):
         """Test that a TypeError is raised if items is not a list."""
         with pytest.raises(
@@ -472,6 +842,20 @@ class Test_put_items:
         ):
             put_items(items=large_table_items[0], table=empty_table)
 
+    def test_dataframe_raises(self, ddb_client, empty_table):
+        """Test that a TypeError is raised if items is a dataframe."""
+        with pytest.raises(
+            TypeError, match="items must be a list of non-empty dictionaries"
+        ):
+            put_items(items=pd.DataFrame(large_table_items), table=empty_table)
+
+    def test_non_dictionary_items_raise(self, ddb_client, empty_table):
+        """Test that a TypeError is raised if an item is not a dictionary."""
+        with pytest.raises(
+            TypeError, match="items must be a list of non-empty dictionaries"
+        ):
+            put_items(items=iter([dict(id=0), "id"]), table=empty_table)
+
     def test_unprocessed_items(self, ddb_client, empty_table):
         """Test the handling of unprocessed items returned by the
         boto3.client().batch_write_item function."""
@@ -513,3 +897,718 @@ class Test_put_items:
             )
 
             assert client.call_args[1] == dict(region_name="ca-central-1")
+
+
+class Test_put_items_multi:
+    """Test the put_items_multi function."""
+
+    def test_multiple_tables(self, ddb_client, empty_table, large_table):
+        """Test that items are written to multiple tables."""
+        put_items_multi(
+            items={
+                empty_table: [dict(id=i, A="a") for i in range(20)],
+                large_table: [dict(id=i, B="b") for i in range(300, 310)],
+            }
+        )
+
+        assert len(get_all_items(table=empty_table)) == 20
+        assert get_items(keys=keys(id=[300]), table=large_table) == [
+            dict(id=300, B="b")
+        ]
+
+    def test_shared_batches(self, ddb_client, empty_table, large_table):
+        """Test that the number of requests depends on the total number of items."""
+        requests = []
+
+        def batch_write_item(RequestItems):
+            """Fake batch_write_item function recording the requests."""
+            requests.append(RequestItems)
+            return {"UnprocessedItems": {}}
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().batch_write_item.side_effect = batch_write_item
+
+            put_items_multi(
+                items={
+                    empty_table: [dict(id=i) for i in range(15)],
+                    large_table: [dict(id=i) for i in range(15)],
+                }
+            )
+
+        assert [sum(len(v) for v in r.values()) for r in requests] == [25, 5]
+        assert set(requests[0]) == {empty_table, large_table}
+
+    def test_items_not_a_dict_raises(self):
+        """Test that a TypeError is raised if items is not a dictionary."""
+        with pytest.raises(
+            TypeError,
+            match="items must be a dictionary of table names and lists of items",
+        ):
+            put_items_multi(items=large_table_items)
+
+
+class Test_transact_put_items:
+    """Test the transact_put_items function."""
+
+    def test_groups(self, ddb_client, empty_table):
+        """Test that the items are written in groups of 100 items and that the result
+        of each group is returned."""
+        # Moto is not thread safe, the groups are therefore written sequentially.
+        results = transact_put_items(
+            items=large_table_items, table=empty_table, max_workers=1
+        )
+
+        assert results == [(0, 100, None), (100, 200, None), (200, 250, None)]
+        assert len(get_all_items(table=empty_table)) == 250
+
+    @pytest.mark.parametrize(
+        "condition", ["attribute_not_exists(id)", Attr("id").not_exists()]
+    )
+    def test_condition(self, ddb_client, empty_table, condition):
+        """Test that only the groups of which all the items satisfy the condition are
+        written."""
+        put_item(item=dict(id=150), table=empty_table)
+
+        results = transact_put_items(
+            items=large_table_items,
+            table=empty_table,
+            condition=condition,
+            max_workers=1,
+        )
+
+        assert [error is None for _, _, error in results] == [True, False, True]
+        assert "ConditionalCheckFailed" in results[1][2]
+        assert len(get_all_items(table=empty_table)) == 151
+
+    def test_condition_with_values(self, ddb_client, empty_table):
+        """Test a boto3 condition with attribute values."""
+        put_item(item=dict(id=0, version=2), table=empty_table)
+
+        results = transact_put_items(
+            items=[dict(id=0, version=3)],
+            table=empty_table,
+            condition=Attr("version").lt(2),
+        )
+
+        assert results[0][2] is not None
+        assert get_item(key=dict(id=0), table=empty_table)["version"] == 2
+
+    def test_concurrent_groups(self):
+        """Test that the groups are written concurrently."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def transact_write_items(TransactItems):
+            """Fake transact_write_items function waiting for the three groups to be
+            in progress at the same time."""
+            barrier.wait()
+            return {}
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().transact_write_items.side_effect = transact_write_items
+
+            results = transact_put_items(items=large_table_items, table="table")
+
+        assert [error for _, _, error in results] == [None, None, None]
+
+    def test_invalid_condition(self, ddb_client, empty_table):
+        """Test that an invalid condition raises a TypeError."""
+        with pytest.raises(TypeError, match="condition must be a condition"):
+            transact_put_items(items=[dict(id=0)], table=empty_table, condition=1)
+
+    def test_version_condition(self, ddb_client, empty_table):
+        """Test that groups with items older than the existing items are not
+        written."""
+        put_item(item=dict(id=0, v=2), table=empty_table)
+
+        results = transact_put_items(
+            items=[dict(id=0, v=1), dict(id=1, v=1)],
+            table=empty_table,
+            condition="version_gt",
+            version_attribute="v",
+            max_workers=1,
+        )
+
+        assert results[0][2] is not None
+        assert get_all_items(table=empty_table) == [dict(id=0, v=2)]
+
+
+class Test_conditional_put_items:
+    """Test the conditional_put_items function."""
+
+    @pytest.fixture()
+    def versioned_table(self, empty_table):
+        """Fixture adding items with ids 0 to 2 and version 2 to the empty table."""
+        for i in range(3):
+            put_item(item=dict(id=i, v=2, A="old"), table=empty_table)
+        yield empty_table
+
+    @pytest.mark.parametrize(
+        "condition, rejected", [("version_gt", [0, 1]), ("version_ge", [0])]
+    )
+    def test_version_conditions(self, ddb_client, versioned_table, condition, rejected):
+        """Test that only the items newer than the existing items are written and that
+        the positions of the rejected items are returned."""
+        # Moto is not thread safe, the items are therefore written sequentially.
+        result = conditional_put_items(
+            items=[
+                dict(id=0, v=1, A="new"),
+                dict(id=1, v=2, A="new"),
+                dict(id=2, v=3, A="new"),
+                dict(id=3, v=1, A="new"),
+            ],
+            table=versioned_table,
+            condition=condition,
+            version_attribute="v",
+            max_workers=1,
+        )
+
+        assert result == rejected
+        assert [item["A"] for item in get_all_items(table=versioned_table)] == [
+            "old" if i in rejected else "new" for i in range(4)
+        ]
+
+    def test_expression_condition(self, ddb_client, versioned_table):
+        """Test a condition expression string."""
+        result = conditional_put_items(
+            items=[dict(id=2), dict(id=3)],
+            table=versioned_table,
+            condition="attribute_not_exists(id)",
+            max_workers=1,
+        )
+
+        assert result == [0]
+
+    def test_version_attribute_required(self, ddb_client, empty_table):
+        """Test that a version condition without version attribute raises a
+        ValueError."""
+        with pytest.raises(ValueError, match="A version attribute is required"):
+            conditional_put_items(
+                items=[dict(id=0)], table=empty_table, condition="version_gt"
+            )
+
+    def test_missing_version_raises(self, ddb_client, empty_table):
+        """Test that items without the version attribute raise a ValueError."""
+        with pytest.raises(ValueError, match="Items must have a 'v' version"):
+            conditional_put_items(
+                items=[dict(id=0)],
+                table=empty_table,
+                condition="version_gt",
+                version_attribute="v",
+            )
+
+    def test_bounded_window(self):
+        """Test that the items are read from the iterable (in chunks of 25 serialized
+        items) as the writes complete rather than all up front and that the rejected
+        positions are returned."""
+        read = []
+
+        def items():
+            for i in range(100):
+                read.append(i)
+                yield dict(id=i)
+
+        in_flight = []
+
+        def put_item(Item, **kwargs):
+            in_flight.append(len(read) - int(Item["id"]["N"]))
+            if int(Item["id"]["N"]) % 3 == 0:
+                raise ClientError(
+                    {"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem"
+                )
+            return {}
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().put_item.side_effect = put_item
+
+            rejected = conditional_put_items(
+                items=items(),
+                table="table",
+                condition="attribute_not_exists(id)",
+                max_workers=2,
+            )
+
+        assert rejected == list(range(0, 100, 3))
+        assert max(in_flight) <= 25 + 2
+
+    def test_other_errors_raise(self):
+        """Test that errors other than failed conditions are raised."""
+        error = ClientError(
+            {"Error": {"Code": "ValidationException", "Message": "Invalid"}}, "PutItem"
+        )
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().put_item.side_effect = error
+
+            with pytest.raises(ClientError, match="Invalid"):
+                conditional_put_items(
+                    items=[dict(id=0)], table="table", condition="attribute_exists(id)"
+                )
+
+
+class Test_execute_statement:
+    """Test the execute_statement function."""
+
+    def test_select(self, ddb_client, test_df_table):
+        """Test that the items returned by a select statement are returned."""
+        items = execute_statement(
+            statement=f'SELECT * FROM "{test_df_table}" WHERE id = ?', parameters=[1]
+        )
+
+        assert items == [
+            dict(
+                A=None,
+                B=3,
+                C="1 days 01:33:20",
+                D="2000-12-31 00:00:00",
+                E="2000-12-31 23:59:59+00:00",
+                F=None,
+                G=None,
+                id=1,
+            )
+        ]
+
+    def test_pagination(self):
+        """Test that all the pages of the results are read."""
+        requests = []
+
+        def execute(**kwargs):
+            """Fake execute_statement function returning three pages."""
+            requests.append(kwargs)
+            page = len(requests)
+            response = {"Items": [{"id": {"N": str(page)}}]}
+            if page < 3:
+                response["NextToken"] = f"token-{page}"
+            return response
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().execute_statement.side_effect = execute
+
+            items = execute_statement(statement='SELECT * FROM "table"')
+
+        assert items == [dict(id=1), dict(id=2), dict(id=3)]
+        assert [r.get("NextToken") for r in requests] == [None, "token-1", "token-2"]
+
+
+class Test_execute_statements:
+    """Test the execute_statements function."""
+
+    def test_update(self, ddb_client, test_df_table):
+        """Test that the statement is executed for each list of parameters."""
+        results = execute_statements(
+            statement=f'UPDATE "{test_df_table}" SET A = ? WHERE id = ?',
+            parameters=[["x", 0], ["y", 2]],
+        )
+
+        assert results == [None, None]
+        assert [item.get("A") for item in get_all_items(table=test_df_table)] == [
+            "x",
+            None,
+            "y",
+        ]
+
+    def test_batches(self):
+        """Test that the statements are sent in batches of 25 and that the returned
+        items are returned in the order of the parameters."""
+        requests = []
+
+        def batch_execute(Statements):
+            """Fake batch_execute_statement function returning the item of every
+            other statement."""
+            requests.append(len(Statements))
+            return {
+                "Responses": [
+                    {"Item": s["Parameters"][0]["M"]} if i % 2 == 0 else {}
+                    for i, s in enumerate(Statements)
+                ]
+            }
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().batch_execute_statement.side_effect = batch_execute
+
+            results = execute_statements(
+                statement='SELECT * FROM "table" WHERE id = ?',
+                parameters=[[{"id": i}] for i in range(60)],
+            )
+
+        assert requests == [25, 25, 10]
+        assert results[:3] == [dict(id=0), None, dict(id=2)]
+        assert results[25:27] == [dict(id=25), None]
+
+    def test_errors_raise(self):
+        """Test that a RuntimeError identifying the failed statements is raised."""
+
+        def batch_execute(Statements):
+            """Fake batch_execute_statement function failing the second statement."""
+            return {
+                "Responses": [
+                    {},
+                    {
+                        "Error": {
+                            "Code": "ConditionalCheckFailed",
+                            "Message": "The conditional request failed",
+                        }
+                    },
+                ]
+            }
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().batch_execute_statement.side_effect = batch_execute
+
+            with pytest.raises(
+                RuntimeError,
+                match=re.escape(
+                    "Failed to execute the statement for the parameters at positions "
+                    "[1] (first error: ConditionalCheckFailed"
+                ),
+            ):
+                execute_statements(
+                    statement='DELETE FROM "table" WHERE id = ?',
+                    parameters=[[0], [1]],
+                )
+
+
+class Test_scan_pages:
+    """Test the scan_pages function."""
+
+    def test_all_items(self, ddb_client, large_table):
+        """Test that the pages of all the segments contain all the items and that the
+        last page of each segment has no last evaluated key."""
+        pages = list(scan_pages(table=large_table, segments=4, page_size=20))
+
+        items = [item for _, page_items, _ in pages for item in page_items]
+        assert sorted(items, key=lambda item: item["id"]) == large_table_items
+        assert len(pages) > 4
+        for segment in range(4):
+            last_keys = [key for s, _, key in pages if s == segment]
+            assert last_keys[-1] is None
+            assert all(key is not None for key in last_keys[:-1])
+
+    def test_raw(self, ddb_client, large_table):
+        """Test that the items are yielded in DynamoDB format with raw=True."""
+        _, items, _ = next(scan_pages(table=large_table, attributes=["id"], raw=True))
+
+        assert all(set(item) == {"id"} and "N" in item["id"] for item in items)
+
+    def test_resume(self, ddb_client, large_table):
+        """Test that a scan is resumed after the last evaluated key of a page with
+        segment_ids and exclusive_start_keys."""
+        pages = scan_pages(table=large_table, segments=2, page_size=50)
+        segment, first_items, last_key = next(pages)
+        pages.close()
+
+        resumed = scan_pages(
+            table=large_table,
+            segments=2,
+            page_size=50,
+            segment_ids=[segment],
+            exclusive_start_keys={segment: last_key},
+        )
+        items = [item for _, page_items, _ in resumed for item in page_items]
+
+        expected = [
+            item
+            for _, page_items, _ in scan_pages(
+                table=large_table, segments=2, segment_ids=[segment]
+            )
+            for item in page_items
+        ]
+        assert first_items + items == expected
+
+    def test_error(self, ddb_client):
+        """Test that an error of a segment scan is raised by the generator."""
+        with pytest.raises(ClientError, match="ResourceNotFoundException"):
+            list(scan_pages(table="missing-table", segments=2))
+
+
+class Test_table_info:
+    """Test the table_info function."""
+
+    def test_composite_key(self, ddb_client, composite_table):
+        """Test the key schema, attribute types, indexes and capacity of a table with
+        a composite key and a local secondary index."""
+        info = table_info(table=composite_table)
+
+        assert info["partition_key"] == "player"
+        assert info["sort_key"] == "game"
+        assert info["key"] == ["player", "game"]
+        assert info["attribute_types"] == dict(player="S", game="N", score="N")
+        assert info["indexes"] == {
+            "score-index": dict(
+                type="local",
+                key=["player", "score"],
+                projection=dict(ProjectionType="KEYS_ONLY"),
+            )
+        }
+        assert info["billing_mode"] == "PROVISIONED"
+        assert (info["read_capacity"], info["write_capacity"]) == (10, 20)
+        assert info["stream_arn"] is None
+        assert info["description"]["TableName"] == composite_table
+
+    def test_on_demand(self, ddb_client, gsi_table):
+        """Test the information of an on-demand table with a global secondary
+        index."""
+        info = table_info(table=gsi_table)
+
+        assert info["key"] == ["id"]
+        assert info["sort_key"] is None
+        assert info["indexes"]["letter-index"]["type"] == "global"
+        assert info["indexes"]["letter-index"]["key"] == ["letter"]
+        assert info["billing_mode"] == "PAY_PER_REQUEST"
+        assert info["read_capacity"] is None and info["write_capacity"] is None
+
+    def test_stream(self, ddb_client, stream_table):
+        """Test that the stream ARN of a table with a stream is returned."""
+        assert table_info(table=stream_table)["stream_arn"].startswith("arn:")
+
+    def test_cache(self, ddb_client, empty_table):
+        """Test that the table is described only once within the ttl, and again when
+        the cached information is older than the ttl or with refresh=True."""
+        with mock.patch(
+            "dynamo_pandas.transactions.transactions._describe_table",
+            wraps=_describe_table,
+        ) as describe_table:
+            first = table_info(table=empty_table)
+            assert table_info(table=empty_table) is first
+            assert describe_table.call_count == 1
+
+            table_info(table=empty_table, refresh=True)
+            assert describe_table.call_count == 2
+
+            table_info(table=empty_table, ttl=0)
+            assert describe_table.call_count == 3
+
+    def test_missing_table(self, ddb_client):
+        """Test that describing a missing table raises a ClientError."""
+        with pytest.raises(ClientError, match="ResourceNotFoundException"):
+            table_info(table="missing-table")
+
+
+class Test__AIMDController:
+    """Test the _AIMDController class."""
+
+    def test_slow_start(self):
+        """Test that the limit is increased by 1 per successful request until the
+        first throttling, up to the maximum."""
+        controller = _AIMDController(4)
+        assert controller.allows(0) and not controller.allows(1)
+
+        for _ in range(5):
+            controller.update(False, controller.epoch)
+
+        assert controller.limit == 4
+        assert controller.allows(3) and not controller.allows(4)
+
+    def test_decrease(self):
+        """Test that the limit is halved once per epoch and increased additively
+        afterwards."""
+        controller = _AIMDController(16)
+        for _ in range(7):
+            controller.update(False, 0)
+        assert controller.limit == 8
+
+        # Several requests sent before the throttling are throttled.
+        for _ in range(3):
+            controller.update(True, 0)
+        assert controller.limit == 4
+        assert controller.epoch == 1
+
+        for _ in range(4):
+            controller.update(False, 1)
+        assert controller.limit == pytest.approx(4.9, abs=0.1)
+
+    def test_minimum(self):
+        """Test that the limit is not decreased below 1."""
+        controller = _AIMDController(8)
+        for _ in range(3):
+            controller.update(True, controller.epoch)
+
+        assert controller.limit == 1
+        assert controller.allows(0)
+
+
+class Test_adaptive_concurrency:
+    """Test the max_workers parameter of the batch get and put functions."""
+
+    def test_get_items(self, ddb_client, large_table):
+        """Test that the items are returned in the order of the keys with concurrent
+        requests."""
+        keys_list = keys(id=range(249, -1, -1))
+
+        items = get_items(keys=keys_list, table=large_table, max_workers=4)
+
+        assert items == large_table_items[::-1]
+
+    def test_put_items(self, ddb_client, empty_table):
+        """Test that the number of requests in flight increases up to max_workers and
+        that the unprocessed and throttled items are written again."""
+        lock = threading.Lock()
+        written = []
+        in_flight = 0
+        max_in_flight = 0
+        calls = 0
+
+        def batch_write_item(RequestItems):
+            """Fake batch_write_item function throttling the 3rd request and returning
+            an unprocessed item for the 5th request."""
+            nonlocal in_flight, max_in_flight, calls
+            with lock:
+                calls += 1
+                call = calls
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+
+            time.sleep(0.01)
+            requests = RequestItems[empty_table]
+            with lock:
+                in_flight -= 1
+                if call == 3:
+                    raise ClientError(
+                        dict(Error=dict(Code="ProvisionedThroughputExceededException")),
+                        "BatchWriteItem",
+                    )
+                unprocessed = requests[:1] if call == 5 else []
+                written.extend(r for r in requests if r not in unprocessed)
+
+            return {
+                "UnprocessedItems": {empty_table: unprocessed} if unprocessed else {}
+            }
+
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().batch_write_item.side_effect = batch_write_item
+
+            put_items(
+                items=(dict(id=i) for i in range(1000)),
+                table=empty_table,
+                max_workers=4,
+            )
+
+        ids = sorted(int(r["PutRequest"]["Item"]["id"]["N"]) for r in written)
+        assert ids == list(range(1000))
+        assert max_in_flight > 1
+
+    def test_error(self, ddb_client, empty_table):
+        """Test that errors other than throttling errors are raised."""
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().batch_write_item.side_effect = ClientError(
+                dict(Error=dict(Code="ValidationException")), "BatchWriteItem"
+            )
+
+            with pytest.raises(ClientError, match="ValidationException"):
+                put_items(items=large_table_items, table=empty_table, max_workers=4)
+
+
+class Test__run_adaptive:
+    """Test the _run_adaptive function."""
+
+    def test_retries_in_flight(self):
+        """Test that the retries count as requests in flight and are sent after a
+        backoff delay increasing with the attempts."""
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+        attempts = {}
+
+        def function(batch, retry):
+            """Fake request function returning the batch as unprocessed for the first
+            two attempts of each batch."""
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                attempts[batch[0]] = attempts.get(batch[0], 0) + 1
+                attempt = attempts[batch[0]]
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            assert retry == (attempt > 1)
+            return batch if attempt <= 2 else []
+
+        controller = _AIMDController(8)
+        # The limit never exceeds 2 requests in flight.
+        controller.allows = lambda n: n < 2
+
+        with mock.patch(
+            "dynamo_pandas.transactions.transactions._backoff", return_value=0.001
+        ) as backoff:
+            _run_adaptive(([i] for i in range(6)), function, controller)
+
+        assert attempts == {i: 3 for i in range(6)}
+        assert max_in_flight == 2
+        assert sorted(c.args[0] for c in backoff.call_args_list) == [1] * 6 + [2] * 6
+
+    def test_backoff(self):
+        """Test that the backoff delays are random and bounded by an exponentially
+        increasing maximum."""
+        delays = [_backoff(3) for _ in range(100)]
+
+        assert all(0 <= d <= 0.4 for d in delays)
+        assert len(set(delays)) > 1
+        assert max(_backoff(20) for _ in range(100)) <= 5
+
+    def test_throttling_metrics(self, ddb_client, empty_table):
+        """Test that the requests rejected with a throttling error are recorded in the
+        metrics."""
+        calls = 0
+
+        def batch_write_item(RequestItems, **kwargs):
+            """Fake batch_write_item function throttling the first request."""
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ClientError(
+                    dict(
+                        Error=dict(Code="ThrottlingException"),
+                        ResponseMetadata=dict(RetryAttempts=2),
+                    ),
+                    "BatchWriteItem",
+                )
+            return {"UnprocessedItems": {}}
+
+        metrics = Metrics()
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.client().batch_write_item.side_effect = batch_write_item
+
+            put_items(
+                items=[dict(id=0)], table=empty_table, max_workers=2, metrics=metrics
+            )
+
+        assert metrics.throttles == 3
+        assert metrics.unprocessed == 1
+        assert metrics.retries == 1
+        assert metrics.items == 1
+
+    def test_get_items_throttling(self, ddb_client, large_table):
+        """Test that the keys of a throttled request are requested again."""
+        calls = 0
+
+        def batch_get_item(RequestItems, **kwargs):
+            """Fake batch_get_item function throttling the first request."""
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ClientError(
+                    dict(Error=dict(Code="ProvisionedThroughputExceededException")),
+                    "BatchGetItem",
+                )
+            keys = RequestItems[large_table]["Keys"]
+            return {
+                "Responses": {large_table: [large_table_items[k["id"]] for k in keys]},
+                "UnprocessedKeys": {},
+            }
+
+        metrics = Metrics()
+        with mock.patch("dynamo_pandas.transactions.transactions.boto3") as boto3:
+            boto3.session.Session().resource().batch_get_item.side_effect = (
+                batch_get_item
+            )
+
+            items = get_items(
+                keys=keys(id=range(10)),
+                table=large_table,
+                max_workers=2,
+                metrics=metrics,
+            )
+
+        assert items == large_table_items[:10]
+        assert calls == 2
+        assert metrics.throttles == 1